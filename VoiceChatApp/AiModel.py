@@ -1,6 +1,6 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
+import re
+import threading
+from .StartupReport import StartupReport
 
 
 class AiModel:
@@ -8,56 +8,152 @@ class AiModel:
     Klasa AiModel zarządza interakcjami z modelem AI dostarczanym przez OpenAI.
 
     Klasa ta umożliwia przesyłanie zapytań do modelu AI i odbieranie odpowiedzi.
-    Dane uwierzytelniające są wczytywane z pliku środowiskowego `.env` za pomocą
-    biblioteki dotenv.
+    Zapytania wykonuje współdzielony AsyncAiClient (pula połączeń, limit czasu, ponowienia
+    i zapytania zapasowe). Dane uwierzytelniające są wczytywane z pliku środowiskowego `.env`.
+
+    Klient (wraz z importem bibliotek openai, httpx i dotenv) jest tworzony przy pierwszym
+    zapytaniu - większość konsultacji kończy się diagnozą z tabeli chorób bez użycia modelu AI.
     """
 
-    def __init__(self):
-        """
-        Inicjalizuje obiekt AiModel i konfiguruje klienta OpenAI.
+    # Koniec zdania: znak interpunkcyjny, po którym następuje odstęp, albo koniec wiersza
+    SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|\s*\n\s*")
 
-        Proces inicjalizacji obejmuje:
+    # Nazwa klienta w raporcie startu
+    CLIENT_NAME = "klient AI"
 
-        - Wczytanie zmiennych środowiskowych z pliku `.env`.
+    def __init__(self, client=None):
+        """
+        Inicjalizuje obiekt AiModel.
 
-        - Utworzenie klienta OpenAI za pomocą podanych danych uwierzytelniających.
+        Args:
+            client (AsyncAiClient | None): Klient API. Domyślnie AsyncAiClient.shared(), tworzony przy pierwszym użyciu.
+        """
+        self._client = client
+        self._client_lock = threading.Lock()
+        if client is None:
+            StartupReport.shared().expect(self.CLIENT_NAME)
 
-        Zmienne środowiskowe:
+    @property
+    def client(self):
+        """
+        Klient API, tworzony przy pierwszym odwołaniu.
 
-        - OPENAI_ORGANIZATION: Organizacja OpenAI.
+        Returns:
+            AsyncAiClient: Klient API.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    with StartupReport.shared().measure(self.CLIENT_NAME, deferred=True):
+                        # Import biblioteki openai trwa kilkaset milisekund - tylko gdy klient jest potrzebny
+                        from .AsyncAiClient import AsyncAiClient
+                        self._client = AsyncAiClient.shared()
+        return self._client
 
-        - OPENAI_PROJECT: Projekt OpenAI.
+    def prewarm(self):
+        """
+        Tworzy klienta API w wątku tła, aby pierwsze zapytanie nie czekało na import bibliotek.
 
-        - OPENAI_API_KEY: Klucz API dla OpenAI.
+        Returns:
+            threading.Thread: Wątek tworzący klienta.
         """
-        load_dotenv()
-        self.client = OpenAI(
-            organization=os.getenv('OPENAI_ORGANIZATION'),
-            project=os.getenv('OPENAI_PROJECT'),
-            api_key=os.getenv('OPENAI_API_KEY')
-        )
+        thread = threading.Thread(target=lambda: self.client, name="AiModel.prewarm", daemon=True)
+        thread.start()
+        return thread
 
-    def ask(self, prompt: str) -> str:
+    def ask(self, prompt, deadline=None, on_usage=None) -> str:
         """
         Wysyła zapytanie w formie tekstu do modelu AI i odbiera wygenerowaną przez niego odpowiedź.
 
         Args:
-            prompt (str): Tekst zapytania, które ma zostać przesłane do modelu.
+            prompt (str | list): Tekst zapytania, które ma zostać przesłane do modelu,
+                lub gotowa lista wiadomości (np. z PromptBuilder.build).
+            deadline (float | None): Limit czasu w sekundach. Domyślnie limit klienta.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem wywołania
+                (np. PromptBuilder.record). Domyślnie None.
 
         Returns:
             str: Odpowiedź wygenerowana przez model AI.
-                  W przypadku wystąpienia błędu zwraca opis błędu w formie tekstowej.
-        """
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "system", "content": "Odpowiedź od chatbota odnośnie zaleceń do twoich objawów."},
-                          {"role": "user", "content": prompt},
-                          {"role": "system", "content": "Nadal zaleca się skontaktować z lekarzem pierwszego kontaktu."}
-                          ],
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            error_message = f"Error podczas komunikacji z API: {e}"
-            print(error_message)
-            return error_message
+
+        Raises:
+            TimeoutError: Jeśli odpowiedź nie nadeszła przed upływem limitu czasu.
+            openai.APIError: Jeśli komunikacja z API nie powiodła się.
+        """
+        return self.client.ask(self._messages(prompt), deadline, on_usage)
+
+    def prefetch(self, prompt, deadline=None, on_usage=None):
+        """
+        Wysyła zapytanie do modelu AI w tle, zanim odpowiedź będzie potrzebna.
+
+        Args:
+            prompt (str | list): Tekst zapytania, które ma zostać przesłane do modelu,
+                lub gotowa lista wiadomości (np. z PromptBuilder.build).
+            deadline (float | None): Limit czasu w sekundach. Domyślnie limit klienta.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem wywołania
+                (np. PromptBuilder.record). Domyślnie None.
+
+        Returns:
+            concurrent.futures.Future: Przyszła odpowiedź modelu. Anulowanie przerywa zapytanie.
+        """
+        return self.client.submit(self._messages(prompt), deadline, on_usage)
+
+    def ask_stream(self, prompt, deadline=None, on_usage=None):
+        """
+        Wysyła zapytanie do modelu AI i zwraca odpowiedź zdanie po zdaniu, w miarę jej generowania.
+
+        Pierwsze zdanie jest dostępne, zanim model wygeneruje całą odpowiedź, dzięki czemu
+        jego synteza mowy może rozpocząć się wcześniej.
+
+        Args:
+            prompt (str | list): Tekst zapytania, które ma zostać przesłane do modelu,
+                lub gotowa lista wiadomości (np. z PromptBuilder.build).
+            deadline (float | None): Limit czasu całej odpowiedzi w sekundach. Domyślnie limit klienta.
+            on_usage (callable | None): Wywoływana ze zużyciem tokenów po zakończeniu odpowiedzi. Domyślnie None.
+
+        Yields:
+            str: Kolejne zdania odpowiedzi.
+
+        Raises:
+            TimeoutError: Jeśli odpowiedź nie została ukończona przed upływem limitu czasu.
+            openai.APIError: Jeśli komunikacja z API nie powiodła się.
+        """
+        yield from self.sentences(self.client.stream(self._messages(prompt), deadline, on_usage))
+
+    @classmethod
+    def sentences(cls, chunks):
+        """
+        Składa fragmenty tekstu (np. tokeny strumienia odpowiedzi) w pełne zdania.
+
+        Args:
+            chunks (iterable): Kolejne fragmenty tekstu.
+
+        Yields:
+            str: Zdania, gdy tylko zostaną zakończone; na końcu pozostały tekst.
+        """
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            *complete, buffer = cls.SENTENCE_END.split(buffer)
+            for sentence in complete:
+                if sentence.strip():
+                    yield sentence.strip()
+        if buffer.strip():
+            yield buffer.strip()
+
+    @staticmethod
+    def _messages(prompt) -> list:
+        """
+        Funkcja pomocnicza: buduje listę wiadomości zapytania do modelu.
+
+        Args:
+            prompt (str | list): Tekst zapytania lub gotowa lista wiadomości (zwracana bez zmian).
+
+        Returns:
+            list: Wiadomości w formacie API chat completions.
+        """
+        if isinstance(prompt, list):
+            return prompt
+        return [{"role": "system", "content": "Odpowiedź od chatbota odnośnie zaleceń do twoich objawów."},
+                {"role": "user", "content": prompt},
+                {"role": "system", "content": "Nadal zaleca się skontaktować z lekarzem pierwszego kontaktu."}
+                ]
@@ -0,0 +1,416 @@
+import asyncio
+import collections
+import logging
+import queue
+import random
+import threading
+import time
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError
+
+
+class AsyncAiClient:
+    """
+    Klasa AsyncAiClient wykonuje zapytania do modelu AI (OpenAI) w pętli asyncio działającej w wątku tła.
+
+    Funkcjonalności:
+
+    - Wspólna pula połączeń HTTP (httpx) dla wszystkich zapytań - połączenia są utrzymywane
+      między turami rozmowy, a kolejne zapytania nie nawiązują połączenia TLS od nowa.
+
+    - Limit czasu całego zapytania (`deadline`), obejmujący ponowienia i zapytania zapasowe.
+
+    - Ograniczona liczba ponowień błędów przejściowych (brak połączenia, przekroczenie czasu,
+      statusy 429 i 5xx) z losowym opóźnieniem wykładniczym (full jitter).
+
+    - Zapytania zapasowe (hedging): jeśli odpowiedź nie nadeszła w czasie odpowiadającym
+      percentylowi `hedge_percentile` dotychczasowych czasów odpowiedzi, wysyłane jest drugie,
+      identyczne zapytanie i wykorzystywana jest pierwsza otrzymana odpowiedź.
+
+    Błędy nie są zamieniane na tekst odpowiedzi - metody zgłaszają wyjątki.
+
+    Zmienne środowiskowe (wczytywane również z pliku `.env`):
+
+    - OPENAI_API_KEY, OPENAI_ORGANIZATION, OPENAI_PROJECT: Dane uwierzytelniające OpenAI.
+
+    - OPENAI_BASE_URL: Adres API (np. lokalnego serwera testowego `benchmarks/ai_stub_server.py`).
+    """
+
+    # Statusy HTTP, po których zapytanie jest ponawiane
+    RETRY_STATUSES = (408, 409, 429, 500, 502, 503, 504)
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, model="gpt-4o-mini", base_url=None, api_key=None, deadline=20.0, max_retries=2,
+                 backoff=0.25, max_backoff=2.0, hedge_percentile=95, hedge_min_samples=20, max_connections=8,
+                 latency_window=200, debug=False):
+        """
+        Inicjalizuje klienta, pulę połączeń oraz pętlę zdarzeń w wątku tła.
+
+        Args:
+            model (str): Nazwa modelu. Domyślnie "gpt-4o-mini".
+            base_url (str | None): Adres API. Domyślnie zmienna OPENAI_BASE_URL lub adres OpenAI.
+            api_key (str | None): Klucz API. Domyślnie zmienna OPENAI_API_KEY.
+            deadline (float): Limit czasu zapytania w sekundach (łącznie z ponowieniami). Domyślnie 20.
+            max_retries (int): Maksymalna liczba ponowień zapytania. Domyślnie 2.
+            backoff (float): Podstawa opóźnienia przed ponowieniem w sekundach. Domyślnie 0.25.
+            max_backoff (float): Maksymalne opóźnienie przed ponowieniem w sekundach. Domyślnie 2.
+            hedge_percentile (float | None): Percentyl czasu odpowiedzi, po którym wysyłane jest zapytanie
+                zapasowe, lub None, aby go nie wysyłać. Domyślnie 95.
+            hedge_min_samples (int): Liczba zmierzonych odpowiedzi wymagana do wysyłania zapytań
+                zapasowych. Domyślnie 20.
+            max_connections (int): Rozmiar puli połączeń HTTP. Domyślnie 8.
+            latency_window (int): Liczba ostatnich czasów odpowiedzi branych pod uwagę. Domyślnie 200.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        load_dotenv()
+        self.model = model
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failures = 0
+
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(deadline, connect=min(5.0, deadline)),
+        )
+        # Ponowienia obsługuje ta klasa, więc biblioteka OpenAI ich nie wykonuje
+        self.client = AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0, timeout=deadline,
+                                  http_client=self.http_client)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="AsyncAiClient", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls):
+        """
+        Zwraca klienta współdzielonego w obrębie procesu (jedna pula połączeń), tworząc go przy pierwszym użyciu.
+
+        Returns:
+            AsyncAiClient: Współdzielony klient.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def ask(self, messages: list, deadline=None, on_usage=None) -> str:
+        """
+        Wysyła zapytanie i czeka na pełną odpowiedź (wywoływana spoza pętli zdarzeń).
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            deadline (float | None): Limit czasu w sekundach. Domyślnie `self.deadline`.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem (s)
+                każdego zakończonego zapytania do API. Domyślnie None.
+
+        Returns:
+            str: Odpowiedź modelu.
+
+        Raises:
+            TimeoutError: Jeśli odpowiedź nie nadeszła przed upływem limitu czasu.
+            openai.APIError: Jeśli zapytanie nie powiodło się mimo ponowień.
+        """
+        return self.submit(messages, deadline, on_usage).result()
+
+    def submit(self, messages: list, deadline=None, on_usage=None):
+        """
+        Wysyła zapytanie w tle, nie czekając na odpowiedź (wywoływana spoza pętli zdarzeń).
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            deadline (float | None): Limit czasu w sekundach. Domyślnie `self.deadline`.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem (s)
+                każdego zakończonego zapytania do API. Domyślnie None.
+
+        Returns:
+            concurrent.futures.Future: Przyszła odpowiedź modelu. Anulowanie przerywa zapytanie.
+        """
+        return asyncio.run_coroutine_threadsafe(self.complete(messages, deadline, on_usage), self._loop)
+
+    def stream(self, messages: list, deadline=None, on_usage=None):
+        """
+        Wysyła zapytanie i zwraca fragmenty odpowiedzi w miarę ich generowania (wywoływana spoza pętli zdarzeń).
+
+        Zapytanie jest ponawiane tylko do otrzymania pierwszego fragmentu; zapytania zapasowe nie są wysyłane.
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            deadline (float | None): Limit czasu całej odpowiedzi w sekundach. Domyślnie `self.deadline`.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem (s)
+                każdego zakończonego zapytania do API. Domyślnie None.
+
+        Yields:
+            str: Kolejne fragmenty odpowiedzi.
+
+        Raises:
+            TimeoutError: Jeśli odpowiedź nie została ukończona przed upływem limitu czasu.
+            openai.APIError: Jeśli zapytanie nie powiodło się mimo ponowień.
+        """
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream(messages, chunks, deadline, on_usage),
+                                                  self._loop)
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                yield chunk
+            future.result()
+        finally:
+            # Przerwanie odczytu (np. nowa wypowiedź użytkownika) anuluje zapytanie
+            future.cancel()
+
+    async def complete(self, messages: list, deadline=None, on_usage=None) -> str:
+        """
+        Wysyła zapytanie z ponowieniami i zapytaniami zapasowymi (korutyna pętli zdarzeń klienta).
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            deadline (float | None): Limit czasu w sekundach. Domyślnie `self.deadline`.
+            on_usage (callable | None): Wywoływana z liczbą tokenów zapytania, odpowiedzi i czasem (s)
+                każdego zakończonego zapytania do API. Domyślnie None.
+
+        Returns:
+            str: Odpowiedź modelu.
+
+        Raises:
+            TimeoutError: Jeśli odpowiedź nie nadeszła przed upływem limitu czasu.
+            openai.APIError: Jeśli zapytanie nie powiodło się mimo ponowień.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(messages, deadline_at, on_usage)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline_at - loop.time())
+                if delay is None:
+                    self.failures += 1
+                    raise
+                attempt += 1
+                self.retries += 1
+                self.logger.warning(f"Ponowienie zapytania do modelu AI ({attempt}/{self.max_retries}) "
+                                    f"za {delay * 1000:.0f} ms: {e}")
+                await asyncio.sleep(delay)
+
+    def hedge_delay(self):
+        """
+        Wyznacza czas oczekiwania na odpowiedź, po którym wysyłane jest zapytanie zapasowe.
+
+        Returns:
+            float | None: Czas w sekundach lub None, jeśli zapytania zapasowe są wyłączone
+                          albo zmierzono zbyt mało odpowiedzi.
+        """
+        if self.hedge_percentile is None or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.percentile(self.latencies, self.hedge_percentile)
+
+    @staticmethod
+    def percentile(values, q: float) -> float:
+        """
+        Zwraca percentyl wartości (metoda najbliższej pozycji).
+
+        Args:
+            values (iterable): Wartości liczbowe.
+            q (float): Percentyl z zakresu 0-100.
+
+        Returns:
+            float: Wartość percentyla lub 0.0 dla pustego zbioru.
+        """
+        ordered = sorted(values)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def stats(self) -> dict:
+        """
+        Zwraca statystyki zapytań.
+
+        Returns:
+            dict: Liczba zapytań, ponowień, zapytań zapasowych (i wygranych przez nie), nieudanych zapytań
+                  oraz percentyle czasu odpowiedzi w sekundach.
+        """
+        latencies = list(self.latencies)
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failures": self.failures,
+            "p50": self.percentile(latencies, 50),
+            "p95": self.percentile(latencies, 95),
+            "p99": self.percentile(latencies, 99),
+        }
+
+    def close(self):
+        """
+        Zamyka pulę połączeń i zatrzymuje pętlę zdarzeń.
+        """
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.http_client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _hedged(self, messages: list, deadline_at: float, on_usage=None) -> str:
+        """
+        Funkcja pomocnicza: wysyła zapytanie oraz - po przekroczeniu `hedge_delay` - zapytanie zapasowe.
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            deadline_at (float): Termin odpowiedzi (czas pętli zdarzeń).
+            on_usage (callable | None): Wywoływana ze zużyciem tokenów każdego zapytania. Domyślnie None.
+
+        Returns:
+            str: Pierwsza pomyślna odpowiedź.
+
+        Raises:
+            TimeoutError: Jeśli żadna odpowiedź nie nadeszła przed terminem.
+        """
+        loop = asyncio.get_running_loop()
+        primary = asyncio.ensure_future(self._request(messages, on_usage))
+        pending = {primary}
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and loop.time() + delay < deadline_at:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    self.hedges += 1
+                    self.logger.debug(f"Brak odpowiedzi po {delay * 1000:.0f} ms - wysyłanie zapytania zapasowego")
+                    pending.add(asyncio.ensure_future(self._request(messages, on_usage)))
+
+            error = None
+            while pending:
+                timeout = deadline_at - loop.time()
+                done, pending = await asyncio.wait(pending, timeout=max(timeout, 0),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError("Przekroczono limit czasu odpowiedzi modelu AI")
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, messages: list, on_usage=None) -> str:
+        """
+        Funkcja pomocnicza: wysyła pojedyncze zapytanie i zapisuje czas odpowiedzi.
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            on_usage (callable | None): Wywoływana ze zużyciem tokenów zapytania. Domyślnie None.
+
+        Returns:
+            str: Odpowiedź modelu.
+        """
+        self.requests += 1
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(model=self.model, messages=messages)
+        latency = time.perf_counter() - start
+        self.latencies.append(latency)
+        self._report_usage(on_usage, response.usage, latency)
+        return response.choices[0].message.content.strip()
+
+    async def _stream(self, messages: list, chunks: queue.Queue, deadline=None, on_usage=None):
+        """
+        Funkcja pomocnicza: pobiera strumień odpowiedzi do kolejki, zakończonej wartością None.
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+            chunks (queue.Queue): Kolejka fragmentów odpowiedzi.
+            deadline (float | None): Limit czasu w sekundach. Domyślnie `self.deadline`.
+            on_usage (callable | None): Wywoływana ze zużyciem tokenów po zakończeniu strumienia. Domyślnie None.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or self.deadline)
+        received = 0
+        attempt = 0
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline_at):
+                        self.requests += 1
+                        start = time.perf_counter()
+                        stream = await self.client.chat.completions.create(
+                            model=self.model, messages=messages, stream=True, stream_options={"include_usage": True}
+                        )
+                        usage = None
+                        async for chunk in stream:
+                            # Zużycie tokenów przychodzi w ostatnim fragmencie, bez treści
+                            usage = getattr(chunk, "usage", None) or usage
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                received += 1
+                                chunks.put(chunk.choices[0].delta.content)
+                    self._report_usage(on_usage, usage, time.perf_counter() - start)
+                    return
+                except Exception as e:
+                    # Po wysłaniu części odpowiedzi ponowienie powtórzyłoby już wypowiedziane zdania
+                    delay = None if received else self._retry_delay(e, attempt, deadline_at - loop.time())
+                    if delay is None:
+                        self.failures += 1
+                        raise
+                    attempt += 1
+                    self.retries += 1
+                    self.logger.warning(f"Ponowienie strumienia modelu AI ({attempt}/{self.max_retries}): {e}")
+                    await asyncio.sleep(delay)
+        finally:
+            chunks.put(None)
+
+    def _report_usage(self, on_usage, usage, latency: float):
+        """
+        Funkcja pomocnicza: przekazuje zużycie tokenów zapytania (brak danych od API liczy się jako 0).
+
+        Args:
+            on_usage (callable | None): Odbiorca zużycia tokenów.
+            usage (CompletionUsage | None): Zużycie tokenów zwrócone przez API.
+            latency (float): Czas zapytania w sekundach.
+        """
+        if on_usage is None:
+            return
+        try:
+            on_usage(getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0, latency)
+        except Exception as e:
+            self.logger.warning(f"Błąd podczas zapisu zużycia tokenów: {e}")
+
+    def _retry_delay(self, error: Exception, attempt: int, remaining: float):
+        """
+        Funkcja pomocnicza: wyznacza losowe opóźnienie przed ponowieniem zapytania.
+
+        Args:
+            error (Exception): Błąd zapytania.
+            attempt (int): Liczba dotychczasowych ponowień.
+            remaining (float): Czas pozostały do upływu limitu w sekundach.
+
+        Returns:
+            float | None: Opóźnienie w sekundach lub None, jeśli zapytania nie należy ponawiać.
+        """
+        retryable = isinstance(error, APIConnectionError) or (
+            isinstance(error, APIStatusError) and error.status_code in self.RETRY_STATUSES
+        )
+        if not retryable or attempt >= self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        return delay if delay < remaining else None
@@ -0,0 +1,193 @@
+import threading
+import logging
+import pyaudio
+from .SpeechBackend import AudioSource
+
+
+class RingBuffer:
+    """
+    Klasa RingBuffer implementuje bufor cykliczny na surowe próbki audio.
+
+    Bufor jest alokowany jednorazowo (bytearray + memoryview), a zapis i odczyt
+    nie tworzą nowych obiektów po stronie producenta. Struktura jest przeznaczona
+    dla jednego producenta (wątek callbacku PyAudio) i jednego konsumenta (wątek dekodujący),
+    dzięki czemu nie wymaga blokad - każdy z wątków modyfikuje wyłącznie własny licznik.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Inicjalizuje bufor cykliczny o zadanej pojemności.
+
+        Args:
+            capacity (int): Pojemność bufora w bajtach.
+        """
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        # Liczniki rosną monotonicznie, pozycja w buforze to licznik modulo pojemność
+        self._write_pos = 0
+        self._read_pos = 0
+        self.dropped_bytes = 0
+
+    def available(self) -> int:
+        """
+        Zwraca liczbę bajtów gotowych do odczytu.
+
+        Returns:
+            int: Liczba nieodczytanych bajtów.
+        """
+        return self._write_pos - self._read_pos
+
+    def write(self, data) -> int:
+        """
+        Zapisuje dane do bufora (wywoływane wyłącznie przez producenta).
+
+        Jeśli w buforze brakuje miejsca, nadmiarowe dane są odrzucane i zliczane
+        w `dropped_bytes`, tak aby producent nigdy nie modyfikował licznika konsumenta.
+
+        Args:
+            data (bytes | memoryview): Dane do zapisania.
+
+        Returns:
+            int: Liczba faktycznie zapisanych bajtów.
+        """
+        size = min(len(data), self.capacity - self.available())
+        if size < len(data):
+            self.dropped_bytes += len(data) - size
+        if size <= 0:
+            return 0
+
+        source = memoryview(data)
+        start = self._write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = source[:first]
+        if first < size:
+            self._view[:size - first] = source[first:size]
+        self._write_pos += size
+        return size
+
+    def read(self, size: int) -> bytes:
+        """
+        Odczytuje dokładnie `size` bajtów z bufora (wywoływane wyłącznie przez konsumenta).
+
+        Args:
+            size (int): Liczba bajtów do odczytania.
+
+        Returns:
+            bytes: Odczytane dane lub pusty ciąg, jeśli w buforze jest za mało danych.
+        """
+        if self.available() < size:
+            return b""
+
+        start = self._read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            data = bytes(self._view[start:start + size])
+        else:
+            data = bytes(self._view[start:]) + bytes(self._view[:size - first])
+        self._read_pos += size
+        return data
+
+    def clear(self):
+        """
+        Odrzuca wszystkie nieodczytane dane (wywoływane wyłącznie przez konsumenta).
+        """
+        self._read_pos = self._write_pos
+
+
+class AudioCapture(AudioSource):
+    """
+    Klasa AudioCapture zarządza przechwytywaniem dźwięku z mikrofonu w trybie callback.
+
+    Strumień PyAudio działa nieprzerwanie we własnym wątku i zapisuje próbki do bufora
+    cyklicznego, niezależnie od tego, czy dekoder lub GUI nadążają z ich odbiorem.
+    Konsument pobiera dane porcjami o konfigurowalnej wielkości metodą `read`.
+    """
+
+    def __init__(self, rate=16000, chunk_size=4000, buffer_seconds=10, debug=False):
+        """
+        Inicjalizuje obiekt AudioCapture.
+
+        Args:
+            rate (int): Częstotliwość próbkowania w Hz. Domyślnie 16000.
+            chunk_size (int): Liczba ramek w porcji przekazywanej do rozpoznawania mowy.
+                Mniejsza wartość zmniejsza opóźnienie kosztem większego użycia CPU. Domyślnie 4000.
+            buffer_seconds (int): Pojemność bufora cyklicznego w sekundach nagrania. Domyślnie 10.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.rate = rate
+        self.chunk_size = chunk_size
+        self.sample_width = 2
+        self.ring = RingBuffer(rate * self.sample_width * buffer_seconds)
+        self._data_ready = threading.Event()
+
+        self.p = pyaudio.PyAudio()
+        self.stream = None
+
+    def start(self):
+        """
+        Otwiera strumień mikrofonu w trybie callback i rozpoczyna przechwytywanie.
+        """
+        self.logger.debug("Wywołanie start")
+        self.stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """
+        Funkcja pomocnicza: callback PyAudio zapisujący próbki do bufora cyklicznego.
+
+        Returns:
+            tuple: (None, pyaudio.paContinue) - strumień działa dalej.
+        """
+        self.ring.write(in_data)
+        self._data_ready.set()
+        return None, pyaudio.paContinue
+
+    def read(self, timeout=0.5) -> bytes:
+        """
+        Pobiera z bufora jedną porcję audio o rozmiarze `chunk_size` ramek.
+
+        Args:
+            timeout (float): Maksymalny czas oczekiwania na dane w sekundach.
+
+        Returns:
+            bytes: Porcja audio lub pusty ciąg, jeśli dane nie napłynęły w zadanym czasie.
+        """
+        size = self.chunk_size * self.sample_width
+        if self.ring.available() < size:
+            self._data_ready.clear()
+            # Ponowne sprawdzenie chroni przed utratą sygnału zapisu, który nastąpił przed clear()
+            if self.ring.available() < size:
+                self._data_ready.wait(timeout)
+        return self.ring.read(size)
+
+    def clear(self):
+        """
+        Odrzuca dane zgromadzone w buforze, np. przed rozpoczęciem nowej wypowiedzi.
+        """
+        self.ring.clear()
+
+    def close(self):
+        """
+        Zatrzymuje strumień i zwalnia zasoby PyAudio.
+        """
+        self.logger.debug("Wywołanie close")
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.p:
+            self.p.terminate()
+            self.p = None
+        if self.ring.dropped_bytes:
+            self.logger.info(f"Odrzucono {self.ring.dropped_bytes} bajtów audio z powodu przepełnienia bufora")
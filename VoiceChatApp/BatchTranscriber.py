@@ -0,0 +1,172 @@
+from multiprocessing import Pool
+from vosk import Model, KaldiRecognizer
+import json
+import logging
+import os
+import tempfile
+import time
+import wave
+
+# Stan procesu roboczego - każdy proces puli ładuje własną kopię modelu
+_worker_model = None
+_worker_medic = None
+
+
+def _init_worker(model_path: str, analyze: bool, cache_dir: str):
+    """
+    Funkcja pomocnicza: inicjalizuje proces roboczy, ładując model VOSK
+    oraz opcjonalnie moduł medyczny.
+
+    Args:
+        model_path (str): Ścieżka do katalogu modelu VOSK.
+        analyze (bool): Czy tworzyć moduł medyczny do analizy transkrypcji.
+        cache_dir (str): Katalog diagnoz i zużycia tokenów modułu medycznego.
+    """
+    global _worker_model, _worker_medic
+    _worker_model = Model(model_path)
+    if analyze:
+        from .MedicalChat import MedicalChat
+        _worker_medic = MedicalChat(cache_dir=cache_dir)
+
+
+def _process_file(path: str) -> dict:
+    """
+    Funkcja pomocnicza: transkrybuje plik w procesie roboczym i opcjonalnie analizuje objawy.
+
+    Args:
+        path (str): Ścieżka do pliku WAV.
+
+    Returns:
+        dict: Wynik przetwarzania pliku.
+    """
+    try:
+        result = BatchTranscriber.transcribe_file(path, _worker_model)
+    except Exception as e:
+        return {"file": path, "error": str(e), "audio_seconds": 0.0, "decode_seconds": 0.0}
+
+    if _worker_medic is not None:
+        _worker_medic.reset_conversation()
+        i_know, message = _worker_medic.analyze_symptoms(result["text"])
+        result["symptoms"] = dict(_worker_medic.user_symptoms)
+        result["response"] = message
+    return result
+
+
+class BatchTranscriber:
+    """
+    Klasa BatchTranscriber przetwarza archiwalne nagrania WAV bez interfejsu graficznego.
+
+    Pliki są rozdzielane między procesy puli (jeden model VOSK na proces), a transkrypcja
+    używa tej samej konfiguracji rozpoznawacza co nasłuchiwanie w VoiceChatApp.
+    Po zakończeniu raportowany jest współczynnik czasu rzeczywistego (RTF) oraz liczba plików na sekundę.
+    """
+
+    RATE = 16000
+    CHUNK_FRAMES = 4000
+
+    def __init__(self, model_path="VoiceChatApp/model", workers=None, analyze=False, debug=False):
+        """
+        Inicjalizuje obiekt BatchTranscriber.
+
+        Args:
+            model_path (str): Ścieżka do katalogu modelu VOSK. Domyślnie "VoiceChatApp/model".
+            workers (int | None): Liczba procesów roboczych. Domyślnie liczba rdzeni procesora.
+            analyze (bool): Czy przepuszczać transkrypcje przez MedicalChat.analyze_symptoms. Domyślnie False.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.model_path = model_path
+        self.workers = workers or os.cpu_count()
+        self.analyze = analyze
+
+    @classmethod
+    def transcribe_file(cls, path: str, model: Model) -> dict:
+        """
+        Transkrybuje pojedynczy plik WAV (16 kHz, mono, 16 bit).
+
+        Args:
+            path (str): Ścieżka do pliku WAV.
+            model (Model): Załadowany model VOSK.
+
+        Returns:
+            dict: Tekst transkrypcji, długość nagrania i czas dekodowania w sekundach.
+
+        Raises:
+            ValueError: Jeśli format pliku nie odpowiada formatowi mikrofonu aplikacji.
+        """
+        with wave.open(path, "rb") as wav:
+            if wav.getframerate() != cls.RATE or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                raise ValueError(f"Nieobsługiwany format pliku {path}: wymagane 16 kHz, mono, 16 bit")
+
+            audio_seconds = wav.getnframes() / cls.RATE
+            start = time.perf_counter()
+            recognizer = KaldiRecognizer(model, cls.RATE)
+            texts = []
+            while True:
+                data = wav.readframes(cls.CHUNK_FRAMES)
+                if not data:
+                    break
+                if recognizer.AcceptWaveform(data):
+                    texts.append(json.loads(recognizer.Result()).get("text", ""))
+            texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+            decode_seconds = time.perf_counter() - start
+
+        return {
+            "file": path,
+            "text": " ".join(text for text in texts if text),
+            "audio_seconds": audio_seconds,
+            "decode_seconds": decode_seconds,
+        }
+
+    @staticmethod
+    def find_files(directory: str) -> list:
+        """
+        Wyszukuje pliki WAV w katalogu (rekurencyjnie).
+
+        Args:
+            directory (str): Katalog z nagraniami.
+
+        Returns:
+            list: Posortowana lista ścieżek do plików WAV.
+        """
+        paths = []
+        for root, _, files in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".wav"))
+        return sorted(paths)
+
+    def run(self, paths: list) -> tuple:
+        """
+        Przetwarza listę plików w puli procesów.
+
+        Args:
+            paths (list): Ścieżki do plików WAV.
+
+        Returns:
+            tuple: (list, dict)
+                - list: Wyniki dla kolejnych plików.
+                - dict: Podsumowanie wydajności (RTF, pliki na sekundę).
+        """
+        self.logger.info(f"Przetwarzanie {len(paths)} plików w {self.workers} procesach")
+        start = time.perf_counter()
+        # Analiza archiwum nie zużywa dziennego budżetu tokenów i nie wypełnia pamięci diagnoz rozmów
+        with tempfile.TemporaryDirectory() as cache_dir:
+            initargs = (self.model_path, self.analyze, cache_dir)
+            with Pool(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                results = pool.map(_process_file, paths, chunksize=1)
+        wall_seconds = time.perf_counter() - start
+
+        audio_seconds = sum(result["audio_seconds"] for result in results)
+        decode_seconds = sum(result["decode_seconds"] for result in results)
+        summary = {
+            "files": len(results),
+            "errors": sum(1 for result in results if "error" in result),
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall_seconds,
+            # RTF pojedynczego dekodera oraz całej puli względem długości nagrań
+            "rtf": decode_seconds / audio_seconds if audio_seconds else 0.0,
+            "wall_rtf": wall_seconds / audio_seconds if audio_seconds else 0.0,
+            "files_per_second": len(results) / wall_seconds if wall_seconds else 0.0,
+        }
+        return results, summary
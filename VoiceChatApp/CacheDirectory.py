@@ -0,0 +1,79 @@
+import os
+import stat
+import sys
+
+
+class CacheDirectory:
+    """
+    Klasa CacheDirectory wyznacza i weryfikuje katalog pamięci podręcznej aplikacji.
+
+    Katalog domyślny należy do użytkownika (np. `~/.cache/VoiceChatApp`), a nie do wspólnego
+    katalogu tymczasowego, w którym inny użytkownik systemu mógłby go utworzyć wcześniej
+    i podłożyć własne pliki. Przed odczytem pamięci podręcznej sprawdzane jest, czy katalog
+    i plik należą do bieżącego użytkownika i nie są zapisywalne przez innych.
+    """
+
+    APP_NAME = "VoiceChatApp"
+
+    @classmethod
+    def default(cls) -> str:
+        """
+        Zwraca domyślny katalog pamięci podręcznej bieżącego użytkownika.
+
+        Returns:
+            str: %LOCALAPPDATA%\\VoiceChatApp\\Cache (Windows), ~/Library/Caches/VoiceChatApp (macOS)
+                 lub $XDG_CACHE_HOME/VoiceChatApp (domyślnie ~/.cache/VoiceChatApp).
+        """
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+            return os.path.join(base, cls.APP_NAME, "Cache")
+        if sys.platform == "darwin":
+            return os.path.join(os.path.expanduser("~"), "Library", "Caches", cls.APP_NAME)
+        base = os.environ.get("XDG_CACHE_HOME")
+        if not base or not os.path.isabs(base):
+            base = os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, cls.APP_NAME)
+
+    @classmethod
+    def ensure(cls, path: str) -> str:
+        """
+        Tworzy katalog (z prawami tylko dla właściciela), jeśli nie istnieje, i sprawdza, czy można mu ufać.
+
+        Args:
+            path (str): Ścieżka katalogu.
+
+        Returns:
+            str: Ta sama ścieżka.
+
+        Raises:
+            PermissionError: Jeśli katalog należy do innego użytkownika lub mogą w nim zapisywać inni.
+        """
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        if not cls.is_trusted(path):
+            raise PermissionError(f"Katalog pamięci podręcznej {path} nie należy wyłącznie "
+                                  f"do bieżącego użytkownika")
+        return path
+
+    @staticmethod
+    def is_trusted(path: str) -> bool:
+        """
+        Sprawdza, czy katalog lub plik należy do bieżącego użytkownika i nie mogą go zmieniać inni.
+
+        Dowiązania symboliczne nie są akceptowane. W systemie Windows katalog użytkownika
+        jest chroniony uprawnieniami profilu, więc sprawdzane jest tylko istnienie ścieżki.
+
+        Args:
+            path (str): Ścieżka katalogu lub pliku.
+
+        Returns:
+            bool: True, jeśli ścieżce można ufać.
+        """
+        try:
+            info = os.lstat(path)
+        except OSError:
+            return False
+        if stat.S_ISLNK(info.st_mode):
+            return False
+        if not hasattr(os, "getuid"):
+            return True
+        return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import scrolledtext
 import logging
+import queue
+import threading
+import time
 from PIL import Image, ImageTk
 
 
@@ -15,15 +18,19 @@ class ChatGUI:
     - Edycja i podgląd rozpoznanego tekstu.
 
     - Sterowanie nagrywaniem za pomocą przycisków.
+
+    - Bezpieczne przekazywanie aktualizacji z wątków roboczych do wątku GUI.
     """
 
-    def __init__(self, parent, debug=False):
+    def __init__(self, parent, debug=False, max_redraws_per_second=30):
         """
         Inicjalizuje obiekt ChatGUI i konfiguruje środowisko GUI i ładuje wymagane zasoby.
 
         Args:
             parent (VoiceChatApp): Instancja klasy VoiceChatApp, która zarządza logiką aplikacji.
             debug (bool, optional): Jeśli True, włącza tryb debugowania w logach. Domyślnie False.
+            max_redraws_per_second (int, optional): Maksymalna liczba odświeżeń każdego z widżetów
+                aktualizowanych z wątków roboczych na sekundę. Domyślnie 30.
 
         Raises:
             TypeError: Jeśli `parent` nie jest instancją klasy VoiceChatApp.
@@ -43,6 +50,17 @@ class ChatGUI:
         self.generate_icons()
         self.create_widgets()
 
+        # Magistrala aktualizacji: wątki robocze tylko publikują zmiany, a wątek GUI je rysuje
+        self.updates = queue.SimpleQueue()
+        self._latest = {}
+        self._latest_lock = threading.Lock()
+        self._rendered = {}
+        self.drain_interval = max(1, 1000 // max_redraws_per_second)
+        self.redraw_count = 0
+        self.skipped_count = 0
+        self._stats_start = time.perf_counter()
+        self.root.after(self.drain_interval, self._drain_updates)
+
     def create_widgets(self):
         """
         Tworzy wszystkie widżety interfejsu użytkownika i dodaje je do głównego okna aplikacji.
@@ -108,6 +126,117 @@ class ChatGUI:
 
         self.root.protocol("WM_DELETE_WINDOW", self.__del__)
 
+    def post(self, func, *args):
+        """
+        Zleca wywołanie funkcji w wątku GUI (bezpieczne z dowolnego wątku).
+        Zlecenia są wykonywane w kolejności publikacji.
+
+        Args:
+            func (callable): Funkcja do wywołania.
+            *args: Argumenty funkcji.
+        """
+        self.updates.put((func, args))
+
+    def post_latest(self, key: str, func, *args, diff=True):
+        """
+        Publikuje aktualizację, z której w danej klatce rysowana jest tylko najnowsza wersja
+        (bezpieczne z dowolnego wątku).
+
+        Args:
+            key (str): Identyfikator aktualizowanego elementu.
+            func (callable): Funkcja rysująca.
+            *args: Argumenty funkcji.
+            diff (bool): Czy pomijać aktualizację identyczną z ostatnio narysowaną. Domyślnie True.
+        """
+        with self._latest_lock:
+            self._latest[key] = (func, args, diff)
+
+    def post_partial_text(self, text: str):
+        """
+        Publikuje częściowo rozpoznany tekst (bezpieczne z dowolnego wątku).
+
+        Args:
+            text (str): Częściowy wynik rozpoznawania.
+        """
+        self.post_latest("partial", self.set_partial_text, text)
+
+    def post_voice_text(self, text: str):
+        """
+        Publikuje rozpoznany tekst do pola edycyjnego (bezpieczne z dowolnego wątku).
+
+        Args:
+            text (str): Rozpoznany tekst.
+        """
+        # Pole edycyjne może zmienić użytkownik, dlatego zawsze jest nadpisywane
+        self.post_latest("voice", self.set_voice_text, text, diff=False)
+
+    def post_status(self, status: str):
+        """
+        Publikuje nowy stan systemu (bezpieczne z dowolnego wątku).
+
+        Args:
+            status (str): Tekst reprezentujący aktualny stan systemu.
+        """
+        self.post_latest("status", self.update_status_label, status)
+
+    def _drain_updates(self):
+        """
+        Funkcja pomocnicza: cyklicznie (w wątku GUI) rysuje opublikowane aktualizacje.
+
+        Najpierw rysowane są najnowsze wersje aktualizacji łączonych, a następnie
+        zlecenia z kolejki, dzięki czemu zlecenia widzą aktualny stan widżetów.
+        """
+        with self._latest_lock:
+            latest, self._latest = self._latest, {}
+
+        for key, (func, args, diff) in latest.items():
+            if diff and self._rendered.get(key) == args:
+                self.skipped_count += 1
+                continue
+            func(*args)
+
+        while True:
+            try:
+                func, args = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+
+        self.root.after(self.drain_interval, self._drain_updates)
+
+    def redraw_rate(self) -> float:
+        """
+        Zwraca średnią liczbę odświeżeń widżetów na sekundę od uruchomienia GUI.
+
+        Returns:
+            float: Liczba odświeżeń na sekundę.
+        """
+        elapsed = time.perf_counter() - self._stats_start
+        return self.redraw_count / elapsed if elapsed > 0 else 0.0
+
+    def set_partial_text(self, text: str):
+        """
+        Wyświetla częściowo rozpoznany tekst (tylko w wątku GUI).
+
+        Args:
+            text (str): Częściowy wynik rozpoznawania.
+        """
+        self.user_input_voice_partial.config(text=text)
+        self._rendered["partial"] = (text,)
+        self.redraw_count += 1
+
+    def set_voice_text(self, text: str):
+        """
+        Zastępuje zawartość pola edycyjnego rozpoznanym tekstem (tylko w wątku GUI).
+
+        Args:
+            text (str): Rozpoznany tekst.
+        """
+        self.user_input_voice.delete("1.0", tk.END)
+        self.user_input_voice.insert(tk.END, text)
+        self._rendered["voice"] = (text,)
+        self.redraw_count += 1
+
     def update_status_label(self, status: str):
         """
         Aktualizuje etykietę stanu systemu w GUI.
@@ -116,6 +245,7 @@ class ChatGUI:
             status (str): Tekst reprezentujący aktualny stan systemu.
         """
         self.system_status.config(text=status)
+        self._rendered["status"] = (status,)
 
     def update_speaking_button(self, is_speaking):
         """
@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Klasa CircuitBreaker odcina wywołania usługi (modelu AI), która przestała odpowiadać w akceptowalnym czasie.
+
+    Stany obwodu:
+
+    - Zamknięty (CLOSED) - wywołania są wykonywane. Po `failure_threshold` kolejnych błędach
+      lub odpowiedziach wolniejszych niż `latency_budget` obwód się otwiera.
+
+    - Otwarty (OPEN) - wywołania są od razu odrzucane, a wywołujący korzysta z odpowiedzi zastępczej.
+      Po czasie `reset_timeout` obwód przechodzi w stan półotwarty.
+
+    - Półotwarty (HALF_OPEN) - dopuszczane jest jedno wywołanie próbne. Powodzenie zamyka obwód,
+      błąd otwiera go ponownie.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, latency_budget=8.0, reset_timeout=30.0, clock=time.monotonic,
+                 debug=False):
+        """
+        Inicjalizuje zamknięty obwód.
+
+        Args:
+            failure_threshold (int): Liczba kolejnych niepowodzeń otwierająca obwód. Domyślnie 3.
+            latency_budget (float): Maksymalny akceptowalny czas wywołania w sekundach. Domyślnie 8.
+            reset_timeout (float): Czas w sekundach, po którym otwarty obwód dopuszcza wywołanie próbne.
+                Domyślnie 30.
+            clock (callable): Źródło czasu (sekundy). Domyślnie time.monotonic.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.failure_threshold = failure_threshold
+        self.latency_budget = latency_budget
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """
+        Bieżący stan obwodu (otwarty obwód po upływie `reset_timeout` jest półotwarty).
+
+        Returns:
+            str: CLOSED, OPEN lub HALF_OPEN.
+        """
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """
+        Sprawdza, czy wywołanie może zostać wykonane. W stanie półotwartym dopuszcza jedno wywołanie próbne.
+
+        Po dopuszczonym wywołaniu należy zgłosić jego wynik metodą `record_success` lub `record_failure`.
+
+        Returns:
+            bool: True, jeśli wywołanie może zostać wykonane.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                self.logger.info("Obwód półotwarty - wywołanie próbne")
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float):
+        """
+        Zgłasza zakończone wywołanie. Odpowiedź wolniejsza niż `latency_budget` liczy się jako niepowodzenie.
+
+        Args:
+            latency (float): Czas wywołania w sekundach.
+        """
+        if latency > self.latency_budget:
+            self.logger.warning(f"Przekroczony budżet czasu: {latency:.2f} s > {self.latency_budget:.2f} s")
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state != self.CLOSED:
+                self.logger.info("Obwód zamknięty - usługa odpowiada poprawnie")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """
+        Zgłasza nieudane wywołanie. Otwiera obwód po `failure_threshold` kolejnych niepowodzeniach
+        lub po nieudanym wywołaniu próbnym.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state == self.CLOSED or self._probing:
+                    self.opened += 1
+                    self.logger.warning(f"Obwód otwarty po {self._failures} niepowodzeniach")
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+
+    def stats(self) -> dict:
+        """
+        Zwraca statystyki obwodu.
+
+        Returns:
+            dict: Stan, liczba kolejnych niepowodzeń, liczba otwarć obwodu i odrzuconych wywołań.
+        """
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+    def _current_state(self) -> str:
+        """
+        Funkcja pomocnicza: wyznacza stan obwodu (wywoływana z założoną blokadą).
+        """
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
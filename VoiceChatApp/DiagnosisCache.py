@@ -0,0 +1,230 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .CacheDirectory import CacheDirectory
+
+
+class DiagnosisCache:
+    """
+    Klasa DiagnosisCache przechowuje odpowiedzi modelu AI dla już opisanych zestawów objawów.
+
+    Kluczem jest wersja zapytania oraz znormalizowany wektor objawów (objaw obecny, nieobecny
+    lub nieznany), więc pacjenci z tym samym zestawem objawów otrzymują odpowiedź bez
+    komunikacji z API. Pamięć podręczna ma dwa poziomy:
+
+    - Pamięć operacyjna (LRU) - odpowiedź w mikrosekundach.
+
+    - Baza SQLite na dysku - zachowuje odpowiedzi między uruchomieniami aplikacji.
+
+    Wpisy wygasają po czasie `ttl`, a po przekroczeniu `max_entries` usuwane są najdawniej używane.
+    """
+
+    def __init__(self, path=None, memory_size=1024, max_entries=100000, ttl=30 * 24 * 3600, debug=False):
+        """
+        Inicjalizuje pamięć podręczną diagnoz.
+
+        Args:
+            path (str | None): Ścieżka bazy SQLite lub None, aby przechowywać odpowiedzi tylko w pamięci.
+                Baza jest pomijana, jeśli ona lub jej katalog nie należą wyłącznie do bieżącego użytkownika.
+            memory_size (int): Liczba wpisów przechowywanych w pamięci operacyjnej. Domyślnie 1024.
+            max_entries (int): Maksymalna liczba wpisów w bazie na dysku. Domyślnie 100000.
+            ttl (float): Czas ważności wpisu w sekundach. Domyślnie 30 dni.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            try:
+                CacheDirectory.ensure(os.path.dirname(os.path.abspath(path)))
+                # Podłożona baza z gotowymi diagnozami byłaby odczytywana pacjentom
+                if os.path.exists(path) and not CacheDirectory.is_trusted(path):
+                    raise PermissionError(f"Baza {path} nie należy wyłącznie do bieżącego użytkownika")
+                # Połączenie jest współdzielone przez wątki, dostęp chroni self._lock
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                # Dziennik WAL: odczyty nie blokują zapisów innych procesów, a zatwierdzenia są tańsze
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS diagnoses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS diagnoses_last_used ON diagnoses (last_used)")
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning(f"Pamięć podręczna diagnoz działa tylko w pamięci operacyjnej: {e}")
+                self._db = None
+
+    @staticmethod
+    def key(prompt_version, symptoms: list, user_symptoms: dict) -> str:
+        """
+        Tworzy klucz pamięci podręcznej z wersji zapytania i wektora objawów.
+
+        Args:
+            prompt_version (int | str): Wersja szablonu zapytania do modelu AI.
+            symptoms (list): Objawy w ustalonej kolejności.
+            user_symptoms (dict): Słownik objaw -> True/False/None (objawy spoza słownika są nieznane).
+
+        Returns:
+            str: Klucz, np. "1:1000?00100000" (1 - obecny, 0 - nieobecny, ? - nieznany).
+        """
+        vector = []
+        for symptom in symptoms:
+            # Objaw, którego brak w słowniku, jest nieznany
+            value = user_symptoms.get(symptom)
+            vector.append("?" if value is None else "1" if value else "0")
+        return f"{prompt_version}:{''.join(vector)}"
+
+    def get(self, key: str):
+        """
+        Zwraca zapamiętaną odpowiedź.
+
+        Args:
+            key (str): Klucz utworzony metodą `key`.
+
+        Returns:
+            str | None: Odpowiedź lub None, jeśli jej brak albo wygasła.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT response, created FROM diagnoses WHERE key = ?", (key,)).fetchone()
+                    if row is not None and now - row[1] < self.ttl:
+                        self._db.execute("UPDATE diagnoses SET last_used = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, row[0], row[1])
+                        self.disk_hits += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    # Pamięć podręczna nie może przerwać diagnozy - brak wpisu oznacza zapytanie do modelu
+                    self.logger.warning(f"Błąd odczytu pamięci podręcznej diagnoz: {e}")
+
+            self._memory.pop(key, None)
+            self.misses += 1
+            return None
+
+    def peek(self, key: str):
+        """
+        Zwraca zapamiętaną odpowiedź bez aktualizowania statystyk trafień i kolejności LRU.
+
+        Args:
+            key (str): Klucz utworzony metodą `key`.
+
+        Returns:
+            str | None: Odpowiedź lub None, jeśli jej brak albo wygasła.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                return entry[0]
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT response, created FROM diagnoses WHERE key = ?", (key,)).fetchone()
+                    if row is not None and now - row[1] < self.ttl:
+                        return row[0]
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Błąd odczytu pamięci podręcznej diagnoz: {e}")
+            return None
+
+    def put(self, key: str, response: str):
+        """
+        Zapamiętuje odpowiedź modelu AI.
+
+        Args:
+            key (str): Klucz utworzony metodą `key`.
+            response (str): Odpowiedź do zapamiętania.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO diagnoses (key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                        (key, response, now, now)
+                    )
+                    self._writes += 1
+                    # Sprzątanie co pewną liczbę zapisów, aby nie obciążać każdego z nich
+                    if self._writes % 100 == 0:
+                        self._evict(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Błąd zapisu pamięci podręcznej diagnoz: {e}")
+
+    def _remember(self, key: str, response: str, created: float):
+        """
+        Funkcja pomocnicza: zapisuje wpis w pamięci operacyjnej, usuwając najdawniej używane.
+        """
+        self._memory[key] = (response, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """
+        Funkcja pomocnicza: usuwa z bazy wpisy wygasłe oraz najdawniej używane ponad limit.
+        """
+        self._db.execute("DELETE FROM diagnoses WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM diagnoses WHERE key IN ("
+            "SELECT key FROM diagnoses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def evict(self):
+        """
+        Usuwa z bazy wpisy wygasłe oraz najdawniej używane ponad limit `max_entries`.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._evict(time.time())
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """
+        Zwraca statystyki trafień.
+
+        Returns:
+            dict: Liczba trafień w pamięci, na dysku, chybień, odsetek trafień oraz liczba wpisów w pamięci.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self):
+        """
+        Zamyka połączenie z bazą SQLite.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,155 @@
+import json
+import logging
+import re
+from .SpeechLibrary import SpeechLibrary
+
+
+class DialogGrammar:
+    """
+    Klasa DialogGrammar przygotowuje gramatyki VOSK ograniczone do fraz oczekiwanych
+    w danym stanie rozmowy.
+
+    Większość tur rozmowy to krótkie odpowiedzi tak/nie, dla których dekodowanie pełnym,
+    otwartym słownikiem jest wolniejsze i częściej się myli. Słownictwo gramatyk pochodzi
+    z SpeechLibrary, a rozpoznawacze dla gramatyk są wypożyczane z RecognizerPool.
+
+    Stany rozmowy:
+
+    - "monolog": pierwszy opis dolegliwości (domyślnie otwarty słownik).
+
+    - "yes_no": odpowiedź na pytanie o objaw.
+
+    - "post_diagnosis": odpowiedź na pytanie zadane po diagnozie.
+    """
+
+    UNKNOWN = "[unk]"
+
+    def __init__(self, restrict_monolog=False, debug=False):
+        """
+        Inicjalizuje obiekt DialogGrammar i przygotowuje gramatyki dla stanów rozmowy.
+
+        Args:
+            restrict_monolog (bool): Czy ograniczać również monolog do słownictwa objawów.
+                Domyślnie False - monolog jest dekodowany pełnym słownikiem.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        phrases = {
+            "monolog": self.monolog_phrases() if restrict_monolog else None,
+            "yes_no": self.yes_no_phrases(),
+            "post_diagnosis": self.post_diagnosis_phrases(),
+        }
+        self.grammars = {
+            state: json.dumps(phrase_list, ensure_ascii=False) if phrase_list else None
+            for state, phrase_list in phrases.items()
+        }
+        for state, phrase_list in phrases.items():
+            if phrase_list:
+                self.logger.debug(f"Gramatyka '{state}': {len(phrase_list)} fraz")
+
+    @staticmethod
+    def normalize_phrase(phrase: str) -> str:
+        """
+        Sprowadza frazę do postaci zgodnej ze słownikiem modelu (małe litery, bez interpunkcji).
+
+        Args:
+            phrase (str): Fraza z SpeechLibrary.
+
+        Returns:
+            str: Znormalizowana fraza lub pusty ciąg, jeśli fraza zawiera cyfry lub pojedyncze litery.
+        """
+        words = re.sub(r"[^\w\s]", " ", phrase.lower()).split()
+        if not words or any(word.isdigit() or len(word) < 2 for word in words):
+            return ""
+        return " ".join(words)
+
+    @classmethod
+    def _unique(cls, phrases) -> list:
+        """
+        Funkcja pomocnicza: normalizuje frazy, usuwa duplikaty i dodaje token nieznanego słowa.
+
+        Args:
+            phrases (iterable): Frazy źródłowe.
+
+        Returns:
+            list: Lista fraz gramatyki zakończona tokenem "[unk]".
+        """
+        result = []
+        for phrase in phrases:
+            phrase = cls.normalize_phrase(phrase)
+            if phrase and phrase not in result:
+                result.append(phrase)
+        result.append(cls.UNKNOWN)
+        return result
+
+    @classmethod
+    def yes_no_phrases(cls) -> list:
+        """
+        Zwraca frazy oczekiwane w odpowiedzi na pytanie o objaw.
+
+        Returns:
+            list: Odpowiedzi tak/nie oraz komendy resetu rozmowy.
+        """
+        return cls._unique(
+            list(SpeechLibrary.response_yes_no_pattern)
+            + SpeechLibrary.reset_speech_phrases
+        )
+
+    @classmethod
+    def post_diagnosis_phrases(cls) -> list:
+        """
+        Zwraca frazy oczekiwane po przedstawieniu diagnozy.
+
+        Returns:
+            list: Odpowiedzi tak/nie, komendy zakończenia oraz resetu rozmowy.
+        """
+        return cls._unique(
+            list(SpeechLibrary.response_yes_no_pattern)
+            + SpeechLibrary.end_speech_phrases
+            + SpeechLibrary.reset_speech_phrases
+        )
+
+    @classmethod
+    def monolog_phrases(cls) -> list:
+        """
+        Zwraca słownictwo opisu dolegliwości zbudowane z nazw objawów i ich synonimów.
+
+        Returns:
+            list: Nazwy objawów, synonimy, frazy o braku innych objawów oraz komendy rozmowy.
+        """
+        phrases = list(SpeechLibrary.required_symptoms)
+        for syn_list in SpeechLibrary.synonyms.values():
+            phrases.extend(syn_list)
+        return cls._unique(
+            phrases
+            + SpeechLibrary.no_other_symptoms_phrases
+            + SpeechLibrary.reset_speech_phrases
+            + SpeechLibrary.end_speech_phrases
+        )
+
+    def grammar(self, state: str):
+        """
+        Zwraca gramatykę właściwą dla stanu rozmowy.
+
+        Args:
+            state (str): Stan rozmowy ("monolog", "yes_no" lub "post_diagnosis").
+
+        Returns:
+            str | None: Gramatyka w formacie JSON lub None dla pełnego słownika.
+        """
+        return self.grammars.get(state)
+
+    @classmethod
+    def clean(cls, text: str) -> str:
+        """
+        Usuwa z rozpoznanego tekstu tokeny słów spoza gramatyki.
+
+        Args:
+            text (str): Tekst zwrócony przez rozpoznawacz.
+
+        Returns:
+            str: Tekst bez tokenów "[unk]".
+        """
+        return " ".join(word for word in text.split() if word != cls.UNKNOWN)
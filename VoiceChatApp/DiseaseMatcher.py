@@ -0,0 +1,166 @@
+import numpy as np
+from .SpeechLibrary import SpeechLibrary
+
+
+class DiseaseMatcher:
+    """
+    Klasa DiseaseMatcher dopasowuje objawy pacjenta do wzorców chorób.
+
+    Tabela wzorców jest kompilowana raz do macierzy choroby x objawy, a odległość pacjenta
+    od wszystkich chorób jest wyznaczana jednym mnożeniem macierzy przez wektor
+    (ważona odległość Hamminga liczona tylko po objawach o znanej odpowiedzi).
+    Dzięki temu koszt zapytania rośnie liniowo z rozmiarem macierzy, bez pętli w Pythonie.
+    """
+
+    _default = None
+
+    def __init__(self, table: list, symptoms: list, weights=None):
+        """
+        Kompiluje tabelę wzorców do macierzy.
+
+        Args:
+            table (list): Lista słowników opisujących choroby (objaw -> True/False oraz dane choroby).
+            symptoms (list): Objawy tworzące kolumny macierzy.
+            weights (dict | None): Wagi objawów w odległości (objaw -> waga). Domyślnie wszystkie równe 1.
+        """
+        self.table = list(table)
+        self.symptoms = list(symptoms)
+        self.columns = {symptom: column for column, symptom in enumerate(self.symptoms)}
+        self.matrix = np.array(
+            [[bool(disease.get(symptom, False)) for symptom in self.symptoms] for disease in self.table],
+            dtype=np.float32
+        ).reshape(len(self.table), len(self.symptoms))
+        self.weights = np.ones(len(self.symptoms), dtype=np.float32)
+        for symptom, weight in (weights or {}).items():
+            self.weights[self.columns[symptom]] = weight
+
+    @classmethod
+    def from_matrix(cls, table: list, symptoms: list, matrix: np.ndarray, weights=None):
+        """
+        Tworzy matcher z gotowej macierzy choroby x objawy (np. wczytanej z pamięci podręcznej bazy wiedzy).
+
+        Args:
+            table (list): Lista słowników opisujących choroby.
+            symptoms (list): Objawy tworzące kolumny macierzy.
+            matrix (np.ndarray): Macierz obecności objawów (wiersze w kolejności `table`).
+            weights (dict | None): Wagi objawów w odległości. Domyślnie wszystkie równe 1.
+
+        Returns:
+            DiseaseMatcher: Matcher korzystający z podanej macierzy.
+
+        Raises:
+            ValueError: Jeśli wymiary macierzy nie odpowiadają tabeli i objawom.
+        """
+        if matrix.shape != (len(table), len(symptoms)):
+            raise ValueError(f"Macierz chorób ma wymiary {matrix.shape} zamiast {(len(table), len(symptoms))}")
+        matcher = cls([], symptoms, weights)
+        matcher.table = list(table)
+        matcher.matrix = matrix.astype(np.float32)
+        return matcher
+
+    @classmethod
+    def from_library(cls):
+        """
+        Zwraca matcher zbudowany z tabeli SpeechLibrary, kompilując go tylko przy pierwszym wywołaniu.
+
+        Returns:
+            DiseaseMatcher: Współdzielony matcher.
+        """
+        if cls._default is None:
+            cls._default = cls(SpeechLibrary.symptoms_table, SpeechLibrary.required_symptoms)
+        return cls._default
+
+    def vectorize(self, user_symptoms: dict) -> tuple:
+        """
+        Zamienia słownik objawów pacjenta na wektory obecności i znanych odpowiedzi.
+
+        Objaw nieobecny w słowniku jest traktowany jak zaprzeczony, a wartość None oznacza
+        odpowiedź nieznaną, pomijaną w odległości.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - wektor obecności objawów oraz maska znanych odpowiedzi.
+        """
+        present = np.zeros(len(self.symptoms), dtype=np.float32)
+        known = np.ones(len(self.symptoms), dtype=np.float32)
+        for symptom, value in user_symptoms.items():
+            column = self.columns.get(symptom)
+            if column is None:
+                continue
+            if value is None:
+                known[column] = 0
+            elif value:
+                present[column] = 1
+        return present, known
+
+    def distances(self, user_symptoms: dict) -> np.ndarray:
+        """
+        Wyznacza ważoną odległość Hamminga pacjenta od każdej choroby.
+
+        Niezgodność objawu j kosztuje w_j, więc odległość to
+        sum_j w_j * k_j * |M_ij - p_j| = M @ (w * k * (1 - 2p)) + sum_j w_j * k_j * p_j.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+
+        Returns:
+            np.ndarray: Odległości w kolejności tabeli wzorców.
+        """
+        present, known = self.vectorize(user_symptoms)
+        weights = self.weights * known
+        return self.matrix @ (weights * (1 - 2 * present)) + weights @ present
+
+    def rank(self, user_symptoms: dict, limit=None) -> list:
+        """
+        Zwraca choroby uporządkowane od najbliższej objawom pacjenta.
+
+        Przy równych odległościach zachowana jest kolejność tabeli wzorców.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+            limit (int | None): Maksymalna liczba zwracanych chorób. Domyślnie wszystkie.
+
+        Returns:
+            list: Lista par (choroba, odległość).
+        """
+        distances = self.distances(user_symptoms)
+        if limit is not None and limit < len(distances):
+            nearest = np.argpartition(distances, limit - 1)[:limit]
+            # Kolejność tabeli jest kryterium drugorzędnym (lexsort sortuje po ostatnim kluczu)
+            order = nearest[np.lexsort((nearest, distances[nearest]))]
+        else:
+            order = np.argsort(distances, kind="stable")
+        return [(self.table[index], float(distances[index])) for index in order]
+
+    def consistent(self, user_symptoms: dict) -> np.ndarray:
+        """
+        Wyznacza choroby, których wzorzec nie przeczy żadnej znanej odpowiedzi pacjenta.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None (None - odpowiedź nieznana).
+
+        Returns:
+            np.ndarray: Maska logiczna w kolejności tabeli wzorców.
+        """
+        present, known = self.vectorize(user_symptoms)
+        return ((self.matrix == present) | (known == 0)).all(axis=1)
+
+    def exact(self, user_symptoms: dict):
+        """
+        Zwraca pierwszą chorobę, której wzorzec jest identyczny z objawami pacjenta.
+
+        Dopasowanie dokładne wymaga znanej odpowiedzi dla każdego objawu.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+
+        Returns:
+            dict | None: Dane choroby lub None, jeśli żaden wzorzec nie jest identyczny.
+        """
+        if any(user_symptoms.get(symptom, False) is None for symptom in self.symptoms):
+            return None
+        present, _ = self.vectorize(user_symptoms)
+        matches = np.flatnonzero((self.matrix == present).all(axis=1))
+        return self.table[matches[0]] if len(matches) else None
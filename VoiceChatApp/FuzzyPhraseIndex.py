@@ -0,0 +1,292 @@
+from collections import Counter
+from .SpeechLibrary import SpeechLibrary
+from .TextNormalizer import TextNormalizer
+
+
+class FuzzyPhraseIndex:
+    """
+    Klasa FuzzyPhraseIndex odnajduje frazy objawów w wypowiedziach zniekształconych przez
+    błędy rozpoznawania mowy lub literówki.
+
+    Frazy i wypowiedzi są najpierw normalizowane (TextNormalizer), a następnie frazy
+    są indeksowane odwróconym indeksem trigramów znakowych. Wyszukiwanie przebiega dwuetapowo:
+
+    - Preselekcja: liczba trigramów frazy obecnych w wypowiedzi (koszt zależny od długości
+      wypowiedzi, a nie od liczby fraz).
+
+    - Weryfikacja: ograniczona odległość edycyjna frazy od najlepiej pasującego fragmentu
+      wypowiedzi, liczona tylko w zakresie nieprzekraczającym dopuszczalnego progu.
+    """
+
+    N = 3
+
+    _default = None
+
+    def __init__(self, phrases: dict, max_error_ratio=0.2, min_overlap=0.5, min_phrase_length=6,
+                 max_candidates=50):
+        """
+        Buduje indeks trigramów dla podanych fraz.
+
+        Args:
+            phrases (dict): Słownik fraza -> etykieta (np. nazwa objawu).
+            max_error_ratio (float): Dopuszczalna liczba błędów edycyjnych jako ułamek długości frazy. Domyślnie 0.2.
+            min_overlap (float): Minimalny odsetek trigramów frazy obecnych w wypowiedzi. Domyślnie 0.5.
+            min_phrase_length (int): Krótsze frazy są dopasowywane tylko dokładnie. Domyślnie 6.
+            max_candidates (int): Maksymalna liczba fraz weryfikowanych odległością edycyjną. Domyślnie 50.
+        """
+        self.max_error_ratio = max_error_ratio
+        self.min_overlap = min_overlap
+        self.max_candidates = max_candidates
+        self.phrases = []
+        self.labels = []
+        self.gram_counts = []
+        self.min_counts = []
+        self.index = {}
+        seen = set()
+        for phrase, label in phrases.items():
+            phrase = TextNormalizer.normalize(phrase)
+            if len(phrase) < min_phrase_length or phrase in seen:
+                continue
+            seen.add(phrase)
+            phrase_id = len(self.phrases)
+            grams = self.ngrams(phrase)
+            self.phrases.append(phrase)
+            self.labels.append(label)
+            self.gram_counts.append(len(grams))
+            # Fraza z k błędami zachowuje co najmniej |G| - k*N swoich trigramów (lemat q-gramowy)
+            limit = self.error_limit(phrase)
+            self.min_counts.append(max(1, len(grams) - limit * self.N, int(min_overlap * len(grams))))
+            for gram in grams:
+                self.index.setdefault(gram, []).append(phrase_id)
+
+    def to_state(self) -> dict:
+        """
+        Zwraca indeks w postaci zgodnej z JSON (do zapisu w pamięci podręcznej bazy wiedzy).
+
+        Returns:
+            dict: Parametry, frazy z etykietami i indeks odwrócony trigramów.
+        """
+        return {
+            "max_error_ratio": self.max_error_ratio,
+            "min_overlap": self.min_overlap,
+            "max_candidates": self.max_candidates,
+            "phrases": self.phrases,
+            "labels": self.labels,
+            "gram_counts": self.gram_counts,
+            "min_counts": self.min_counts,
+            "index": self.index,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        """
+        Odtwarza indeks z postaci zwróconej przez to_state, bez ponownego wyznaczania trigramów.
+
+        Args:
+            state (dict): Stan indeksu.
+
+        Returns:
+            FuzzyPhraseIndex: Odtworzony indeks.
+
+        Raises:
+            ValueError: Jeśli stan jest niespójny.
+        """
+        index = cls({}, state["max_error_ratio"], state["min_overlap"], max_candidates=state["max_candidates"])
+        index.phrases = state["phrases"]
+        index.labels = state["labels"]
+        index.gram_counts = state["gram_counts"]
+        index.min_counts = state["min_counts"]
+        index.index = state["index"]
+        if not len(index.phrases) == len(index.labels) == len(index.gram_counts) == len(index.min_counts):
+            raise ValueError("Niespójny stan indeksu fraz")
+        return index
+
+    @classmethod
+    def from_library(cls):
+        """
+        Zwraca indeks synonimów objawów z SpeechLibrary, budując go tylko przy pierwszym wywołaniu.
+
+        Returns:
+            FuzzyPhraseIndex: Współdzielony indeks.
+        """
+        if cls._default is None:
+            cls._default = cls.from_synonyms(SpeechLibrary.required_symptoms, SpeechLibrary.synonyms)
+        return cls._default
+
+    @classmethod
+    def from_synonyms(cls, required_symptoms, synonyms):
+        """
+        Buduje indeks z nazw objawów i ich synonimów.
+
+        Args:
+            required_symptoms (list): Objawy, o które pyta system.
+            synonyms (dict): Słownik objaw -> lista synonimów.
+
+        Returns:
+            FuzzyPhraseIndex: Nowy indeks.
+        """
+        phrases = {}
+        for symptom in required_symptoms:
+            phrases[symptom] = symptom
+            for phrase in synonyms.get(symptom, []):
+                phrases.setdefault(phrase, symptom)
+        return cls(phrases)
+
+    def error_limit(self, phrase: str) -> int:
+        """
+        Zwraca dopuszczalną liczbę błędów edycyjnych dla frazy.
+
+        Args:
+            phrase (str): Fraza z indeksu.
+
+        Returns:
+            int: Maksymalna odległość edycyjna (co najmniej 1).
+        """
+        return max(1, int(len(phrase) * self.max_error_ratio))
+
+    @classmethod
+    def ngrams(cls, text: str) -> set:
+        """
+        Zwraca zbiór trigramów znakowych tekstu (z granicami słów oznaczonymi spacją).
+
+        Args:
+            text (str): Tekst źródłowy.
+
+        Returns:
+            set: Trigramy tekstu.
+        """
+        padded = f" {' '.join(text.split())} "
+        return {padded[i:i + cls.N] for i in range(len(padded) - cls.N + 1)}
+
+    @classmethod
+    def bounded_distance(cls, phrase: str, text: str, limit: int):
+        """
+        Wyznacza najmniejszą odległość edycyjną frazy od dowolnego fragmentu tekstu.
+
+        Args:
+            phrase (str): Szukana fraza.
+            text (str): Przeszukiwany tekst.
+            limit (int): Maksymalna dopuszczalna odległość.
+
+        Returns:
+            int | None: Odległość lub None, jeśli przekracza limit.
+        """
+        located = cls.locate(phrase, text, limit)
+        return located[0] if located else None
+
+    @staticmethod
+    def locate(phrase: str, text: str, limit: int):
+        """
+        Wyznacza najmniejszą odległość edycyjną frazy od dowolnego fragmentu tekstu i koniec tego fragmentu.
+
+        Wykorzystuje bitowo-równoległy algorytm Myersa: cała kolumna macierzy odległości
+        jest reprezentowana jako para masek bitowych, więc koszt jest liniowy względem długości tekstu.
+
+        Args:
+            phrase (str): Szukana fraza.
+            text (str): Przeszukiwany tekst.
+            limit (int): Maksymalna dopuszczalna odległość.
+
+        Returns:
+            tuple | None: (int, int) - odległość i indeks ostatniego znaku fragmentu
+                          lub None, jeśli odległość przekracza limit.
+        """
+        size = len(phrase)
+        masks = {}
+        for i, char in enumerate(phrase):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        full = (1 << size) - 1
+        high = 1 << (size - 1)
+
+        positive, negative = full, 0
+        score = best = size
+        best_end = -1
+        for end, char in enumerate(text):
+            eq = masks.get(char, 0)
+            xv = eq | negative
+            xh = (((eq & positive) + positive) ^ positive) | eq
+            horizontal_pos = negative | (~(xh | positive) & full)
+            horizontal_neg = positive & xh
+            if horizontal_pos & high:
+                score += 1
+            elif horizontal_neg & high:
+                score -= 1
+                if score < best:
+                    best, best_end = score, end
+                    if best == 0:
+                        return 0, end
+            # Początek dopasowania w tekście jest dowolny, więc do pierwszego wiersza wsuwane jest 0
+            horizontal_pos = (horizontal_pos << 1) & full
+            horizontal_neg = (horizontal_neg << 1) & full
+            positive = horizontal_neg | (~(xv | horizontal_pos) & full)
+            negative = horizontal_pos & xv
+        return (best, best_end) if best <= limit else None
+
+    @staticmethod
+    def locate_start(phrase: str, text: str, end: int, limit: int) -> int:
+        """
+        Wyznacza początek fragmentu tekstu kończącego się na `end`, najbliższego frazie.
+
+        Odległość edycyjna jest liczona od końca (odwrócona fraza i tekst), tylko w oknie
+        o długości frazy powiększonej o `limit`, więc koszt nie zależy od długości wypowiedzi.
+
+        Args:
+            phrase (str): Szukana fraza.
+            text (str): Przeszukiwany tekst.
+            end (int): Indeks ostatniego znaku fragmentu (wynik metody locate).
+            limit (int): Maksymalna dopuszczalna odległość.
+
+        Returns:
+            int: Indeks pierwszego znaku fragmentu.
+        """
+        window = text[max(0, end + 1 - len(phrase) - limit):end + 1][::-1]
+        reversed_phrase = phrase[::-1]
+        # Wiersz macierzy odległości: fragment zakotwiczony na końcu, odwrócona fraza jako kolumny
+        row = list(range(len(reversed_phrase) + 1))
+        best, best_length = row[-1], 0
+        for length, char in enumerate(window, 1):
+            previous, row[0] = row[0], length
+            for i, phrase_char in enumerate(reversed_phrase, 1):
+                previous, row[i] = row[i], min(row[i] + 1, row[i - 1] + 1, previous + (char != phrase_char))
+            if row[-1] < best:
+                best, best_length = row[-1], length
+        return end + 1 - best_length
+
+    def match(self, text: str, exclude=()) -> dict:
+        """
+        Wyszukuje frazy podobne do fragmentów wypowiedzi.
+
+        Args:
+            text (str): Wypowiedź użytkownika.
+            exclude (iterable): Etykiety, których nie trzeba szukać (np. znalezione dokładnie).
+
+        Returns:
+            dict: Słownik etykieta -> (fraza, odległość edycyjna, (pierwsze słowo, słowo za ostatnim))
+                  najlepszego dopasowania. Słowa są numerowane jak w TextNormalizer.tokens(text),
+                  więc zakres można ocenić regułami przeczenia SymptomMatcher.scan.
+        """
+        text = TextNormalizer.normalize(text)
+        exclude = set(exclude)
+        overlap = Counter()
+        for gram in self.ngrams(text):
+            overlap.update(self.index.get(gram, ()))
+
+        min_counts = self.min_counts
+        candidates = [phrase_id for phrase_id, count in overlap.items() if count >= min_counts[phrase_id]]
+        if len(candidates) > self.max_candidates:
+            candidates.sort(key=lambda phrase_id: overlap[phrase_id] / self.gram_counts[phrase_id], reverse=True)
+            candidates = candidates[:self.max_candidates]
+
+        result = {}
+        for phrase_id in candidates:
+            label = self.labels[phrase_id]
+            if label in exclude:
+                continue
+            phrase = self.phrases[phrase_id]
+            limit = self.error_limit(phrase)
+            located = self.locate(phrase, text, limit)
+            if located is not None and (label not in result or located[0] < result[label][1]):
+                distance, end = located
+                start = self.locate_start(phrase, text, end, limit)
+                result[label] = (phrase, distance, (text.count(" ", 0, start), text.count(" ", 0, end) + 1))
+        return result
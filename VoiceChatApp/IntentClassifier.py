@@ -0,0 +1,247 @@
+import logging
+from .SpeechLibrary import SpeechLibrary
+from .TextNormalizer import TextNormalizer
+
+
+class IntentClassifier:
+    """
+    Klasa IntentClassifier rozpoznaje intencje krótkich odpowiedzi użytkownika.
+
+    Wszystkie frazy z SpeechLibrary (odpowiedzi tak/nie, komendy resetu, zakończenia rozmowy
+    oraz frazy o braku innych objawów) są kompilowane raz do drzewa prefiksowego słów.
+    Wypowiedź jest dzielona na słowa jednokrotnie, a jedno przejście po niej wyznacza
+    wszystkie intencje, dopasowując wyłącznie całe, znormalizowane słowa (np. "n" nie pasuje do "nos",
+    a "zacznijmy od nowa" pasuje do "zacznijmy od nowej").
+
+    Zasady rozstrzygania odpowiedzi tak/nie:
+
+    - W każdym miejscu wypowiedzi wybierana jest najdłuższa pasująca fraza ("nie wiem" zamiast "nie").
+
+    - Decyduje pierwsza fraza niosąca odpowiedź.
+
+    - Przeczenie "nie" przed frazą twierdzącą lub po niej zmienia ją w przeczącą ("nie występują",
+      "na pewno nie", "oczywiście że nie"). Przeczenie po frazie twierdzącej liczy się, gdy dzieli je
+      najwyżej NEGATION_WINDOW słów lub gdy kończy wypowiedź, chyba że rozpoczyna ono nowe
+      zdanie po spójniku przeciwstawnym ("tak, ale nie codziennie").
+
+    - Skróty (np. "t", "n") są uznawane tylko wtedy, gdy stanowią całą wypowiedź.
+    """
+
+    ANSWER = "answer"
+    RESET = "reset"
+    END = "end"
+    NO_OTHER = "no_other"
+
+    NEGATION = "nie"
+
+    # Maksymalna liczba słów między frazą twierdzącą a negującym ją "nie"
+    NEGATION_WINDOW = 2
+
+    # Spójniki rozpoczynające nowe zdanie - "nie" po nich nie neguje wcześniejszej odpowiedzi
+    CONTRAST = ("a", "ale", "lecz")
+
+    _default = None
+
+    def __init__(self, answers: dict, reset_phrases, end_phrases, no_other_phrases, abbreviations=None,
+                 debug=False):
+        """
+        Kompiluje drzewo prefiksowe fraz.
+
+        Args:
+            answers (dict): Słownik fraza -> True/False/None (odpowiedź twierdząca, przecząca, niepewna).
+            reset_phrases (list): Frazy resetujące rozmowę.
+            end_phrases (list): Frazy kończące rozmowę.
+            no_other_phrases (list): Frazy oznaczające brak innych objawów.
+            abbreviations (dict | None): Skróty odpowiedzi uznawane tylko jako cała wypowiedź.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.abbreviations = {}
+        for phrase, value in (abbreviations or {}).items():
+            self.abbreviations[tuple(self.tokenize(phrase))] = value
+
+        # Węzeł drzewa to para [dzieci, intencje frazy kończącej się w tym węźle]
+        self.root = [{}, {}]
+        for phrase, value in answers.items():
+            if tuple(self.tokenize(phrase)) not in self.abbreviations:
+                self._add(phrase, self.ANSWER, value)
+        for phrase in reset_phrases:
+            self._add(phrase, self.RESET, True)
+        for phrase in end_phrases:
+            self._add(phrase, self.END, True)
+        for phrase in no_other_phrases:
+            self._add(phrase, self.NO_OTHER, True)
+
+    def to_state(self) -> dict:
+        """
+        Zwraca skompilowany klasyfikator w postaci zgodnej z JSON (do zapisu w pamięci podręcznej bazy wiedzy).
+
+        Returns:
+            dict: Skróty odpowiedzi i drzewo prefiksowe fraz.
+        """
+        return {
+            "abbreviations": [[list(tokens), value] for tokens, value in self.abbreviations.items()],
+            "root": self.root,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        """
+        Odtwarza klasyfikator z postaci zwróconej przez to_state, bez ponownej budowy drzewa prefiksowego.
+
+        Args:
+            state (dict): Stan klasyfikatora.
+
+        Returns:
+            IntentClassifier: Odtworzony klasyfikator.
+        """
+        classifier = cls({}, [], [], [])
+        classifier.abbreviations = {tuple(tokens): value for tokens, value in state["abbreviations"]}
+        classifier.root = state["root"]
+        return classifier
+
+    @classmethod
+    def from_library(cls):
+        """
+        Zwraca klasyfikator zbudowany z fraz SpeechLibrary, kompilując go tylko przy pierwszym wywołaniu.
+
+        Returns:
+            IntentClassifier: Współdzielony klasyfikator.
+        """
+        if cls._default is None:
+            abbreviations = SpeechLibrary.additional_yes_no_abbreviations
+            cls._default = cls(
+                SpeechLibrary.response_yes_no_pattern,
+                SpeechLibrary.reset_speech_phrases,
+                SpeechLibrary.end_speech_phrases,
+                SpeechLibrary.no_other_symptoms_phrases,
+                abbreviations
+            )
+        return cls._default
+
+    @classmethod
+    def tokenize(cls, text: str) -> list:
+        """
+        Dzieli tekst na znormalizowane słowa (TextNormalizer), pomijając interpunkcję.
+
+        Args:
+            text (str): Tekst źródłowy.
+
+        Returns:
+            list: Lista słów.
+        """
+        return TextNormalizer.normalize(text).split()
+
+    def _add(self, phrase: str, intent: str, value):
+        """
+        Funkcja pomocnicza: dodaje frazę do drzewa prefiksowego.
+
+        Args:
+            phrase (str): Fraza.
+            intent (str): Rodzaj intencji.
+            value (bool | None): Wartość intencji.
+        """
+        tokens = self.tokenize(phrase)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node[0].setdefault(token, [{}, {}])
+        node[1].setdefault(intent, value)
+
+    def classify(self, text: str) -> dict:
+        """
+        Wyznacza wszystkie intencje wypowiedzi w jednym przejściu.
+
+        Args:
+            text (str): Wypowiedź użytkownika.
+
+        Returns:
+            dict: Słownik z kluczami:
+                - "answer" (bool | None): True/False dla odpowiedzi twierdzącej/przeczącej, None gdy brak odpowiedzi.
+                - "reset" (bool): Czy wypowiedź zawiera komendę resetu rozmowy.
+                - "end" (bool): Czy wypowiedź zawiera frazę zakończenia rozmowy.
+                - "no_other" (bool): Czy wypowiedź zawiera frazę o braku innych objawów.
+        """
+        tokens = self.tokenize(text)
+        intent = {self.ANSWER: None, self.RESET: False, self.END: False, self.NO_OTHER: False}
+
+        abbreviation = self.abbreviations.get(tuple(tokens))
+        if abbreviation is not None:
+            intent[self.ANSWER] = abbreviation
+            return intent
+
+        # Odpowiedzi (początek, koniec, wartość) w kolejności wystąpienia, bez nakładania się
+        answers = []
+        answer_end = 0
+        root_children = self.root[0]
+        for start in range(len(tokens)):
+            node = root_children.get(tokens[start])
+            position = start
+            longest = None
+            while node is not None:
+                position += 1
+                for name, value in node[1].items():
+                    if name == self.ANSWER:
+                        longest = (position, value)
+                    else:
+                        intent[name] = True
+                node = node[0].get(tokens[position]) if position < len(tokens) else None
+            if longest is not None and start >= answer_end:
+                answers.append((start, longest[0], longest[1]))
+                answer_end = longest[0]
+
+        intent[self.ANSWER] = self._resolve_answer(tokens, answers)
+        return intent
+
+    def _resolve_answer(self, tokens: list, answers: list):
+        """
+        Funkcja pomocnicza: rozstrzyga odpowiedź na podstawie dopasowanych fraz z uwzględnieniem przeczeń.
+
+        Args:
+            tokens (list): Słowa wypowiedzi.
+            answers (list): Dopasowania (początek, koniec, wartość) w kolejności wystąpienia.
+
+        Returns:
+            bool | None: Rozstrzygnięta odpowiedź.
+        """
+        if not answers:
+            return None
+        start, end, value = answers[0]
+        # Samo "nie" przed frazą twierdzącą ("nie występują") jest już pierwszym dopasowaniem i daje False,
+        # natomiast "nie" po frazie twierdzącej ("na pewno nie", "oczywiście że nie") ją neguje
+        if value is True and len(answers) > 1 and self._is_negation(tokens, answers[1]):
+            negation = answers[1][0]
+            between = tokens[end:negation]
+            if (len(between) <= self.NEGATION_WINDOW or negation == len(tokens) - 1) and not any(
+                    token in self.CONTRAST for token in between):
+                return False
+        return value
+
+    def _is_negation(self, tokens: list, match: tuple) -> bool:
+        """
+        Funkcja pomocnicza: sprawdza, czy dopasowanie jest samym słowem przeczenia.
+
+        Args:
+            tokens (list): Słowa wypowiedzi.
+            match (tuple): Dopasowanie (początek, koniec, wartość).
+
+        Returns:
+            bool: True, jeśli dopasowanie to pojedyncze "nie".
+        """
+        start, end, _ = match
+        return end - start == 1 and tokens[start] == self.NEGATION
+
+    def answer(self, text: str):
+        """
+        Zwraca wyłącznie odpowiedź tak/nie zawartą w wypowiedzi.
+
+        Args:
+            text (str): Wypowiedź użytkownika.
+
+        Returns:
+            bool | None: True/False dla odpowiedzi twierdzącej/przeczącej, None gdy jest niejednoznaczna.
+        """
+        return self.classify(text)[self.ANSWER]
@@ -0,0 +1,440 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections import defaultdict
+import numpy as np
+from .CacheDirectory import CacheDirectory
+from .SpeechLibrary import SpeechLibrary
+from .SymptomMatcher import SymptomMatcher
+from .FuzzyPhraseIndex import FuzzyPhraseIndex
+from .IntentClassifier import IntentClassifier
+from .DiseaseMatcher import DiseaseMatcher
+from .TextNormalizer import TextNormalizer
+
+
+class KnowledgeBase:
+    """
+    Klasa KnowledgeBase wczytuje bazę wiedzy z plików danych i kompiluje ją do struktur wyszukiwania.
+
+    Funkcjonalności:
+
+    - Wczytywanie danych z pliku JSON (`data/knowledge_base.json`) oraz tabeli chorób
+      w formacie Markdown (np. "Spis chorobowy.md"), która zastępuje tabelę z pliku JSON.
+
+    - Walidacja danych podczas kompilacji (np. choroby o identycznych wektorach objawów,
+      frazy przypisane kilku objawom).
+
+    - Kompilacja automatu objawów, indeksu przybliżonego, klasyfikatora intencji i macierzy chorób.
+      Skompilowane struktury są zapisywane w katalogu pamięci podręcznej użytkownika, pod skrótem
+      SHA-256 treści plików źródłowych i kodu klas kompilujących: dane, ostrzeżenia, automat, indeks
+      trigramów i drzewo intencji jako JSON, a macierz chorób jako plik .npy (bez obiektów pickle).
+      Ponowne uruchomienie z niezmienionymi plikami pomija parsowanie, walidację i kompilację.
+
+    - Przeładowanie bazy po zmianie plików źródłowych bez restartu aplikacji.
+    """
+
+    # Klasy, których kod wpływa na skompilowaną bazę - jego zmiana unieważnia pamięć podręczną
+    COMPILED_CLASSES = (SymptomMatcher, FuzzyPhraseIndex, IntentClassifier, DiseaseMatcher, TextNormalizer)
+
+    _code_fingerprint = None
+
+    # Kolumny tabeli chorób, które nie są objawami
+    DISEASE_COLUMNS = ("Choroba", "Specjalista", "Zalecenia")
+
+    REQUIRED_KEYS = (
+        "required_symptoms", "symptoms_table", "synonyms", "no_other_symptoms_phrases",
+        "response_yes_no_pattern", "additional_yes_no_abbreviations", "end_speech_phrases",
+        "reset_speech_phrases", "responses",
+    )
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, sources=None, cache_dir=None, debug=False):
+        """
+        Inicjalizuje bazę wiedzy i wczytuje ją (z pamięci podręcznej lub przez kompilację).
+
+        Args:
+            sources (list | None): Pliki źródłowe (.json, .md). Domyślnie [SpeechLibrary.DATA_PATH].
+            cache_dir (str | None): Katalog skompilowanych baz. Domyślnie CacheDirectory.default().
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+
+        Raises:
+            ValueError: Jeśli w danych brakuje wymaganej sekcji.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.sources = list(sources or [SpeechLibrary.DATA_PATH])
+        self.cache_dir = cache_dir or CacheDirectory.default()
+        self._lock = threading.Lock()
+        self._mtimes = {}
+        self.version = 0
+        self.fingerprint = None
+        self.from_cache = False
+        self.data = None
+        self.warnings = []
+        self.symptom_matcher = None
+        self.fuzzy_index = None
+        self.intents = None
+        self.disease_matcher = None
+        self.load()
+
+    @classmethod
+    def shared(cls):
+        """
+        Zwraca bazę wiedzy współdzieloną w obrębie procesu, wczytując ją przy pierwszym użyciu.
+
+        Returns:
+            KnowledgeBase: Współdzielona baza wiedzy.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def code_fingerprint(cls) -> str:
+        """
+        Zwraca skrót SHA-256 kodu źródłowego KnowledgeBase i klas kompilowanych struktur.
+
+        Returns:
+            str: Skrót szesnastkowy, wyznaczany raz na proces.
+        """
+        if cls._code_fingerprint is None:
+            digest = hashlib.sha256()
+            for compiled_class in (cls,) + cls.COMPILED_CLASSES:
+                with open(sys.modules[compiled_class.__module__].__file__, "rb") as file:
+                    digest.update(file.read())
+            cls._code_fingerprint = digest.hexdigest()
+        return cls._code_fingerprint
+
+    @classmethod
+    def parse_markdown_table(cls, text: str) -> tuple:
+        """
+        Odczytuje tabelę chorób zapisaną w formacie Markdown (objaw oznaczony literą "X").
+
+        Args:
+            text (str): Treść pliku Markdown.
+
+        Returns:
+            tuple: (list, list)
+                - list: Nazwy objawów w kolejności kolumn.
+                - list: Wiersze tabeli w postaci słowników jak SpeechLibrary.symptoms_table.
+
+        Raises:
+            ValueError: Jeśli plik nie zawiera tabeli z kolumną "Choroba".
+        """
+        rows = [
+            [cell.strip() for cell in line.strip().strip("|").split("|")]
+            for line in text.splitlines() if line.strip().startswith("|")
+        ]
+        if not rows or "Choroba" not in rows[0]:
+            raise ValueError("Brak tabeli chorób z kolumną 'Choroba'")
+
+        header = rows[0]
+        symptoms = [column for column in header if column not in cls.DISEASE_COLUMNS]
+        table = []
+        # Drugi wiersz to separator nagłówka (---, :---:)
+        for row in rows[2:]:
+            disease = {}
+            for column, cell in zip(header, row):
+                disease[column] = cell.upper() == "X" if column in symptoms else cell
+            table.append(disease)
+        return symptoms, table
+
+    def read_sources(self) -> tuple:
+        """
+        Wczytuje i scala pliki źródłowe bazy wiedzy.
+
+        Returns:
+            tuple: (dict, str) - dane bazy wiedzy oraz skrót SHA-256 treści plików.
+
+        Raises:
+            ValueError: Jeśli format pliku nie jest obsługiwany.
+        """
+        contents = self._read_contents()
+        data = {}
+        for path, content in contents.items():
+            extension = os.path.splitext(path)[1].lower()
+            if extension == ".json":
+                data.update(json.loads(content.decode("utf-8")))
+            elif extension == ".md":
+                symptoms, table = self.parse_markdown_table(content.decode("utf-8"))
+                data["required_symptoms"] = symptoms
+                data["symptoms_table"] = table
+            else:
+                raise ValueError(f"Nieobsługiwany format bazy wiedzy: {path}")
+        return data, self._fingerprint(contents)
+
+    def _read_contents(self) -> dict:
+        """
+        Funkcja pomocnicza: wczytuje surową treść plików źródłowych (ścieżka -> bajty).
+        """
+        contents = {}
+        for path in self.sources:
+            with open(path, "rb") as file:
+                contents[path] = file.read()
+        return contents
+
+    def _fingerprint(self, contents: dict) -> str:
+        """
+        Funkcja pomocnicza: zwraca skrót SHA-256 treści plików źródłowych i kodu klas kompilujących.
+        """
+        digest = hashlib.sha256(f"code {self.code_fingerprint()}".encode())
+        for content in contents.values():
+            digest.update(content)
+        return digest.hexdigest()
+
+    @classmethod
+    def validate(cls, data: dict) -> list:
+        """
+        Sprawdza spójność danych bazy wiedzy.
+
+        Args:
+            data (dict): Dane bazy wiedzy.
+
+        Returns:
+            list: Ostrzeżenia opisujące wykryte niespójności.
+
+        Raises:
+            ValueError: Jeśli w danych brakuje wymaganej sekcji.
+        """
+        for key in cls.REQUIRED_KEYS:
+            if key not in data:
+                raise ValueError(f"Brak sekcji '{key}' w bazie wiedzy")
+
+        warnings = []
+        symptoms = data["required_symptoms"]
+        vectors = defaultdict(list)
+        for disease in data["symptoms_table"]:
+            name = disease.get("Choroba", "?")
+            missing = [symptom for symptom in symptoms if symptom not in disease]
+            if missing:
+                warnings.append(f"Choroba '{name}' nie określa objawów: {', '.join(missing)}")
+            vectors[tuple(bool(disease.get(symptom, False)) for symptom in symptoms)].append(name)
+        for names in vectors.values():
+            if len(names) > 1:
+                warnings.append(f"Identyczne wektory objawów (nierozróżnialne choroby): {', '.join(names)}")
+
+        for symptom in data["synonyms"]:
+            if symptom not in symptoms:
+                warnings.append(f"Synonimy objawu '{symptom}', o który system nie pyta")
+        owners = defaultdict(set)
+        for symptom, phrases in data["synonyms"].items():
+            for phrase in phrases:
+                owners[TextNormalizer.normalize(phrase)].add(symptom)
+        for phrase, labels in owners.items():
+            if len(labels) > 1:
+                warnings.append(f"Fraza '{phrase}' wskazuje kilka objawów: {', '.join(sorted(labels))}")
+
+        for template in data["responses"].get("ask_first", []):
+            if "{symptom}" not in template:
+                warnings.append(f"Szablon pytania bez pola {{symptom}}: '{template}'")
+        return warnings
+
+    @classmethod
+    def compile(cls, data: dict, warnings=None) -> dict:
+        """
+        Kompiluje dane bazy wiedzy do struktur wyszukiwania.
+
+        Args:
+            data (dict): Dane bazy wiedzy.
+            warnings (list | None): Ostrzeżenia z wcześniejszej walidacji tych samych danych
+                lub None, aby je wyznaczyć. Domyślnie None.
+
+        Returns:
+            dict: Dane, ostrzeżenia walidacji oraz skompilowane struktury.
+        """
+        if warnings is None:
+            warnings = cls.validate(data)
+        answers = dict(data["response_yes_no_pattern"])
+        answers.update(data["additional_yes_no_abbreviations"])
+        return {
+            "data": data,
+            "warnings": warnings,
+            "symptom_matcher": SymptomMatcher(
+                data["required_symptoms"], data["synonyms"], data["no_other_symptoms_phrases"]
+            ),
+            "fuzzy_index": FuzzyPhraseIndex.from_synonyms(data["required_symptoms"], data["synonyms"]),
+            "intents": IntentClassifier(
+                answers,
+                data["reset_speech_phrases"],
+                data["end_speech_phrases"],
+                data["no_other_symptoms_phrases"],
+                data["additional_yes_no_abbreviations"]
+            ),
+            "disease_matcher": DiseaseMatcher(data["symptoms_table"], data["required_symptoms"]),
+        }
+
+    def cache_path(self, fingerprint: str) -> str:
+        """
+        Zwraca ścieżkę pliku skompilowanej bazy dla podanego skrótu treści.
+
+        Macierz chorób jest zapisywana obok, w pliku o tej samej nazwie z rozszerzeniem .npy.
+
+        Args:
+            fingerprint (str): Skrót SHA-256 plików źródłowych.
+
+        Returns:
+            str: Ścieżka pliku pamięci podręcznej (JSON).
+        """
+        return os.path.join(self.cache_dir, f"knowledge_base-{fingerprint}.json")
+
+    def _read_cache(self, path: str):
+        """
+        Funkcja pomocnicza: wczytuje skompilowaną bazę z pamięci podręcznej.
+
+        Pliki są pomijane, jeśli one lub katalog pamięci podręcznej nie należą wyłącznie
+        do bieżącego użytkownika (CacheDirectory.is_trusted).
+
+        Returns:
+            dict | None: Dane, ostrzeżenia i struktury jak z `compile` lub None, jeśli plików brak,
+                         są uszkodzone albo nie można im ufać.
+        """
+        matrix_path = os.path.splitext(path)[0] + ".npy"
+        if not (os.path.exists(path) and os.path.exists(matrix_path)):
+            return None
+        if not all(CacheDirectory.is_trusted(item) for item in (self.cache_dir, path, matrix_path)):
+            self.logger.warning(f"Pominięto niezaufaną pamięć podręczną bazy wiedzy "
+                                f"(inny właściciel lub zapis dla innych): {path}")
+            return None
+        try:
+            with open(path, encoding="utf-8") as file:
+                cached = json.load(file)
+            matrix = np.load(matrix_path, allow_pickle=False)
+            data = cached["data"]
+            if not isinstance(data, dict) or not isinstance(cached["warnings"], list):
+                raise ValueError("niepoprawna struktura pliku")
+            return {
+                "data": data,
+                "warnings": cached["warnings"],
+                "symptom_matcher": SymptomMatcher.from_state(cached["symptom_matcher"]),
+                "fuzzy_index": FuzzyPhraseIndex.from_state(cached["fuzzy_index"]),
+                "intents": IntentClassifier.from_state(cached["intents"]),
+                "disease_matcher": DiseaseMatcher.from_matrix(data["symptoms_table"], data["required_symptoms"],
+                                                              matrix),
+            }
+        except Exception as e:
+            self.logger.warning(f"Pominięto uszkodzoną pamięć podręczną bazy wiedzy: {e}")
+            return None
+
+    def _write_cache(self, path: str, compiled: dict):
+        """
+        Funkcja pomocnicza: zapisuje skompilowaną bazę (atomowo - przez pliki tymczasowe).
+
+        Macierz chorób jest zapisywana jako pierwsza, więc istniejący plik JSON zawsze ma swoją macierz.
+        """
+        try:
+            CacheDirectory.ensure(self.cache_dir)
+            with tempfile.NamedTemporaryFile("wb", dir=self.cache_dir, delete=False) as file:
+                np.save(file, compiled["disease_matcher"].matrix.astype(np.bool_), allow_pickle=False)
+            os.replace(file.name, os.path.splitext(path)[0] + ".npy")
+            state = {
+                "data": compiled["data"],
+                "warnings": compiled["warnings"],
+                "symptom_matcher": compiled["symptom_matcher"].to_state(),
+                "fuzzy_index": compiled["fuzzy_index"].to_state(),
+                "intents": compiled["intents"].to_state(),
+            }
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_dir, delete=False) as file:
+                json.dump(state, file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(file.name, path)
+        except Exception as e:
+            self.logger.warning(f"Nie udało się zapisać pamięci podręcznej bazy wiedzy: {e}")
+
+    def _source_mtimes(self) -> dict:
+        """
+        Funkcja pomocnicza: zwraca czasy modyfikacji plików źródłowych.
+        """
+        return {path: os.stat(path).st_mtime_ns for path in self.sources}
+
+    def load(self):
+        """
+        Wczytuje bazę wiedzy: ze skompilowanej pamięci podręcznej, jeśli treść plików się nie zmieniła
+        (bez parsowania plików), a w przeciwnym razie przez kompilację. Wynik jest udostępniany
+        całej aplikacji (apply).
+
+        Raises:
+            ValueError: Jeśli w danych brakuje wymaganej sekcji.
+        """
+        with self._lock:
+            mtimes = self._source_mtimes()
+            # Skrót wymaga tylko surowej treści plików - są parsowane dopiero przy braku w pamięci podręcznej
+            fingerprint = self._fingerprint(self._read_contents())
+            path = self.cache_path(fingerprint)
+            compiled = self._read_cache(path)
+            self.from_cache = compiled is not None
+            if compiled is None:
+                data, fingerprint = self.read_sources()
+                path = self.cache_path(fingerprint)
+                compiled = self.compile(data)
+                self._write_cache(path, compiled)
+
+            self.data = compiled["data"]
+            self.warnings = compiled["warnings"]
+            self.symptom_matcher = compiled["symptom_matcher"]
+            self.fuzzy_index = compiled["fuzzy_index"]
+            self.intents = compiled["intents"]
+            self.disease_matcher = compiled["disease_matcher"]
+            self.fingerprint = fingerprint
+            self._mtimes = mtimes
+            self.version += 1
+
+        for warning in self.warnings:
+            self.logger.warning(f"Baza wiedzy: {warning}")
+        self.logger.info(
+            f"Wczytano bazę wiedzy {fingerprint[:12]} ({len(self.data['symptoms_table'])} chorób, "
+            f"{'pamięć podręczna' if self.from_cache else 'kompilacja'})"
+        )
+        self.apply()
+
+    def apply(self):
+        """
+        Udostępnia wczytaną bazę wiedzy: ustawia dane SpeechLibrary oraz współdzielone
+        struktury zwracane przez metody from_library.
+        """
+        SpeechLibrary.load(self.data)
+        SymptomMatcher._default = self.symptom_matcher
+        FuzzyPhraseIndex._default = self.fuzzy_index
+        IntentClassifier._default = self.intents
+        DiseaseMatcher._default = self.disease_matcher
+
+    def changed(self) -> bool:
+        """
+        Sprawdza, czy pliki źródłowe zmieniły się od ostatniego wczytania.
+
+        Returns:
+            bool: True, jeśli czas modyfikacji któregoś z plików jest inny niż przy wczytaniu.
+        """
+        try:
+            return self._source_mtimes() != self._mtimes
+        except OSError:
+            return False
+
+    def reload_if_changed(self) -> bool:
+        """
+        Przeładowuje bazę wiedzy, jeśli pliki źródłowe zostały zmienione.
+
+        Błędna nowa wersja danych jest zgłaszana w logach, a aplikacja korzysta dalej z poprzedniej.
+
+        Returns:
+            bool: True, jeśli wczytano nową wersję bazy.
+        """
+        if not self.changed():
+            return False
+        try:
+            self.load()
+        except Exception as e:
+            self.logger.error(f"Nie udało się przeładować bazy wiedzy: {e}")
+            # Ten sam błędny plik nie jest wczytywany ponownie do jego kolejnej zmiany
+            try:
+                self._mtimes = self._source_mtimes()
+            except OSError:
+                pass
+            return False
+        return True
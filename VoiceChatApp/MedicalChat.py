@@ -1,6 +1,15 @@
+import itertools
 import logging
+import os
+import time
 from .SpeechLibrary import SpeechLibrary
 from .AiModel import AiModel
+from .IntentClassifier import IntentClassifier
+from .QuestionSelector import QuestionSelector
+from .KnowledgeBase import KnowledgeBase
+from .DiagnosisCache import DiagnosisCache
+from .CircuitBreaker import CircuitBreaker
+from .PromptBuilder import PromptBuilder
 
 
 class MedicalChat:
@@ -17,26 +26,70 @@ class MedicalChat:
     - Generowanie diagnoz i rekomendacji medycznych za pomocą wbudowanych reguł lub modelu AI.
     """
 
-    def __init__(self, debug=False):
+    # Wersja zapytania diagnostycznego do modelu AI (zmiana treści zapytania unieważnia zapamiętane odpowiedzi)
+    PROMPT_VERSION = 2
+
+    # Maksymalna liczba zapytań wysyłanych do modelu AI z wyprzedzeniem (po jednym na możliwy zestaw odpowiedzi)
+    PREFETCH_LIMIT = 4
+
+    def __init__(self, cache_dir=None, debug=False):
         """
         Inicjalizuje obiekt klasy MedicalChat, konfigurując logger i zmienne pomocnicze.
 
         Args:
+            cache_dir (str | None): Katalog zapamiętanych diagnoz modelu AI i dziennego zużycia tokenów.
+                Domyślnie katalog bazy wiedzy (CacheDirectory.default()).
             debug (bool): Flaga włączająca tryb debugowania. Domyślnie False.
         """
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
 
-        self.symptoms_table = SpeechLibrary.symptoms_table
-        self.required_symptoms = SpeechLibrary.required_symptoms
-        self.synonyms = SpeechLibrary.synonyms
+        self.knowledge_base = KnowledgeBase.shared()
+        self.question_selector = QuestionSelector(self.knowledge_base.disease_matcher, debug)
+        self.bind_knowledge_base()
         self.user_symptoms = {}
         self.check_syndroms = {}
         self.first_info_pack = True
         self.prev_question = None
+        # Indeksy chorób z symptoms_table zgodnych z dotychczasowymi odpowiedziami
+        self.candidates = None
+        # Odpowiedzi modelu AI pobierane z wyprzedzeniem: klucz DiagnosisCache -> Future
+        self.prefetched = {}
         self.ai_model = AiModel()
+        cache_dir = cache_dir or self.knowledge_base.cache_dir
+        self.diagnosis_cache = DiagnosisCache(os.path.join(cache_dir, "diagnoses.sqlite"), debug=debug)
+        # Przy awarii API odpowiedź pochodzi z tabeli chorób, a tura nie czeka dłużej niż latency_budget
+        self.circuit_breaker = CircuitBreaker(debug=debug)
+        # Zwięzłe zapytania do modelu AI oraz budżet tokenów na rozmowę i na dzień
+        self.prompt_builder = PromptBuilder(usage_path=os.path.join(cache_dir, "ai_usage.sqlite"), debug=debug)
         self.waiting_post_diagnosis = False
 
+    def bind_knowledge_base(self):
+        """
+        Przypisuje dane i skompilowane struktury z aktualnej wersji bazy wiedzy.
+        """
+        knowledge_base = self.knowledge_base
+        self.symptoms_table = knowledge_base.data["symptoms_table"]
+        self.required_symptoms = knowledge_base.data["required_symptoms"]
+        self.synonyms = knowledge_base.data["synonyms"]
+        self.matcher = knowledge_base.symptom_matcher
+        self.fuzzy_index = knowledge_base.fuzzy_index
+        self.intents = knowledge_base.intents
+        self.disease_matcher = knowledge_base.disease_matcher
+        self.question_selector.matcher = knowledge_base.disease_matcher
+        self.knowledge_base_version = knowledge_base.version
+
+    def refresh_knowledge_base(self):
+        """
+        Przeładowuje bazę wiedzy, jeśli jej pliki zmieniły się od ostatniego wczytania.
+
+        Wywoływana na początku rozmowy, aby zmiana danych nie wpływała na rozmowę w toku.
+        """
+        self.knowledge_base.reload_if_changed()
+        if self.knowledge_base.version != self.knowledge_base_version:
+            self.bind_knowledge_base()
+            self.logger.info("Zastosowano nową wersję bazy wiedzy")
+
     def reset_conversation(self):
         """
         Resetuje wszystkie zmienne związane z analizą objawów, przygotowując system
@@ -46,9 +99,26 @@ class MedicalChat:
         self.check_syndroms = {}
         self.first_info_pack = True
         self.prev_question = None
+        self.candidates = None
+        self.cancel_prefetch()
+        self.prompt_builder.reset_session()
         self.waiting_post_diagnosis = False
         self.logger.info("Rozpoczęto nową rozmowę medyczną.")
 
+    def dialog_state(self) -> str:
+        """
+        Określa, jakiego rodzaju wypowiedzi system oczekuje w następnej turze rozmowy.
+
+        Returns:
+            str: "post_diagnosis" po przedstawieniu diagnozy, "monolog" przed pierwszym opisem
+                 dolegliwości, "yes_no" podczas dopytywania o objawy.
+        """
+        if self.waiting_post_diagnosis:
+            return "post_diagnosis"
+        if self.first_info_pack:
+            return "monolog"
+        return "yes_no"
+
     def analyze_monolog(self, user_input):
         """
         Analizuje początkowy monolog użytkownika, identyfikując obecne objawy oraz potencjalne
@@ -57,80 +127,102 @@ class MedicalChat:
         Args:
             user_input (str): Tekstowy monolog użytkownika zawierający informacje o objawach.
         """
-        for symptom in self.required_symptoms:
-            # Domyślnie ustawiamy, że objawu nie wykryto.
-            symptom_present = False
-
-            # Sprawdzamy, czy dokładna fraza kluczowa znajduje się w monologu.
-            if symptom.lower() in user_input.lower():
-                symptom_present = True
-            else:
-                symptom_key_lower = symptom.lower()
-                for syn_key, syn_list in self.synonyms.items():
-                    if syn_key.lower() == symptom_key_lower:
-                        for s in syn_list:
-                            if s.lower() in user_input.lower():
-                                symptom_present = True
-                                break
-                        break
+        # Jedno przejście automatu znajduje wszystkie objawy, synonimy i frazy o braku innych objawów
+        found, negated, no_other_symptoms = self.matcher.scan(user_input)
+
+        # Objawy niewykryte dokładnie szukamy z tolerancją na błędy rozpoznawania mowy
+        fuzzy = self.fuzzy_index.match(user_input, exclude=found | negated)
+        if fuzzy:
+            for symptom, (phrase, distance, _) in fuzzy.items():
+                self.logger.info(f"Przybliżone dopasowanie objawu '{symptom}' do frazy '{phrase}' "
+                                 f"(odległość {distance})")
+            # Przybliżone dopasowania podlegają tym samym regułom przeczenia ("nie mam goronczki")
+            spans = [(first, last, symptom) for symptom, (_, _, (first, last)) in fuzzy.items()]
+            found, negated, no_other_symptoms = self.matcher.scan(user_input, spans)
+
+        if negated:
+            # Zaprzeczony objaw ("nie mam gorączki") nie jest obecny, a o jego brak system może dopytać
+            self.logger.info(f"Objawy zaprzeczone w wypowiedzi: {negated}")
 
+        for symptom in self.required_symptoms:
+            symptom_present = symptom in found
             self.check_syndroms[symptom] = symptom_present
             self.user_symptoms[symptom] = symptom_present
 
-            for phrase in SpeechLibrary.no_other_symptoms_phrases:
-                if phrase in user_input.lower():
-                    self.logger.info(f"Wykryto frazę sugerującą brak innych objawów: '{phrase}'")
-                    for symptom in self.required_symptoms:
-                        self.check_syndroms[symptom] = True
-                    break
+        if no_other_symptoms:
+            self.logger.info("Wykryto frazę sugerującą brak innych objawów")
+            for symptom in self.required_symptoms:
+                self.check_syndroms[symptom] = True
 
-    def analyze_symptoms(self, user_input):
+    def analyze_symptoms(self, user_input, intent=None, on_sentence=None):
         """
         Główna funkcja analizująca objawy użytkownika i generująca odpowiedź.
 
         Args:
             user_input (str): Tekstowa odpowiedź użytkownika zawierająca objawy.
+            intent (dict | None): Wynik IntentClassifier.classify dla tej wypowiedzi, jeśli został
+                już wyznaczony. Domyślnie None (wypowiedź zostanie sklasyfikowana).
+            on_sentence (callable | None): Wywoływana z kolejnymi fragmentami odpowiedzi, gdy tylko
+                są gotowe (odpowiedź modelu AI jest przekazywana zdanie po zdaniu). Domyślnie None.
 
         Returns:
             tuple: (bool, str)
                 - bool: Flaga wskazująca, czy analiza została zakończona.
                 - str: Wiadomość zwrotna, w tym pytania uzupełniające lub rekomendacje.
         """
+        emit = on_sentence or (lambda sentence: None)
+        if intent is None:
+            intent = self.intents.classify(user_input)
+
         # Jeżeli po diagnozie czekamy na odpowiedź na pytanie "Czy przejsc caly proces od nowa?"
         if self.waiting_post_diagnosis:
-            answer = self.does_agree(user_input)
+            answer = self.does_agree(user_input, intent)
             if answer is False:
                 # Użytkownik nie jest zadowolony – resetujemy rozmowę
                 self.reset_conversation()
-                return True, SpeechLibrary.reset_response()
-            elif answer is True:
+                result = True, SpeechLibrary.reset_response()
+            elif answer is True or intent[IntentClassifier.END]:
                 # Użytkownik nie potrzebuje dalszej pomocy – kończymy rozmowę
                 self.waiting_post_diagnosis = False
-                return True, SpeechLibrary.end_response()
+                result = True, SpeechLibrary.end_response()
             else:
                 # Brak jednoznacznej odpowiedzi – pytamy jeszcze raz
-                return False,
+                result = False, SpeechLibrary.satisfaction_question(repeat=True)
+            emit(result[1])
+            return result
 
         if self.first_info_pack:
+            self.refresh_knowledge_base()
             self.analyze_monolog(user_input)
+            self.candidates = self.question_selector.candidates(self.user_symptoms, self.check_syndroms)
         else:
-            answer = self.does_agree(user_input)
+            answer = self.does_agree(user_input, intent)
             if answer is not None:
                 self.check_syndroms[self.prev_question] = True
                 self.user_symptoms[self.prev_question] = answer
             else:
                 self.check_syndroms[self.prev_question] = None
                 self.user_symptoms[self.prev_question] = None
+            self.candidates = self.question_selector.prune(self.candidates, self.prev_question, answer)
             self.prev_question = ""
 
         self.logger.info(f"Sprawdzone objawy: {self.check_syndroms}")
         self.logger.info(f"Objawy użytkownika: {self.user_symptoms}")
+        self.logger.info(f"Pozostali kandydaci: {len(self.candidates)}")
+
+        if self.first_info_pack:
+            # Podsumowanie objawów można wypowiedzieć, zanim gotowa będzie reszta odpowiedzi
+            emit(SpeechLibrary.first_response(self.user_symptoms, "").strip())
 
-        if all(self.check_syndroms.values()):
-            i_know, message = True, self.get_recommendation()
+        # Pytania kończą się, gdy sprawdzono wszystkie objawy lub potwierdzono cały wzorzec pozostałych kandydatów
+        if all(self.check_syndroms.values()) or self.question_selector.is_resolved(self.candidates,
+                                                                                   self.check_syndroms):
+            i_know, message = True, self.get_recommendation(on_sentence)
             self.waiting_post_diagnosis = True
         else:
             i_know, message = False, self.ask_missing_symptom()
+            emit(message)
+            self.prefetch_diagnoses()
 
         if self.first_info_pack:
             message = SpeechLibrary.first_response(self.user_symptoms, message)
@@ -138,12 +230,13 @@ class MedicalChat:
 
         return i_know, message
 
-    def does_agree(self, message):
+    def does_agree(self, message, intent=None):
         """
         Sprawdza, czy użytkownik odpowiedział twierdząco lub zaprzeczył na pytanie.
 
         Args:
             message (str): Odpowiedź użytkownika.
+            intent (dict | None): Wynik IntentClassifier.classify dla tej wypowiedzi. Domyślnie None.
 
         Returns:
             bool | None: True, jeśli odpowiedź jest twierdząca; False, jeśli zaprzeczająca;
@@ -151,53 +244,222 @@ class MedicalChat:
         """
         self.logger.info(f"Analiza odpowiedzi: {message}")
         self.logger.info(f"Poprzednie pytanie: {self.prev_question}")
-        for key, value in SpeechLibrary.response_yes_no_pattern.items():
-            if key in message.lower():
-                return value
-        return None
+        if intent is None:
+            intent = self.intents.classify(message)
+        return intent[IntentClassifier.ANSWER]
 
     def ask_missing_symptom(self):
         """
         Pyta użytkownika o brakujące lub niejednoznaczne objawy.
 
+        Kolejny objaw wybiera QuestionSelector - najpierw ten, który najlepiej rozróżnia
+        choroby zgodne z dotychczasowymi odpowiedziami.
+
         Returns:
             str: Pytanie o brakujące objawy.
         """
-        for symptom, present in self.check_syndroms.items():
-            if present is False:
-                self.prev_question = symptom
-                return SpeechLibrary.ask_first(symptom)
-            elif present is None:
-                self.prev_question = symptom
+        symptom = self.question_selector.next_symptom(self.user_symptoms, self.check_syndroms)
+        if symptom is not None:
+            self.prev_question = symptom
+            if self.check_syndroms[symptom] is None:
                 return SpeechLibrary.ask_error(symptom)
+            return SpeechLibrary.ask_first(symptom)
 
         self.prev_question = None
         return SpeechLibrary.ask_error("objawy")
 
-    def get_recommendation(self):
+    def resolved_disease(self):
+        """
+        Zwraca chorobę wskazaną przez dotychczasowe odpowiedzi użytkownika.
+
+        Returns:
+            dict | None: Dane choroby, jeśli zbiór kandydatów jest rozstrzygnięty; w przeciwnym razie None.
+        """
+        if self.candidates is None:
+            return self.disease_matcher.exact(self.user_symptoms)
+        if self.question_selector.is_resolved(self.candidates, self.check_syndroms):
+            return self.disease_matcher.table[self.candidates[0]]
+        return None
+
+    def get_recommendation(self, on_sentence=None):
         """
         Generuje rekomendacje medyczne na podstawie zgłoszonych objawów.
 
-        Jeśli nie można dopasować diagnozy na podstawie zdefiniowanych reguł,
-        metoda korzysta z modelu AI do wygenerowania odpowiedzi.
+        Jeśli odpowiedzi nie wskazują jednej choroby z tabeli wzorców,
+        metoda korzysta z modelu AI do wygenerowania odpowiedzi (ask_ai).
+
+        Args:
+            on_sentence (callable | None): Wywoływana z kolejnymi zdaniami komunikatu. Gdy jest podana,
+                odpowiedź modelu AI jest pobierana strumieniowo i przekazywana zdanie po zdaniu. Domyślnie None.
 
         Returns:
             str: Komunikat zawierający diagnozę, zalecenia oraz pytanie o dalszą pomoc.
         """
+        emit = on_sentence or (lambda sentence: None)
         diagnosis = None
-        for disease in self.symptoms_table:
-            if all(
-                disease.get(symptom, False) == self.user_symptoms.get(symptom, False)
-                for symptom in self.required_symptoms
-            ):
-                diagnosis = SpeechLibrary.find_disease(disease)
-                break
+        disease = self.resolved_disease()
+        if disease is not None:
+            diagnosis = SpeechLibrary.find_disease(disease)
+        else:
+            nearest = self.disease_matcher.rank(self.user_symptoms, limit=3)
+            self.logger.debug(f"Najbliższe wzorce: {[(d['Choroba'], distance) for d, distance in nearest]}")
 
         if diagnosis is None:
-            diagnosis = self.ai_model.ask(
-                f"Jaka to może być choroba i jakie zalecenia mi dasz. "
-                f"Odpowiedz bardzo krótko w dwóch zdaniach. Objawy: {self.user_symptoms}"
-            )
+            # Ten sam zestaw objawów powtarza się u wielu pacjentów - odpowiedź modelu jest zapamiętywana
+            key = DiagnosisCache.key(self.PROMPT_VERSION, self.required_symptoms, self.user_symptoms)
+            prefetched = self.prefetched.pop(key, None)
+            self.cancel_prefetch()
+            diagnosis = self.diagnosis_cache.get(key)
+            if diagnosis is None:
+                diagnosis = self.ask_ai(key, prefetched, on_sentence)
+            else:
+                if prefetched is not None:
+                    prefetched.cancel()
+                self.logger.debug(f"Odpowiedź z pamięci podręcznej diagnoz: {self.diagnosis_cache.stats()}")
+                for sentence in AiModel.sentences([diagnosis]):
+                    emit(sentence)
+        else:
+            for sentence in AiModel.sentences([diagnosis]):
+                emit(sentence)
+
+        closing = SpeechLibrary.satisfaction_question()
+        emit(closing)
+        return f"{diagnosis}\n{closing}"
+
+    def ask_ai(self, key: str, prefetched=None, on_sentence=None) -> str:
+        """
+        Pobiera diagnozę od modelu AI, chronioną wyłącznikiem obwodu (CircuitBreaker).
 
-        diagnosis += "\nCzy spełniłem twoje oczekiwania?"
+        Czas oczekiwania na model jest ograniczony budżetem `latency_budget`. Gdy model nie odpowiada
+        (błąd, przekroczony czas lub otwarty obwód) albo wyczerpany jest budżet tokenów (PromptBuilder),
+        pacjent otrzymuje przybliżone dopasowanie z tabeli chorób (approximate_diagnosis).
+
+        Args:
+            key (str): Klucz pamięci podręcznej diagnoz dla bieżących objawów.
+            prefetched (concurrent.futures.Future | None): Zapytanie wysłane z wyprzedzeniem. Domyślnie None.
+            on_sentence (callable | None): Wywoływana z kolejnymi zdaniami odpowiedzi. Domyślnie None.
+
+        Returns:
+            str: Diagnoza modelu AI lub komunikat zastępczy.
+        """
+        emit = on_sentence or (lambda sentence: None)
+        messages = self.diagnosis_prompt(self.user_symptoms)
+        if prefetched is None and not self.prompt_builder.allow(messages):
+            self.logger.warning("Wyczerpany budżet tokenów - przybliżone dopasowanie z tabeli chorób")
+            return self.approximate_diagnosis(emit)
+        if not self.circuit_breaker.allow():
+            self.logger.warning("Model AI niedostępny (obwód otwarty) - przybliżone dopasowanie z tabeli chorób")
+            if prefetched is not None:
+                prefetched.cancel()
+            return self.approximate_diagnosis(emit)
+
+        budget = self.circuit_breaker.latency_budget
+        sentences = []
+        start = time.perf_counter()
+        try:
+            if prefetched is not None:
+                self.logger.info("Wykorzystano odpowiedź modelu AI pobraną z wyprzedzeniem")
+                sentences.append(prefetched.result(timeout=budget))
+                for sentence in AiModel.sentences(sentences):
+                    emit(sentence)
+            elif on_sentence is None:
+                sentences.append(self.ai_model.ask(messages, deadline=budget, on_usage=self.prompt_builder.record))
+            else:
+                for sentence in self.ai_model.ask_stream(messages, deadline=budget,
+                                                         on_usage=self.prompt_builder.record):
+                    on_sentence(sentence)
+                    sentences.append(sentence)
+        except Exception as e:
+            # Odpowiedź niepełna lub jej brak - pacjent otrzymuje dopasowanie z tabeli, a nie treść błędu
+            self.circuit_breaker.record_failure()
+            if prefetched is not None:
+                prefetched.cancel()
+            self.logger.error(f"Błąd podczas komunikacji z modelem AI: {e}")
+            sentences.append(self.approximate_diagnosis(emit))
+            return " ".join(sentences)
+
+        self.circuit_breaker.record_success(time.perf_counter() - start)
+        diagnosis = " ".join(sentences)
+        self.diagnosis_cache.put(key, diagnosis)
         return diagnosis
+
+    def approximate_diagnosis(self, emit) -> str:
+        """
+        Przygotowuje odpowiedź zastępczą: najbliższą objawom chorobę z tabeli wzorców,
+        z zaznaczeniem, że jest to dopasowanie przybliżone.
+
+        Args:
+            emit (callable): Wywoływana z kolejnymi zdaniami odpowiedzi.
+
+        Returns:
+            str: Komunikat z przybliżonym dopasowaniem.
+        """
+        nearest = self.disease_matcher.rank(self.user_symptoms, limit=1)
+        if nearest:
+            message = SpeechLibrary.approximate_disease(nearest[0][0])
+        else:
+            message = SpeechLibrary.ai_error_response()
+        for sentence in AiModel.sentences([message]):
+            emit(sentence)
+        return message
+
+    def diagnosis_prompt(self, user_symptoms: dict) -> list:
+        """
+        Buduje zapytanie diagnostyczne do modelu AI.
+
+        Wymieniane są objawy obecne oraz tylko te nieobecne, które są typowe dla trzech
+        najbliższych chorób z tabeli wzorców.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+
+        Returns:
+            list: Wiadomości zapytania (PromptBuilder.build).
+        """
+        nearest = [disease for disease, _ in self.disease_matcher.rank(user_symptoms, limit=3)]
+        return self.prompt_builder.build(user_symptoms, nearest)
+
+    def prefetch_diagnoses(self):
+        """
+        Wysyła z wyprzedzeniem zapytania do modelu AI, gdy wiadomo już, że diagnozę przygotuje model.
+
+        Jeśli dotychczasowe odpowiedzi nie pasują do żadnej choroby z tabeli wzorców, a liczba możliwych
+        zestawów odpowiedzi na pozostałe pytania (tak/nie) nie przekracza PREFETCH_LIMIT, dla każdego
+        z nich wysyłane jest zapytanie w tle. Zapytania niezgodne z kolejnymi odpowiedziami są anulowane,
+        a odpowiedź pasująca do ostatecznego zestawu objawów jest wykorzystywana w get_recommendation.
+        Zapytania są wysyłane tylko wtedy, gdy w budżecie tokenów zostaje miejsce na właściwą diagnozę.
+        """
+        if self.candidates is None or len(self.candidates) or not self.PREFETCH_LIMIT:
+            return
+        if self.circuit_breaker.state != CircuitBreaker.CLOSED:
+            return
+        pending = [symptom for symptom, checked in self.check_syndroms.items() if checked is not True]
+        if 2 ** len(pending) > self.PREFETCH_LIMIT:
+            return
+
+        wanted = {}
+        for answers in itertools.product((True, False), repeat=len(pending)):
+            user_symptoms = dict(self.user_symptoms, **dict(zip(pending, answers)))
+            wanted[DiagnosisCache.key(self.PROMPT_VERSION, self.required_symptoms, user_symptoms)] = user_symptoms
+
+        for key in list(self.prefetched):
+            if key not in wanted:
+                self.prefetched.pop(key).cancel()
+        missing = {key: self.diagnosis_prompt(user_symptoms) for key, user_symptoms in wanted.items()
+                   if key not in self.prefetched and self.diagnosis_cache.peek(key) is None}
+        # Zapytania z wyprzedzeniem nie mogą wyczerpać budżetu potrzebnego na właściwą diagnozę
+        if missing and not self.prompt_builder.allow(max(missing.values(), key=PromptBuilder.estimate_tokens),
+                                                     count=len(missing) + 1):
+            return
+        for key, messages in missing.items():
+            self.prefetched[key] = self.ai_model.prefetch(messages, deadline=self.circuit_breaker.latency_budget,
+                                                          on_usage=self.prompt_builder.record)
+        self.logger.debug(f"Zapytania do modelu AI wysłane z wyprzedzeniem: {len(self.prefetched)}")
+
+    def cancel_prefetch(self):
+        """
+        Anuluje zapytania do modelu AI wysłane z wyprzedzeniem.
+        """
+        for future in self.prefetched.values():
+            future.cancel()
+        self.prefetched = {}
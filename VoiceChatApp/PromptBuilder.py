@@ -0,0 +1,219 @@
+import datetime
+import logging
+import math
+import os
+import sqlite3
+import threading
+from .CacheDirectory import CacheDirectory
+
+
+class PromptBuilder:
+    """
+    Klasa PromptBuilder buduje zwięzłe zapytania diagnostyczne do modelu AI i rozlicza zużycie tokenów.
+
+    Funkcjonalności:
+
+    - Zapytanie składa się z krótkiej instrukcji systemowej i listy objawów w kanonicznej postaci:
+      objawy obecne oraz istotne objawy nieobecne (typowe dla najbliższych chorób z tabeli wzorców),
+      uporządkowane alfabetycznie. Objawy o nieznanej odpowiedzi są pomijane. Ten sam zestaw
+      objawów daje zawsze identyczne zapytanie.
+
+    - Zapis liczby tokenów zapytania i odpowiedzi oraz czasu każdego wywołania modelu.
+
+    - Budżet tokenów na rozmowę i na dzień. Zużycie dzienne jest zapisywane w bazie SQLite
+      w katalogu pamięci podręcznej użytkownika, więc obowiązuje również po ponownym uruchomieniu
+      aplikacji i jest wspólne dla jednocześnie działających procesów.
+    """
+
+    SYSTEM_PROMPT = (
+        "Jesteś asystentem medycznym. Podaj najbardziej prawdopodobną chorobę i zalecenia "
+        "w dwóch krótkich zdaniach po polsku. Przypomnij o kontakcie z lekarzem."
+    )
+
+    # Szacowana liczba tokenów odpowiedzi, rezerwowana w budżecie przed wywołaniem
+    EXPECTED_COMPLETION_TOKENS = 80
+
+    def __init__(self, max_session_tokens=2000, max_daily_tokens=100000, usage_path=None, debug=False):
+        """
+        Inicjalizuje obiekt PromptBuilder.
+
+        Args:
+            max_session_tokens (int | None): Budżet tokenów na rozmowę lub None bez limitu. Domyślnie 2000.
+            max_daily_tokens (int | None): Budżet tokenów na dzień lub None bez limitu. Domyślnie 100000.
+            usage_path (str | None): Baza SQLite z dziennym zużyciem tokenów lub None, aby liczyć
+                zużycie tylko w pamięci. Baza jest pomijana, jeśli ona lub jej katalog nie należą
+                wyłącznie do bieżącego użytkownika. Domyślnie None.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.max_session_tokens = max_session_tokens
+        self.max_daily_tokens = max_daily_tokens
+        self.usage_path = usage_path
+        self._lock = threading.Lock()
+        self.calls = []
+        self.session_tokens = 0
+        self.day = None
+        self.daily_tokens = 0
+
+        self._db = None
+        if usage_path:
+            try:
+                CacheDirectory.ensure(os.path.dirname(os.path.abspath(usage_path)))
+                if os.path.exists(usage_path) and not CacheDirectory.is_trusted(usage_path):
+                    raise PermissionError(f"Baza {usage_path} nie należy wyłącznie do bieżącego użytkownika")
+                # Połączenie jest współdzielone przez wątki, dostęp chroni self._lock
+                self._db = sqlite3.connect(usage_path, timeout=5.0, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS usage (day TEXT PRIMARY KEY, tokens INTEGER NOT NULL)")
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning(f"Zużycie tokenów jest liczone tylko w pamięci operacyjnej: {e}")
+                self._db = None
+        with self._lock:
+            self._roll_day()
+
+    def build(self, user_symptoms: dict, nearest=None) -> list:
+        """
+        Buduje zapytanie diagnostyczne.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+            nearest (list | None): Najbliższe choroby z tabeli wzorców (słowniki objaw -> bool).
+                Jeśli podane, wymieniane są tylko objawy nieobecne, które występują w którejś z nich.
+                Domyślnie None (wszystkie objawy nieobecne).
+
+        Returns:
+            list: Wiadomości w formacie API chat completions.
+        """
+        present = sorted(symptom.lower() for symptom, value in user_symptoms.items() if value)
+        absent = [symptom for symptom, value in user_symptoms.items() if value is False]
+        if nearest is not None:
+            # Istotne są tylko zaprzeczenia objawów typowych dla chorób branych pod uwagę
+            absent = [symptom for symptom in absent if any(disease.get(symptom) for disease in nearest)]
+        absent = sorted(symptom.lower() for symptom in absent)
+
+        content = f"Objawy: {', '.join(present) or 'brak'}."
+        if absent:
+            content += f" Brak: {', '.join(absent)}."
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": content},
+        ]
+
+    @staticmethod
+    def estimate_tokens(messages: list) -> int:
+        """
+        Szacuje liczbę tokenów zapytania (ok. 4 znaki na token i narzut każdej wiadomości).
+
+        Args:
+            messages (list): Wiadomości w formacie API chat completions.
+
+        Returns:
+            int: Szacowana liczba tokenów.
+        """
+        return sum(4 + math.ceil(len(message["content"]) / 4) for message in messages)
+
+    def allow(self, messages: list, count=1) -> bool:
+        """
+        Sprawdza, czy wywołania mieszczą się w budżecie rozmowy i dnia.
+
+        Args:
+            messages (list): Wiadomości zapytania.
+            count (int): Liczba wywołań z zapytaniem tej wielkości. Domyślnie 1.
+
+        Returns:
+            bool: True, jeśli wywołania mieszczą się w budżecie.
+        """
+        needed = count * (self.estimate_tokens(messages) + self.EXPECTED_COMPLETION_TOKENS)
+        with self._lock:
+            self._roll_day()
+            if self.max_session_tokens is not None and self.session_tokens + needed > self.max_session_tokens:
+                self.logger.warning(f"Przekroczony budżet tokenów rozmowy ({self.session_tokens} + {needed} > "
+                                    f"{self.max_session_tokens})")
+                return False
+            if self.max_daily_tokens is not None and self.daily_tokens + needed > self.max_daily_tokens:
+                self.logger.warning(f"Przekroczony dzienny budżet tokenów ({self.daily_tokens} + {needed} > "
+                                    f"{self.max_daily_tokens})")
+                return False
+            return True
+
+    def record(self, prompt_tokens: int, completion_tokens: int, latency: float):
+        """
+        Zapisuje zużycie tokenów i czas wywołania modelu (może być wywoływana z dowolnego wątku).
+
+        Args:
+            prompt_tokens (int): Liczba tokenów zapytania.
+            completion_tokens (int): Liczba tokenów odpowiedzi.
+            latency (float): Czas wywołania w sekundach.
+        """
+        tokens = prompt_tokens + completion_tokens
+        with self._lock:
+            self._roll_day()
+            self.calls.append({"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                               "latency": latency})
+            self.session_tokens += tokens
+            self._add_usage(tokens)
+        self.logger.info(f"Wywołanie modelu AI: {prompt_tokens} + {completion_tokens} tokenów, "
+                         f"{latency * 1000:.0f} ms (rozmowa: {self.session_tokens}, dzień: {self.daily_tokens})")
+
+    def reset_session(self):
+        """
+        Zeruje zużycie tokenów rozmowy.
+        """
+        with self._lock:
+            self.session_tokens = 0
+
+    def stats(self) -> dict:
+        """
+        Zwraca statystyki wywołań modelu.
+
+        Returns:
+            dict: Liczba wywołań, suma tokenów zapytań i odpowiedzi, średni czas wywołania
+                  oraz zużycie rozmowy i dnia.
+        """
+        with self._lock:
+            calls = len(self.calls)
+            return {
+                "calls": calls,
+                "prompt_tokens": sum(call["prompt_tokens"] for call in self.calls),
+                "completion_tokens": sum(call["completion_tokens"] for call in self.calls),
+                "mean_latency": sum(call["latency"] for call in self.calls) / calls if calls else 0.0,
+                "session_tokens": self.session_tokens,
+                "daily_tokens": self.daily_tokens,
+            }
+
+    def _roll_day(self):
+        """
+        Funkcja pomocnicza: ustala bieżący dzień i wczytuje jego zużycie z bazy, uwzględniając wywołania
+        innych procesów; bez bazy zeruje zużycie po zmianie daty (wywoływana z założoną blokadą).
+        """
+        today = datetime.date.today().isoformat()
+        if today != self.day:
+            self.day, self.daily_tokens = today, 0
+        if self._db is not None:
+            try:
+                row = self._db.execute("SELECT tokens FROM usage WHERE day = ?", (self.day,)).fetchone()
+                self.daily_tokens = row[0] if row else 0
+            except sqlite3.Error as e:
+                self.logger.warning(f"Nie można wczytać zużycia tokenów: {e}")
+
+    def _add_usage(self, tokens: int):
+        """
+        Funkcja pomocnicza: dolicza tokeny do zużycia bieżącego dnia (wywoływana z założoną blokadą).
+
+        Zwiększenie licznika w jednej instrukcji SQL nie gubi tokenów zapisanych w tym czasie przez inne procesy.
+        """
+        self.daily_tokens += tokens
+        if self._db is None:
+            return
+        try:
+            with self._db:
+                self._db.execute("INSERT INTO usage (day, tokens) VALUES (?, ?) "
+                                 "ON CONFLICT (day) DO UPDATE SET tokens = tokens + excluded.tokens",
+                                 (self.day, tokens))
+                self._db.execute("DELETE FROM usage WHERE day < ?", (self.day,))
+            self.daily_tokens = self._db.execute("SELECT tokens FROM usage WHERE day = ?",
+                                                 (self.day,)).fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.warning(f"Nie można zapisać zużycia tokenów: {e}")
@@ -0,0 +1,150 @@
+import logging
+import numpy as np
+from .DiseaseMatcher import DiseaseMatcher
+
+
+class QuestionSelector:
+    """
+    Klasa QuestionSelector wybiera kolejny objaw, o który należy zapytać użytkownika.
+
+    Kandydatami są choroby, których wzorce nie przeczą potwierdzonym dotąd odpowiedziom.
+    Spośród objawów, o które jeszcze nie zapytano, wybierany jest ten o największym
+    oczekiwanym przyroście informacji, czyli dzielący kandydatów najbardziej równomiernie
+    (przy równych szansach chorób przyrost informacji to entropia podziału).
+    Gdy żaden objaw nie rozróżnia kandydatów, pytania są zadawane w stałej kolejności
+    `required_symptoms`, aby zebrać pełny opis przypadku.
+    """
+
+    def __init__(self, matcher=None, debug=False):
+        """
+        Inicjalizuje obiekt QuestionSelector.
+
+        Args:
+            matcher (DiseaseMatcher | None): Skompilowana tabela chorób. Domyślnie DiseaseMatcher.from_library().
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.matcher = matcher or DiseaseMatcher.from_library()
+
+    def confirmed_answers(self, user_symptoms: dict, check_syndroms: dict) -> dict:
+        """
+        Zwraca odpowiedzi potwierdzone przez użytkownika; pozostałe objawy mają wartość None.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+            check_syndroms (dict): Słownik objaw -> True (sprawdzony), False (niesprawdzony), None (niejasny).
+
+        Returns:
+            dict: Słownik objaw -> True/False/None dla wszystkich objawów tabeli.
+        """
+        return {
+            symptom: user_symptoms.get(symptom) if check_syndroms.get(symptom) is True else None
+            for symptom in self.matcher.symptoms
+        }
+
+    def candidates(self, user_symptoms: dict, check_syndroms: dict) -> np.ndarray:
+        """
+        Wyznacza choroby zgodne z potwierdzonymi odpowiedziami.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+            check_syndroms (dict): Słownik objaw -> True/False/None (stan sprawdzenia objawu).
+
+        Returns:
+            np.ndarray: Indeksy chorób-kandydatów w kolejności tabeli wzorców.
+        """
+        answers = self.confirmed_answers(user_symptoms, check_syndroms)
+        return np.flatnonzero(self.matcher.consistent(answers))
+
+    def prune(self, candidates: np.ndarray, symptom: str, answer) -> np.ndarray:
+        """
+        Odrzuca kandydatów sprzecznych z nową odpowiedzią użytkownika.
+
+        Args:
+            candidates (np.ndarray): Indeksy dotychczasowych kandydatów.
+            symptom (str): Objaw, o który zapytano.
+            answer (bool | None): Odpowiedź użytkownika (None nie zmienia zbioru kandydatów).
+
+        Returns:
+            np.ndarray: Indeksy kandydatów zgodnych z odpowiedzią.
+        """
+        column = self.matcher.columns.get(symptom)
+        if answer is None or column is None:
+            return candidates
+        return candidates[self.matcher.matrix[candidates, column] == bool(answer)]
+
+    def is_resolved(self, candidates: np.ndarray, check_syndroms: dict) -> bool:
+        """
+        Sprawdza, czy dalsze pytania nie mogą już zmienić wyniku dopasowania.
+
+        Wynik jest rozstrzygnięty, gdy żaden z niesprawdzonych objawów nie występuje we wzorcu
+        któregokolwiek z kandydatów. Wtedy niesprawdzone objawy nie rozróżniają kandydatów
+        (jeden kandydat lub identyczne wzorce), a wszystkie objawy ich wzorców zostały potwierdzone,
+        więc odpowiedź "nie" nie może już podważyć diagnozy. Brak kandydatów nie jest
+        rozstrzygnięciem - odpowiedź przygotuje model AI, który potrzebuje pełnego opisu objawów.
+
+        Args:
+            candidates (np.ndarray): Indeksy chorób-kandydatów.
+            check_syndroms (dict): Słownik objaw -> True/False/None (stan sprawdzenia objawu).
+
+        Returns:
+            bool: True, jeśli można zakończyć zadawanie pytań.
+        """
+        if len(candidates) == 0:
+            return False
+        columns = [
+            self.matcher.columns[symptom] for symptom, checked in check_syndroms.items()
+            if checked is not True and symptom in self.matcher.columns
+        ]
+        return not self.matcher.matrix[np.ix_(candidates, columns)].any()
+
+    def information_gain(self, candidates: np.ndarray, columns: list) -> np.ndarray:
+        """
+        Oblicza oczekiwany przyrost informacji (w bitach) pytania o każdy z podanych objawów.
+
+        Args:
+            candidates (np.ndarray): Indeksy chorób-kandydatów.
+            columns (list): Indeksy kolumn objawów.
+
+        Returns:
+            np.ndarray: Przyrost informacji dla każdej kolumny.
+        """
+        if len(candidates) == 0 or not columns:
+            return np.zeros(len(columns))
+        share = self.matcher.matrix[np.ix_(candidates, columns)].mean(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -(share * np.log2(share) + (1 - share) * np.log2(1 - share))
+        return np.nan_to_num(entropy)
+
+    def next_symptom(self, user_symptoms: dict, check_syndroms: dict):
+        """
+        Wybiera objaw, o który należy zapytać w następnej kolejności.
+
+        Args:
+            user_symptoms (dict): Słownik objaw -> True/False/None.
+            check_syndroms (dict): Słownik objaw -> True/False/None (stan sprawdzenia objawu).
+
+        Returns:
+            str | None: Nazwa objawu lub None, jeśli wszystkie objawy zostały sprawdzone.
+        """
+        pending = [symptom for symptom, checked in check_syndroms.items() if checked is not True]
+        if not pending:
+            return None
+
+        askable = [symptom for symptom in pending if symptom in self.matcher.columns]
+        columns = [self.matcher.columns[symptom] for symptom in askable]
+        candidates = self.candidates(user_symptoms, check_syndroms)
+        gains = self.information_gain(candidates, columns)
+        if len(gains) and gains.max() > 0:
+            # argmax przy remisie zwraca pierwszy objaw w kolejności required_symptoms
+            symptom = askable[int(np.argmax(gains))]
+            self.logger.debug(f"Kandydaci: {len(candidates)}, pytanie o '{symptom}' ({gains.max():.2f} bit)")
+            return symptom
+        if len(candidates) and columns:
+            # Kandydaci są nierozróżnialni - najpierw potwierdzamy objawy z ich wzorca
+            present = self.matcher.matrix[np.ix_(candidates, columns)].any(axis=0)
+            if present.any():
+                return askable[int(np.argmax(present))]
+        return pending[0]
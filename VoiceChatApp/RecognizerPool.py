@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from vosk import Model, KaldiRecognizer
+import threading
+import logging
+from .SpeechBackend import SpeechBackend
+
+
+class RecognizerPool(SpeechBackend):
+    """
+    Klasa RecognizerPool udostępnia rozpoznawacze VOSK wielu równoległym sesjom rozmowy.
+
+    Model akustyczny jest ładowany tylko raz na proces i współdzielony przez wszystkie pule.
+    Rozpoznawacze są wypożyczane sesjom, zerowane po zwrocie i przechowywane do ponownego
+    użycia osobno dla każdej gramatyki. Liczba jednocześnie wypożyczonych rozpoznawaczy
+    jest ograniczona, aby jeden host mógł bezpiecznie obsłużyć wiele rozmów.
+    """
+
+    _models = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_path="VoiceChatApp/model", rate=16000, max_sessions=8, debug=False):
+        """
+        Inicjalizuje pulę rozpoznawaczy.
+
+        Args:
+            model_path (str): Ścieżka do katalogu modelu VOSK. Domyślnie "VoiceChatApp/model".
+            rate (int): Częstotliwość próbkowania w Hz. Domyślnie 16000.
+            max_sessions (int): Maksymalna liczba jednocześnie wypożyczonych rozpoznawaczy. Domyślnie 8.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.model = self.shared_model(model_path)
+        self.rate = rate
+        self.max_sessions = max_sessions
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._grammars = {}
+        self.leased = 0
+
+    @classmethod
+    def shared_model(cls, model_path: str) -> Model:
+        """
+        Zwraca model VOSK współdzielony w obrębie procesu, ładując go przy pierwszym użyciu.
+
+        Args:
+            model_path (str): Ścieżka do katalogu modelu VOSK.
+
+        Returns:
+            Model: Załadowany model.
+        """
+        with cls._models_lock:
+            model = cls._models.get(model_path)
+            if model is None:
+                model = Model(model_path)
+                cls._models[model_path] = model
+            return model
+
+    def acquire(self, grammar=None, timeout=None) -> KaldiRecognizer:
+        """
+        Wypożycza rozpoznawacz dla podanej gramatyki.
+
+        Args:
+            grammar (str | None): Gramatyka w formacie JSON lub None dla pełnego słownika.
+            timeout (float | None): Maksymalny czas oczekiwania na wolne miejsce w sekundach.
+
+        Returns:
+            KaldiRecognizer: Rozpoznawacz gotowy do nowej wypowiedzi.
+
+        Raises:
+            TimeoutError: Jeśli limit równoległych sesji nie zwolnił się w zadanym czasie.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Brak wolnego rozpoznawacza (limit {self.max_sessions} sesji)")
+
+        with self._lock:
+            idle = self._idle.get(grammar)
+            recognizer = idle.pop() if idle else None
+            self.leased += 1
+
+        if recognizer is None:
+            try:
+                if grammar is None:
+                    recognizer = KaldiRecognizer(self.model, self.rate)
+                else:
+                    recognizer = KaldiRecognizer(self.model, self.rate, grammar)
+            except Exception:
+                with self._lock:
+                    self.leased -= 1
+                self._slots.release()
+                raise
+            self.logger.debug("Utworzono nowy rozpoznawacz")
+            self._grammars[id(recognizer)] = grammar
+        return recognizer
+
+    def release(self, recognizer: KaldiRecognizer):
+        """
+        Zwraca rozpoznawacz do puli, zerując jego stan.
+
+        Args:
+            recognizer (KaldiRecognizer): Wcześniej wypożyczony rozpoznawacz.
+        """
+        recognizer.Reset()
+        with self._lock:
+            grammar = self._grammars.get(id(recognizer))
+            self._idle.setdefault(grammar, []).append(recognizer)
+            self.leased -= 1
+        self._slots.release()
+
+    @contextmanager
+    def lease(self, grammar=None, timeout=None):
+        """
+        Menedżer kontekstu wypożyczający rozpoznawacz na czas trwania bloku `with`.
+
+        Args:
+            grammar (str | None): Gramatyka w formacie JSON lub None dla pełnego słownika.
+            timeout (float | None): Maksymalny czas oczekiwania na wolne miejsce w sekundach.
+
+        Yields:
+            KaldiRecognizer: Wypożyczony rozpoznawacz.
+        """
+        recognizer = self.acquire(grammar, timeout)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer)
+
+    def warmup(self, grammars, seconds=0.5):
+        """
+        Tworzy po jednym rozpoznawaczu dla każdej gramatyki i przepuszcza przez niego próbkę ciszy,
+        aby pierwsza rzeczywista wypowiedź nie ponosiła kosztu inicjalizacji dekodera.
+
+        Args:
+            grammars (iterable): Gramatyki w formacie JSON (None oznacza pełny słownik).
+            seconds (float): Długość próbki ciszy w sekundach. Domyślnie 0.5.
+        """
+        silence = bytes(int(self.rate * seconds) * 2)
+        for grammar in grammars:
+            with self.lease(grammar) as recognizer:
+                recognizer.AcceptWaveform(silence)
+                recognizer.FinalResult()
+        self.logger.debug("Rozgrzano rozpoznawacze puli")
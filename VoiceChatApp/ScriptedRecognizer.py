@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from .SpeechBackend import SpeechBackend
+
+
+class ScriptedRecognizer:
+    """
+    Klasa ScriptedRecognizer jest deterministycznym zamiennikiem vosk.KaldiRecognizer.
+
+    Zamiast dekodować dźwięk, odtwarza zadaną wypowiedź: w miarę dostarczania audio
+    zwraca kolejne słowa jako wyniki częściowe, a po upływie zadanego czasu nagrania
+    zwraca wynik końcowy. Pozwala mierzyć przepustowość i opóźnienia potoku rozmowy
+    bez mikrofonu i modelu akustycznego.
+    """
+
+    def __init__(self, text="", rate=16000, utterance_seconds=1.5, decode_delay=0.0):
+        """
+        Inicjalizuje rozpoznawacz skryptowy.
+
+        Args:
+            text (str): Wypowiedź, którą rozpoznawacz ma "rozpoznać".
+            rate (int): Częstotliwość próbkowania w Hz. Domyślnie 16000.
+            utterance_seconds (float): Ilość audio (s), po której zwracany jest wynik końcowy. Domyślnie 1.5.
+            decode_delay (float): Sztuczny czas przetwarzania (s) każdej porcji audio,
+                symulujący koszt dekodowania. Domyślnie 0.
+        """
+        self.rate = rate
+        self.utterance_seconds = utterance_seconds
+        self.decode_delay = decode_delay
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        """
+        Ustawia kolejną wypowiedź i zeruje stan rozpoznawacza.
+
+        Args:
+            text (str): Wypowiedź do odtworzenia.
+        """
+        self.words = text.split()
+        self.Reset()
+
+    def Reset(self):
+        """
+        Zeruje stan rozpoznawacza (zgodnie z interfejsem KaldiRecognizer).
+        """
+        self.audio_seconds = 0.0
+        self.finalized = False
+
+    def _visible_words(self) -> list:
+        """
+        Funkcja pomocnicza: zwraca słowa "usłyszane" do tej pory.
+
+        Returns:
+            list: Początkowe słowa wypowiedzi proporcjonalne do ilości dostarczonego audio.
+        """
+        if self.utterance_seconds <= 0:
+            return self.words
+        count = int(len(self.words) * min(1.0, self.audio_seconds / self.utterance_seconds))
+        return self.words[:count]
+
+    def AcceptWaveform(self, data) -> bool:
+        """
+        Przyjmuje porcję audio.
+
+        Args:
+            data (bytes): Porcja audio 16-bit PCM mono.
+
+        Returns:
+            bool: True, jeśli dostępny jest wynik końcowy.
+        """
+        if self.decode_delay:
+            time.sleep(self.decode_delay)
+        self.audio_seconds += len(data) / (self.rate * 2)
+        return not self.finalized and self.audio_seconds >= self.utterance_seconds
+
+    def Result(self) -> str:
+        """
+        Zwraca wynik końcowy w formacie VOSK.
+
+        Returns:
+            str: JSON z kluczem "text".
+        """
+        text = "" if self.finalized else " ".join(self.words)
+        self.finalized = True
+        return json.dumps({"text": text}, ensure_ascii=False)
+
+    def PartialResult(self) -> str:
+        """
+        Zwraca wynik częściowy w formacie VOSK.
+
+        Returns:
+            str: JSON z kluczem "partial".
+        """
+        text = "" if self.finalized else " ".join(self._visible_words())
+        return json.dumps({"partial": text}, ensure_ascii=False)
+
+    def FinalResult(self) -> str:
+        """
+        Zwraca wynik końcowy dla dotychczas dostarczonego audio.
+
+        Returns:
+            str: JSON z kluczem "text".
+        """
+        text = "" if self.finalized else " ".join(self._visible_words())
+        self.finalized = True
+        return json.dumps({"text": text}, ensure_ascii=False)
+
+
+class ScriptedBackend(SpeechBackend):
+    """
+    Klasa ScriptedBackend dostarcza rozpoznawacze skryptowe odtwarzające kolejne wypowiedzi rozmowy.
+
+    Każde wypożyczenie rozpoznawacza odpowiada jednej turze i otrzymuje następną wypowiedź ze skryptu.
+    """
+
+    def __init__(self, script, rate=16000, utterance_seconds=1.5, decode_delay=0.0):
+        """
+        Inicjalizuje backend skryptowy.
+
+        Args:
+            script (list): Kolejne wypowiedzi użytkownika.
+            rate (int): Częstotliwość próbkowania w Hz. Domyślnie 16000.
+            utterance_seconds (float): Ilość audio (s) na jedną wypowiedź. Domyślnie 1.5.
+            decode_delay (float): Sztuczny czas przetwarzania (s) każdej porcji audio. Domyślnie 0.
+        """
+        self.script = list(script)
+        self.rate = rate
+        self.utterance_seconds = utterance_seconds
+        self.decode_delay = decode_delay
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, grammar=None, timeout=None) -> ScriptedRecognizer:
+        """
+        Tworzy rozpoznawacz dla następnej wypowiedzi ze skryptu.
+
+        Args:
+            grammar (str | None): Ignorowana - skrypt określa wynik rozpoznawania.
+            timeout (float | None): Ignorowany.
+
+        Returns:
+            ScriptedRecognizer: Rozpoznawacz następnej wypowiedzi (pustej po wyczerpaniu skryptu).
+        """
+        with self._lock:
+            text = self.script[self._turn] if self._turn < len(self.script) else ""
+            self._turn += 1
+        return ScriptedRecognizer(text, self.rate, self.utterance_seconds, self.decode_delay)
+
+    def release(self, recognizer):
+        """
+        Zwraca rozpoznawacz (backend skryptowy nie przechowuje rozpoznawaczy).
+
+        Args:
+            recognizer (ScriptedRecognizer): Wcześniej wypożyczony rozpoznawacz.
+        """
+
+    def finished(self) -> bool:
+        """
+        Sprawdza, czy skrypt rozmowy został wyczerpany.
+
+        Returns:
+            bool: True, jeśli wszystkie wypowiedzi zostały już wypożyczone.
+        """
+        return self._turn >= len(self.script)
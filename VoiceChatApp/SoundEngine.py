@@ -2,80 +2,235 @@ from io import BytesIO
 
 from gtts import gTTS
 import pygame
+import queue
 import tempfile
 import threading
 import logging
+import time
+
+from .TtsCache import TtsCache
 
 
 class SoundEngine:
     """
     Klasa SoundEngine zarządza generowaniem i odtwarzaniem dźwięku za pomocą gTTS i Pygame.
+
+    Oprócz odtwarzania całej wypowiedzi (`say`) obsługuje tryb strumieniowy: zdania dodawane
+    metodą `say_sentence` trafiają do kolejki, a synteza kolejnego zdania odbywa się w trakcie
+    odtwarzania poprzedniego. Pierwsze zdanie zaczyna brzmieć, zanim znany jest pełny tekst odpowiedzi.
+
+    Zsyntezowane wypowiedzi trafiają do pamięci podręcznej mowy (TtsCache), więc powtarzające się
+    zdania są odtwarzane bez zapytania sieciowego do gTTS.
     """
 
-    def __init__(self, lang='pl', debug=False):
+    def __init__(self, lang='pl', tld='com', tts_cache=None, debug=False):
         """
         Inicjalizuje silnik dźwięku z określonym językiem dla gTTS.
 
         Args:
             lang (str): Kod języka (np. 'pl' dla polskiego, 'en' dla angielskiego).
+            tld (str): Domena serwera gTTS, wyznaczająca wariant głosu. Domyślnie 'com'.
+            tts_cache (TtsCache | None): Pamięć podręczna mowy. Domyślnie współdzielona (TtsCache.shared).
             debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
         """
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
 
         self.lang = lang
+        self.tld = tld
+        self.tts_cache = tts_cache or TtsCache.shared()
         self.temp_dir = tempfile.gettempdir()
         self.current_thread = None
+        self._sentences = None
+        self._stopped = threading.Event()
         pygame.init()
         pygame.mixer.init()
 
-    def say(self, text: str):
+    def say(self, text: str, on_start=None):
         """
         Generuje dźwięk na podstawie podanego tekstu i odtwarza go w tle.
         Przerywa aktualne odtwarzanie, jeśli takie istnieje.
 
         Args:
             text (str): Tekst do wymówienia.
+            on_start (callable | None): Wywoływana z czasem (time.perf_counter) rozpoczęcia odtwarzania.
         """
         self.logger.debug("Wywołanie say")
-        # Zatrzymywanie aktywnego odtwarzania, jeśli istnieje wątek odtwarzania
+        self.stop()
+
+        # Tworzenie nowego wątku do odtwarzania dźwięku
+        self.current_thread = threading.Thread(target=self._play_sound, args=(text, on_start), daemon=True)
+        self.current_thread.start()
+
+    def start_stream(self, on_start=None):
+        """
+        Rozpoczyna wypowiedź strumieniową, której zdania będą dodawane metodą `say_sentence`.
+        Przerywa aktualne odtwarzanie, jeśli takie istnieje.
+
+        Args:
+            on_start (callable | None): Wywoływana z czasem (time.perf_counter) rozpoczęcia odtwarzania
+                pierwszego zdania.
+        """
+        self.logger.debug("Wywołanie start_stream")
+        self.stop()
+        self._stopped = threading.Event()
+        self._sentences = queue.Queue()
+        self.current_thread = threading.Thread(
+            target=self._play_stream, args=(self._sentences, self._stopped, on_start), daemon=True
+        )
+        self.current_thread.start()
+
+    def say_sentence(self, text: str):
+        """
+        Dodaje zdanie do bieżącej wypowiedzi strumieniowej (rozpoczynając ją w razie potrzeby).
+
+        Args:
+            text (str): Zdanie do wymówienia.
+        """
+        if self._sentences is None:
+            self.start_stream()
+        self._sentences.put(text)
+
+    def end_stream(self):
+        """
+        Kończy wypowiedź strumieniową - wątek odtwarzania zakończy się po ostatnim zdaniu z kolejki.
+        """
+        if self._sentences is not None:
+            self._sentences.put(None)
+            self._sentences = None
+
+    def stop(self):
+        """
+        Przerywa bieżące odtwarzanie (również wypowiedź strumieniową wraz z zdaniami oczekującymi w kolejce).
+        """
+        self._stopped.set()
+        self.end_stream()
         if self.current_thread and self.current_thread.is_alive():
             pygame.mixer.music.stop()
             self.current_thread.join()
 
-        # Tworzenie nowego wątku do odtwarzania dźwięku
-        self.current_thread = threading.Thread(target=self._play_sound, args=(text,), daemon=True)
-        self.current_thread.start()
+    def warmup(self, text: str = "Dzień dobry"):
+        """
+        Syntezuje próbną wypowiedź bez jej odtwarzania, aby pierwsza rzeczywista odpowiedź
+        nie ponosiła kosztu inicjalizacji gTTS i dekodera dźwięku.
+
+        Args:
+            text (str): Tekst próbnej wypowiedzi.
+        """
+        self.logger.debug("Wywołanie warmup")
+        try:
+            pygame.mixer.music.load(self._synthesize(text))
+        except Exception as e:
+            self.logger.warning(f"Nie udało się rozgrzać syntezatora mowy: {e}")
 
-    def _play_sound(self, text: str):
+    def _play_sound(self, text: str, on_start=None):
         """
         Funkcja pomocnicza: generuje dźwięk i odtwarza go.
 
         Args:
             text (str): Tekst do wygenerowania i odtworzenia.
+            on_start (callable | None): Wywoływana z czasem rozpoczęcia odtwarzania.
         """
         try:
-            tts = gTTS(text=text, lang=self.lang)
-            mp3 = BytesIO()
-            tts.write_to_fp(mp3)
-            mp3.seek(0)
-
-            pygame.mixer.music.load(mp3)
-            pygame.mixer.music.play()
-
-            while pygame.mixer.music.get_busy():
+            self._start_playback(self._synthesize(text), on_start)
+            while self._is_playing():
                 pygame.time.Clock().tick(10)
 
         except Exception as e:
             print(f"Błąd podczas odtwarzania dźwięku: {e}")
 
+    def _play_stream(self, sentences: queue.Queue, stopped: threading.Event, on_start=None):
+        """
+        Funkcja pomocnicza: syntezuje i odtwarza kolejne zdania z kolejki, aż do wartości None.
+
+        Synteza zdania odbywa się w trakcie odtwarzania poprzedniego, a zdanie jest odtwarzane
+        zaraz po zakończeniu poprzedniego.
+
+        Args:
+            sentences (queue.Queue): Kolejka zdań zakończona wartością None.
+            stopped (threading.Event): Ustawiane przy przerwaniu wypowiedzi.
+            on_start (callable | None): Wywoływana z czasem rozpoczęcia odtwarzania pierwszego zdania.
+        """
+        clock = pygame.time.Clock()
+        while not stopped.is_set():
+            text = sentences.get()
+            if text is None:
+                break
+            try:
+                audio = self._synthesize(text)
+                while self._is_playing() and not stopped.is_set():
+                    clock.tick(50)
+                if stopped.is_set():
+                    break
+                self._start_playback(audio, on_start)
+                on_start = None
+            except Exception as e:
+                print(f"Błąd podczas odtwarzania dźwięku: {e}")
+
+        while self._is_playing() and not stopped.is_set():
+            clock.tick(10)
+
+    @staticmethod
+    def generate(text: str, lang='pl', tld='com') -> bytes:
+        """
+        Syntezuje mowę przez gTTS (zapytanie sieciowe), z pominięciem pamięci podręcznej.
+
+        Args:
+            text (str): Tekst do wygenerowania.
+            lang (str): Kod języka. Domyślnie 'pl'.
+            tld (str): Domena serwera gTTS (wariant głosu). Domyślnie 'com'.
+
+        Returns:
+            bytes: Dźwięk w formacie MP3.
+        """
+        tts = gTTS(text=text, lang=lang, tld=tld)
+        mp3 = BytesIO()
+        tts.write_to_fp(mp3)
+        return mp3.getvalue()
+
+    def _synthesize(self, text: str):
+        """
+        Funkcja pomocnicza: zwraca mowę dla podanego tekstu z pamięci podręcznej lub ją syntezuje.
+
+        Args:
+            text (str): Tekst do wygenerowania.
+
+        Returns:
+            BytesIO: Dźwięk w formacie MP3.
+        """
+        audio = self.tts_cache.get(text, self.lang, self.tld)
+        if audio is None:
+            audio = self.generate(text, self.lang, self.tld)
+            self.tts_cache.put(text, self.lang, self.tld, audio)
+        return BytesIO(audio)
+
+    def _start_playback(self, audio, on_start=None):
+        """
+        Funkcja pomocnicza: rozpoczyna odtwarzanie zsyntezowanego dźwięku.
+
+        Args:
+            audio (BytesIO): Dźwięk do odtworzenia.
+            on_start (callable | None): Wywoływana z czasem rozpoczęcia odtwarzania.
+        """
+        pygame.mixer.music.load(audio)
+        pygame.mixer.music.play()
+        if on_start:
+            on_start(time.perf_counter())
+
+    def _is_playing(self) -> bool:
+        """
+        Funkcja pomocnicza: sprawdza, czy dźwięk jest odtwarzany.
+
+        Returns:
+            bool: True, jeśli trwa odtwarzanie.
+        """
+        return pygame.mixer.music.get_busy()
+
     def __del__(self):
         """
         Usuwa zasoby używane przez silnik dźwięku podczas niszczenia obiektu.
         Zatrzymuje odtwarzanie i zwalnia zasoby Pygame.
         """
-        if self.current_thread and self.current_thread.is_alive():
-            pygame.mixer.music.stop()
-            self.current_thread.join()
+        self.stop()
         pygame.mixer.quit()
         pygame.quit()
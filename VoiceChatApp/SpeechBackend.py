@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+
+
+class AudioSource(ABC):
+    """
+    Klasa AudioSource definiuje interfejs źródła audio dla rozpoznawania mowy.
+
+    Źródło dostarcza porcje audio w formacie 16-bit PCM mono. Implementacje:
+    AudioCapture (mikrofon) oraz WaveFileSource (pliki WAV).
+    """
+
+    rate = 16000
+    chunk_size = 4000
+
+    def start(self):
+        """
+        Rozpoczyna dostarczanie audio.
+        """
+
+    @abstractmethod
+    def read(self, timeout=0.5) -> bytes:
+        """
+        Pobiera kolejną porcję audio.
+
+        Args:
+            timeout (float): Maksymalny czas oczekiwania na dane w sekundach.
+
+        Returns:
+            bytes: Porcja audio lub pusty ciąg, jeśli dane nie są dostępne.
+        """
+
+    def clear(self):
+        """
+        Odrzuca audio zgromadzone przed rozpoczęciem nowej wypowiedzi.
+        """
+
+    def close(self):
+        """
+        Zwalnia zasoby źródła.
+        """
+
+
+class SpeechBackend(ABC):
+    """
+    Klasa SpeechBackend definiuje interfejs dostawcy rozpoznawaczy mowy.
+
+    Rozpoznawacze udostępniają interfejs zgodny z vosk.KaldiRecognizer
+    (AcceptWaveform, Result, PartialResult, FinalResult, Reset). Implementacje:
+    RecognizerPool (VOSK) oraz ScriptedBackend (deterministyczny zamiennik do testów wydajności).
+    """
+
+    @abstractmethod
+    def acquire(self, grammar=None, timeout=None):
+        """
+        Wypożycza rozpoznawacz dla podanej gramatyki.
+
+        Args:
+            grammar (str | None): Gramatyka w formacie JSON lub None dla pełnego słownika.
+            timeout (float | None): Maksymalny czas oczekiwania w sekundach.
+
+        Returns:
+            object: Rozpoznawacz zgodny z interfejsem KaldiRecognizer.
+        """
+
+    @abstractmethod
+    def release(self, recognizer):
+        """
+        Zwraca wypożyczony rozpoznawacz.
+
+        Args:
+            recognizer (object): Wcześniej wypożyczony rozpoznawacz.
+        """
+
+    def warmup(self, grammars, seconds=0.5):
+        """
+        Przygotowuje rozpoznawacze przed pierwszą wypowiedzią.
+
+        Args:
+            grammars (iterable): Gramatyki w formacie JSON (None oznacza pełny słownik).
+            seconds (float): Długość próbki ciszy w sekundach.
+        """
@@ -1,3 +1,5 @@
+import json
+import os
 import random
 
 
@@ -14,593 +16,81 @@ class SpeechLibrary:
     - Generowanie losowych pytań oraz odpowiedzi na podstawie danych wejściowych.
     """
 
+    # Plik bazy wiedzy: tabela chorób, objawy, synonimy i szablony odpowiedzi
+    DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "knowledge_base.json")
+
     # Modele wzorców chorobowych
-    symptoms_table = [
-        {
-            "Choroba": "Grypa",
-            "Ból głowy": True,
-            "Wymioty": True,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": False,
-            "Kaszel": True,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Internista",
-            "Zalecenia": "Odpoczynek, nawadnianie, leki przeciwgorączkowe"
-        },
-        {
-            "Choroba": "Zapalenie płuc",
-            "Ból głowy": False,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": True,
-            "Duszności": True,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Pulmonolog",
-            "Zalecenia": "Antybiotyki, nawadnianie, odpoczynek"
-        },
-        {
-            "Choroba": "Zapalenie wyrostka",
-            "Ból głowy": False,
-            "Wymioty": True,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": True,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": True,
-            "Specjalista": "Chirurg ogólny",
-            "Zalecenia": "Natychmiastowa pomoc medyczna, operacja"
-        },
-        {
-            "Choroba": "Migrena",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Neurolog",
-            "Zalecenia": "Leki przeciwbólowe, unikanie czynników wywołujących"
-        },
-        {
-            "Choroba": "Infekcja wirusowa",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": False,
-            "Kaszel": True,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Internista",
-            "Zalecenia": "Odpoczynek, nawadnianie, leki objawowe"
-        },
-        {
-            "Choroba": "Choroby autoimmunologiczne",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": True,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": True,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Reumatolog",
-            "Zalecenia": "Leki immunosupresyjne, regularne kontrole"
-        },
-        {
-            "Choroba": "Nowotwory",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": True,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": True,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Onkolog",
-            "Zalecenia": "Diagnostyka, leczenie onkologiczne"
-        },
-        {
-            "Choroba": "Zatrucie pokarmowe",
-            "Ból głowy": True,
-            "Wymioty": True,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": True,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": False,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": True,
-            "Specjalista": "Internista",
-            "Zalecenia": "Nawadnianie, dieta lekkostrawna"
-        },
-        {
-            "Choroba": "Cukrzyca",
-            "Ból głowy": False,
-            "Wymioty": False,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": True,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Diabetolog",
-            "Zalecenia": "Monitorowanie poziomu cukru, dieta, leki"
-        },
-        {
-            "Choroba": "Choroby tarczycy",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Endokrynolog",
-            "Zalecenia": "Badania hormonalne, leczenie hormonalne"
-        },
-        {
-            "Choroba": "Zespół przewlekłego zmęczenia",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": True,
-            "Ból mięśni": True,
-            "Dreszcze": False,
-            "Specjalista": "Internista",
-            "Zalecenia": "Odpoczynek, terapia, zmiana stylu życia"
-        },
-        {
-            "Choroba": "Astma",
-            "Ból głowy": False,
-            "Wymioty": False,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": False,
-            "Ból brzucha": False,
-            "Kaszel": True,
-            "Duszności": True,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Pulmonolog",
-            "Zalecenia": "Leki rozszerzające oskrzela, unikanie alergenów"
-        },
-        {
-            "Choroba": "Wrzody żołądka",
-            "Ból głowy": False,
-            "Wymioty": True,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": True,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Gastroenterolog",
-            "Zalecenia": "Leki zobojętniające, dieta, unikanie stresu"
-        },
-        {
-            "Choroba": "Mononukleoza",
-            "Ból głowy": True,
-            "Wymioty": False,
-            "Gorączka": True,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": False,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": True,
-            "Problemy ze snem": False,
-            "Ból mięśni": True,
-            "Dreszcze": True,
-            "Specjalista": "Internista",
-            "Zalecenia": "Odpoczynek, nawadnianie, leki przeciwbólowe"
-        },
-        {
-            "Choroba": "Zespół jelita drażliwego",
-            "Ból głowy": False,
-            "Wymioty": True,
-            "Gorączka": False,
-            "Ból kości i stawów": False,
-            "Nudności": True,
-            "Ból brzucha": True,
-            "Kaszel": False,
-            "Duszności": False,
-            "Zmęczenie": True,
-            "Utrata wagi": False,
-            "Problemy ze snem": False,
-            "Ból mięśni": False,
-            "Dreszcze": False,
-            "Specjalista": "Gastroenterolog",
-            "Zalecenia": "Dieta, leki przeciwbólowe, terapia psychologiczna"
-        },
-    ]
+    symptoms_table = []
 
     # Lista zwrotów do zakończenia rozmowy
-    end_speech_phrases = [
-        "koniec", "dziękuję", "do widzenia"
-    ]
+    end_speech_phrases = []
 
     # Lista zwrotów do resetowania rozmowy
-    reset_speech_phrases = [
-        "zacznijmy od nowa",
-        "zacznijmy jeszcze raz",
-        "chcę zacząć od nowa",
-        "zacznijmy ponownie",
-        "zrestartujmy rozmowę",
-        "zróbmy to jeszcze raz",
-        "zacznijmy od początku",
-        "chciałbym zacząć od nowa",
-        "rozpocznijmy ponownie",
-        "przeładujmy rozmowę",
-        "zacznijmy wszystko od początku",
-        "zrestartujmy naszą rozmowę",
-        "zacznijmy jeszcze raz od początku",
-        "proszę zacząć od nowa",
-        "proszę rozpocząć ponownie",
-        "zacznijmy od nowa proszę",
-        "zróbmy to od nowa",
-        "zacznijmy naszą rozmowę od nowa",
-        "powtórzmy rozmowę od początku",
-        "chcę zacząć jeszcze raz",
-        "zacznijmy rozmowę jeszcze raz",
-        "restart",
-        "rozpocznij ponownie"
-    ]
-
-    # Lista objawów do odpytania
-    required_symptoms = [
-        "Ból głowy", "Wymioty", "Gorączka", "Ból kości i stawów",
-        "Nudności", "Ból brzucha", "Kaszel", "Duszności",
-        "Zmęczenie", "Utrata wagi", "Problemy ze snem", "Ból mięśni", "Dreszcze"
-    ]
-
-    # Lista synonimów objawów
-    synonyms = {
-        "Ból głowy": [
-            "boli mnie głowa",
-            "głowa mnie boli",
-            "ból głowy",
-            "migrena",
-            "pulsuje mi w głowie",
-            "pulsujący ból głowy",
-            "ścisk w skroniach",
-            "napięciowy ból głowy",
-            "ćmiący ból głowy",
-            "rozpierający ból głowy"
-        ],
-        "Wymioty": [
-            "rzyganie",
-            "zwracam treść pokarmową",
-            "chce mi się wymiotować",
-            "wymiotuję",
-            "wymiotuje",
-            "nudności z wymiotami",
-            "rzucam pawia",
-            "zwymiotowałem",
-            "odruch wymiotny",
-            "wyrzucam z siebie jedzenie",
-            "mdłości z torsjami"
-        ],
-        "Gorączka": [
-            "temperatura 38",
-            "wysoką temperaturę",
-            "wysoką temperature",
-            "wysoka temperatura",
-            "mam ponad 37 stopni",
-            "mam gorączkę",
-            "mam gorączke",
-            "jestem rozpalony",
-            "czuję, że mam podwyższoną temperaturę",
-            "gorączkuję",
-            "mam stan podgorączkowy",
-            "piecze mnie skóra",
-            "czuję gorąco w ciele"
-        ],
-        "Ból kości i stawów": [
-            "łamanie w kościach",
-            "łamie mnie w kościach",
-            "stawy mnie bolą",
-            "przeskakiwanie w stawach",
-            "bóle reumatyczne",
-            "kłujący ból w stawach",
-            "sztywność stawów",
-            "trzeszczenie w stawach",
-            "bóle kostne",
-            "ciągnie mnie w kościach",
-            "ból podczas ruchu"
-        ],
-        "Nudności": [
-            "mdłości",
-            "jest mi niedobrze",
-            "zbiera mi się na wymioty",
-            "czuję się słabo",
-            "ścisnęło mnie w żołądku",
-            "żołądek mi się przewraca",
-            "mam zawroty głowy i mdłości",
-            "odrzuca mnie od jedzenia",
-            "brzydzi mnie zapach jedzenia",
-            "mdli mnie"
-        ],
-        "Ból brzucha": [
-            "boli mnie brzuch",
-            "ból w okolicy żołądka",
-            "kłuje mnie w brzuchu",
-            "skurcze brzucha",
-            "bóle żołądkowe",
-            "ciągnie mnie w żołądku",
-            "czuję ucisk w brzuchu",
-            "rozpierający ból w brzuchu",
-            "piekący ból w żołądku",
-            "ból jelitowy"
-        ],
-        "Kaszel": [
-            "kaszlę",
-            "pokasłuję",
-            "mam suchy kaszel",
-            "kaszel mokry",
-            "drażniący kaszel",
-            "krztuszę się",
-            "odchrząkuję",
-            "napad kaszlu",
-            "kaszel odrywający",
-            "kaszel duszący"
-        ],
-        "Duszności": [
-            "ciężko mi oddychać",
-            "brakuje mi tchu",
-            "łapię powietrze",
-            "nie mogę złapać oddechu",
-            "czuję ucisk w klatce piersiowej",
-            "świszczący oddech",
-            "czuję się przytłoczony",
-            "mam zadyszkę",
-            "krótkie oddechy",
-            "duszę się"
-        ],
-        "Zmęczenie": [
-            "jestem wyczerpany",
-            "brak mi energii",
-            "czuję się słabo",
-            "mam totalny spadek energii",
-            "jestem ospały",
-            "nie mam sił",
-            "padam z nóg",
-            "czuję się wyczerpany psychicznie",
-            "jestem przemęczony",
-            "czuję się bez życia"
-        ],
-        "Utrata wagi": [
-            "schudłem",
-            "chudnę ostatnio",
-            "straciłem na wadze",
-            "ważę mniej",
-            "ubytki masy ciała",
-            "spadek wagi",
-            "zmniejszyłem swoją wagę",
-            "widać po mnie, że schudłem",
-            "zaczynam być chudy",
-            "zmalała mi waga"
-        ],
-        "Problemy ze snem": [
-            "bezsenność",
-            "ciężko mi zasnąć",
-            "nie mogę spać",
-            "budzę się w nocy",
-            "śpię niespokojnie",
-            "mam płytki sen",
-            "przewracam się z boku na bok",
-            "nie mogę się wyspać",
-            "senność w ciągu dnia",
-            "jestem niewyspany"
-        ],
-        "Ból mięśni": [
-            "mięśnie mnie bolą",
-            "zakwasy",
-            "ciągnie mnie w mięśniach",
-            "sztywność mięśni",
-            "mam ból mięśniowy",
-            "nadwyrężenie mięśni",
-            "skurcze mięśni",
-            "piekący ból mięśni",
-            "uczucie zmęczenia mięśni",
-            "mięśnie mi sztywnieją"
-        ],
-        "Dreszcze": [
-            "mam dreszcze",
-            "trzęsie mnie",
-            "zimno mi",
-            "mam gęsią skórkę",
-            "drżę z zimna",
-            "czuję wewnętrzne dreszcze",
-            "jest mi lodowato",
-            "czuję, jakby coś mnie mroziło",
-            "ciągle mi zimno",
-            "mam niekontrolowane drżenie ciała"
-        ]
-    }
-
-    # Wzorce odpowiedzi użytkownika (tak/nie) - kolejność od najbardziej zaawansowanej
-    response_yes_no_pattern = {
-        # Odpowiedzi pozytywne
-        "tak": True,
-        "oczywiście": True,
-        "występują": True,
-        "mają miejsce": True,
-        "potwierdzam": True,
-        "prawda": True,
-        "bez wątpienia": True,
-        "pewnie": True,
-        "zdecydowanie": True,
-        "z całą pewnością": True,
-        "zgadzam się": True,
-        "to prawda": True,
-        "dokładnie": True,
-        "absolutnie": True,
-        "tak jest": True,
-        "na pewno": True,
-        "zdecydowanie tak": True,
-
-        # Odpowiedzi negatywne
-        "zdecydowanie nie": False,
-        "nie": False,
-        "nie, dziękuję": False,
-        "nie występuje": False,
-        "brak": False,
-        "nie ma": False,
-        "nie potwierdzam": False,
-        "absolutnie nie": False,
-        "nie zgadzam się": False,
-        "to nieprawda": False,
-        "niewystępują": False,
-        "nie do końca": False,
-        "nie jestem pewien": None,
-        "nie wiem": None,
-        "trudno powiedzieć": None,
-        "nie jestem pewna": None,
-        "nie jestem przekonany": None,
-    }
+    reset_speech_phrases = []
+
+    # Objawy, o które pyta system
+    required_symptoms = []
+
+    # Synonimy objawów (objaw -> lista fraz)
+    synonyms = {}
+
+    # Wzorce odpowiedzi użytkownika (tak/nie) wraz ze skrótami
+    response_yes_no_pattern = {}
 
     # Słownik odpowiedzi systemu
-    responses = {
-        "reset": [
-            "Rozumiem, tak więc opisz mi jeszcze raz, co Ci dolega.",
-            "W porządku. Możesz jeszcze raz opisać, co Cię trapi?",
-            "Jasne, zatem co Cię konkretnie boli?",
-            "Rozpoczynamy od nowa. Jak się czujesz i co Cię boli?",
-            "OK, opowiedz mi ponownie, co Ci dolega.",
-            "Zaczynamy od początku. Co Cię niepokoi?",
-            "Powiedz mi raz jeszcze, co Ci doskwiera.",
-            "Spróbujmy ponownie. Co Ci dolega?",
-            "Chcę dobrze zrozumieć. Opisz jeszcze raz swoje objawy.",
-            "Przejdźmy przez to od nowa. Jak się dziś czujesz?"
-        ],
-        "start": [
-            "Dzień dobry, co Ci dolega?",
-            "Hej! Co się dzieje? Jak mogę pomóc?",
-            "Hej! Czy mógłbyś powiedzieć co ci dolega?",
-            "Witaj! Co jest nie tak?",
-            "Dzień dobry! opowiedz mi o swoich dolegliwościach",
-            "Cześć! Jakie masz dziś dolegliwości?"
-        ],
-        "end": [
-            "Do widzenia, życzę zdrowia!",
-            "Trzymaj się, mam nadzieję, że czujesz się lepiej.",
-            "Zdrówka, do usłyszenia!",
-            "Dbaj o siebie i wracaj do zdrowia!",
-            "Życzę Ci szybkiego powrotu do zdrowia!",
-            "Do usłyszenia! Wszystkiego dobrego!",
-            "Powodzenia, życzę dużo zdrowia!",
-            "Trzymaj się ciepło, zdrowiej!",
-            "Miłego dnia, dbaj o siebie!",
-            "Cześć i wracaj szybko do formy!"
-        ],
-        "ask_first": [
-            "Czy występują u Ciebie objawy takie jak {symptom}?",
-            "Zastanawiam się, czy dokucza Ci coś takiego jak {symptom}?",
-            "Czy zauważyłeś ostatnio, że masz coś co mogłoby sie objawiać jak {symptom}?",
-            "Mógłbyś powiedzieć, czy symptom taki jak {symptom} wystąpił u ciebie ostatnio?",
-            "a {symptom}?",
-            "Czy zdarza Ci się doświadczać czegoś jak {symptom}?",
-            "Czy może jeden z twoich objawów to {symptom}?",
-        ]
-    }
+    responses = {}
 
     # Lista skrótów
-    additional_yes_no_abbreviations = {
-        "t": True,
-        "n": False,
-        "y": True,
-    }
+    additional_yes_no_abbreviations = {}
 
     # Lista wyrażeń mówiąca o braku innych objawów
-    no_other_symptoms_phrases = [
-        "żadne inne objawy",
-        "nie mam więcej objawów",
-        "nic więcej mnie nie boli",
-        "to wszystkie objawy",
-        "to koniec objawów",
-        "nie występują inne objawy",
-        "to wszystko",
-        "nic innego mi nie dolega",
-        "to już wszystkie objawy",
-        "nie mam innych dolegliwości"
-    ]
-
-    # Integracja dodatkowych skrótów
-    response_yes_no_pattern.update(additional_yes_no_abbreviations)
+    no_other_symptoms_phrases = []
+
+    @classmethod
+    def load(cls, data: dict):
+        """
+        Ustawia dane rozmowy na podstawie słownika bazy wiedzy (np. wczytanego z pliku JSON).
+
+        Args:
+            data (dict): Dane bazy wiedzy z kluczami odpowiadającymi atrybutom klasy.
+        """
+        cls.symptoms_table = data["symptoms_table"]
+        cls.end_speech_phrases = data["end_speech_phrases"]
+        cls.reset_speech_phrases = data["reset_speech_phrases"]
+        cls.required_symptoms = data["required_symptoms"]
+        cls.synonyms = data["synonyms"]
+        cls.responses = data["responses"]
+        cls.additional_yes_no_abbreviations = data["additional_yes_no_abbreviations"]
+        cls.no_other_symptoms_phrases = data["no_other_symptoms_phrases"]
+        # Integracja dodatkowych skrótów
+        cls.response_yes_no_pattern = dict(data["response_yes_no_pattern"])
+        cls.response_yes_no_pattern.update(cls.additional_yes_no_abbreviations)
+
+    @staticmethod
+    def read(path: str) -> dict:
+        """
+        Wczytuje plik JSON bazy wiedzy.
+
+        Args:
+            path (str): Ścieżka do pliku.
+
+        Returns:
+            dict: Dane bazy wiedzy.
+        """
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _intents():
+        """
+        Funkcja pomocnicza: zwraca współdzielony klasyfikator intencji zbudowany z fraz tej klasy.
+
+        Returns:
+            IntentClassifier: Klasyfikator intencji.
+        """
+        # Import lokalny - IntentClassifier sam korzysta z fraz SpeechLibrary
+        from .IntentClassifier import IntentClassifier
+        return IntentClassifier.from_library()
 
     @staticmethod
     def is_reset_command(message: str) -> bool:
@@ -613,9 +103,7 @@ class SpeechLibrary:
         Returns:
             bool: True jeśli jest komendą resetującą, False w przeciwnym razie.
         """
-        message = message.lower()
-        reset = any(phrase in message for phrase in SpeechLibrary.reset_speech_phrases)
-        return reset
+        return SpeechLibrary._intents().classify(message)["reset"]
 
     @staticmethod
     def first_response(user_symptoms: dict, message: str) -> str:
@@ -689,6 +177,23 @@ class SpeechLibrary:
                 f"Zalecany specjalista: {disease['Specjalista']}\n"
                 f"Zalecenia: {disease['Zalecenia']}")
 
+    @staticmethod
+    def approximate_disease(disease: dict) -> str:
+        """
+        Generuje odpowiedź z przybliżonym dopasowaniem choroby, gdy model AI jest niedostępny.
+
+        Args:
+            disease (dict): Dane choroby najbliższej objawom użytkownika.
+
+        Returns:
+            str: Informacja o przybliżonym dopasowaniu, specjalista i zalecenia.
+        """
+        return (f"Nie mogę teraz skorzystać z asystenta AI, więc podaję tylko przybliżone dopasowanie. "
+                f"Twoje objawy najbardziej przypominają: {disease['Choroba']}\n"
+                f"Zalecany specjalista: {disease['Specjalista']}\n"
+                f"Zalecenia: {disease['Zalecenia']}\n"
+                f"Objawy nie pasują dokładnie do żadnej choroby, dlatego skonsultuj się z lekarzem.")
+
     @staticmethod
     def not_find_disease() -> str:
         """
@@ -699,6 +204,20 @@ class SpeechLibrary:
         """
         return "Nie mogę jednoznacznie stwierdzić, co to za choroba."
 
+    @staticmethod
+    def satisfaction_question(repeat=False) -> str:
+        """
+        Generuje pytanie o zadowolenie z diagnozy.
+
+        Args:
+            repeat (bool): Czy pytanie jest powtarzane po niezrozumiałej odpowiedzi. Domyślnie False.
+
+        Returns:
+            str: Pytanie o zadowolenie z diagnozy.
+        """
+        question = "Czy spełniłem twoje oczekiwania?"
+        return f"Czy możesz powtórzyć? {question}" if repeat else question
+
     @staticmethod
     def is_end_of_conversation(message: str) -> bool:
         """
@@ -710,7 +229,7 @@ class SpeechLibrary:
         Returns:
             bool: True, jeśli rozmowa powinna zostać zakończona; w przeciwnym razie False.
         """
-        return any(phrase in message.lower() for phrase in SpeechLibrary.end_speech_phrases)
+        return SpeechLibrary._intents().classify(message)["end"]
 
     @staticmethod
     def reset_conversation(message: str) -> bool:
@@ -723,7 +242,7 @@ class SpeechLibrary:
         Returns:
             bool: True, jeśli użytkownik chce zresetować rozmowę, w przeciwnym razie False.
         """
-        return any(phrase in message.lower() for phrase in SpeechLibrary.reset_speech_phrases)
+        return SpeechLibrary._intents().classify(message)["reset"]
 
     @staticmethod
     def reset_response() -> str:
@@ -750,6 +269,34 @@ class SpeechLibrary:
         """
         return random.choice(SpeechLibrary.responses["end"])
 
+    @staticmethod
+    def ai_error_response() -> str:
+        """
+        Zwraca losowo wybraną odpowiedź, gdy model AI nie przygotował diagnozy.
+        """
+        return random.choice(SpeechLibrary.responses["ai_error"])
+
+    @classmethod
+    def static_phrases(cls) -> list:
+        """
+        Zwraca wszystkie wypowiedzi systemu, które nie zależą od odpowiedzi modelu AI ani od listy
+        objawów użytkownika (powitania, pytania o objawy, opisy chorób), np. do syntezy mowy z wyprzedzeniem.
+
+        Returns:
+            list: Wypowiedzi bez powtórzeń, w stałej kolejności.
+        """
+        phrases = [cls.first_response({}, "").strip(), cls.error(), cls.not_find_disease(),
+                   cls.satisfaction_question(), cls.satisfaction_question(repeat=True), cls.ask_error("objawy")]
+        for name in ("start", "reset", "end", "ai_error"):
+            phrases.extend(cls.responses[name])
+        for symptom in cls.required_symptoms:
+            phrases.extend(template.format(symptom=symptom.lower()) for template in cls.responses["ask_first"])
+            phrases.append(cls.ask_error(symptom))
+        for disease in cls.symptoms_table:
+            phrases.append(cls.find_disease(disease))
+            phrases.append(cls.approximate_disease(disease))
+        return list(dict.fromkeys(phrases))
+
     @staticmethod
     def get_symptom_confirmation_status(message: str) -> bool:
         """
@@ -761,7 +308,7 @@ class SpeechLibrary:
         Returns:
             bool or None: True/False w przypadku odpowiedzi, None jeśli brak rozpoznania.
         """
-        for key, value in SpeechLibrary.response_yes_no_pettern.items():
-            if key in message.lower():
-                return value
-        return None
+        return SpeechLibrary._intents().classify(message)["answer"]
+
+
+SpeechLibrary.load(SpeechLibrary.read(SpeechLibrary.DATA_PATH))
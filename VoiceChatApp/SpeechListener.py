@@ -0,0 +1,136 @@
+import json
+import logging
+import time
+from .DialogGrammar import DialogGrammar
+
+
+class SpeechListener:
+    """
+    Klasa SpeechListener realizuje pętlę rozpoznawania jednej wypowiedzi użytkownika.
+
+    Łączy źródło audio (AudioSource), opcjonalny detektor aktywności głosowej oraz
+    rozpoznawacz wypożyczony z backendu (SpeechBackend). Nie zależy od GUI - wyniki
+    są przekazywane przez funkcje zwrotne, dzięki czemu ten sam potok działa w aplikacji
+    okienkowej oraz w pomiarach wydajności bez interfejsu.
+    """
+
+    def __init__(self, source, backend, vad=None, debug=False):
+        """
+        Inicjalizuje obiekt SpeechListener.
+
+        Args:
+            source (AudioSource): Źródło audio.
+            backend (SpeechBackend): Dostawca rozpoznawaczy mowy.
+            vad (VoiceActivityDetector | None): Detektor aktywności głosowej lub None.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.source = source
+        self.backend = backend
+        self.vad = vad
+        self.speech_end_time = None
+
+    def listen(self, grammar, is_active, on_partial=None, on_text=None, auto_endpoint=False,
+               endpoint_silence_ms=1000) -> tuple:
+        """
+        Rozpoznaje wypowiedź, dopóki `is_active()` zwraca True lub do wykrycia jej końca.
+
+        Args:
+            grammar (str | None): Gramatyka w formacie JSON lub None dla pełnego słownika.
+            is_active (callable): Funkcja zwracająca False, gdy nasłuchiwanie należy przerwać.
+            on_partial (callable | None): Wywoływana ze zmienionym wynikiem częściowym.
+            on_text (callable | None): Wywoływana z dotychczas rozpoznanym tekstem po każdym wyniku końcowym.
+            auto_endpoint (bool): Czy kończyć nasłuchiwanie po wykryciu końca wypowiedzi. Domyślnie False.
+            endpoint_silence_ms (int): Cisza końcowa (ms) kończąca wypowiedź przy włączonym VAD.
+
+        Returns:
+            tuple: (str, bool)
+                - str: Rozpoznany tekst.
+                - bool: True, jeśli nasłuchiwanie zakończyło wykrycie końca wypowiedzi.
+        """
+        self.logger.debug("Wywołanie listen")
+        recognized_text = ""
+        partial_text = ""
+        last_partial_result = None
+        endpoint = False
+        ended = False
+        self.speech_end_time = None
+        # Dźwięk nagrany przed rozpoczęciem nasłuchiwania nie należy do wypowiedzi
+        self.source.clear()
+        if self.vad:
+            self.vad.reset()
+
+        recognizer = self.backend.acquire(grammar)
+        try:
+            while is_active():
+                try:
+                    data = self.source.read()
+                    if self.vad and data:
+                        data = self.vad.process(data)
+                    if data:
+                        if recognizer.AcceptWaveform(data):
+                            text = DialogGrammar.clean(json.loads(recognizer.Result()).get("text", ""))
+                            recognized_text += text + " "
+                            partial_text = ""
+                            endpoint = True
+                            if on_text:
+                                on_text(recognized_text.strip())
+                        else:
+                            partial_result = recognizer.PartialResult()
+                            endpoint = False
+                            # Niezmieniony wynik częściowy nie wymaga parsowania ani odświeżania GUI
+                            if partial_result != last_partial_result:
+                                last_partial_result = partial_result
+                                partial_text = DialogGrammar.clean(json.loads(partial_result).get("partial", ""))
+                                if on_partial:
+                                    on_partial(partial_text)
+
+                    has_text = bool(recognized_text.strip() or partial_text)
+                    if auto_endpoint and self.is_end_of_utterance(has_text, endpoint, endpoint_silence_ms):
+                        text = DialogGrammar.clean(json.loads(recognizer.FinalResult()).get("text", ""))
+                        recognized_text += text + " "
+                        if on_text:
+                            on_text(recognized_text.strip())
+                        self.logger.debug("Wykryto koniec wypowiedzi")
+                        ended = True
+                        break
+                except Exception as e:
+                    self.logger.error(f"Błąd podczas odczytu strumienia: {e}")
+                    break
+        finally:
+            self.backend.release(recognizer)
+
+        if self.vad:
+            self.logger.debug(f"Pominięto {self.vad.skipped_ratio:.0%} audio jako ciszę")
+        return recognized_text.strip(), ended
+
+    def is_end_of_utterance(self, has_text: bool, endpoint: bool, endpoint_silence_ms: int) -> bool:
+        """
+        Sprawdza, czy użytkownik zakończył wypowiedź.
+
+        Przy włączonym VAD wypowiedź kończy cisza dłuższa niż zadany próg.
+        Bez VAD wykorzystywany jest wynik końcowy rozpoznawacza (reguły endpoint z model.conf).
+        Moment zakończenia mowy jest zapisywany do pomiaru opóźnienia odpowiedzi.
+
+        Args:
+            has_text (bool): Czy rozpoznano już jakikolwiek tekst.
+            endpoint (bool): Czy rozpoznawacz zwrócił właśnie wynik końcowy.
+            endpoint_silence_ms (int): Próg ciszy końcowej w milisekundach.
+
+        Returns:
+            bool: True, jeśli wypowiedź należy przetworzyć.
+        """
+        if not has_text:
+            return False
+        if self.vad is None:
+            if endpoint:
+                self.speech_end_time = time.perf_counter()
+            return endpoint
+
+        silence_ms = self.vad.silence_frames * self.vad.frame_ms
+        if silence_ms < endpoint_silence_ms:
+            return False
+        self.speech_end_time = time.perf_counter() - silence_ms / 1000
+        return True
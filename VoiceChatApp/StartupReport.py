@@ -0,0 +1,164 @@
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """
+    Klasa StartupReport zbiera czasy i przyrosty pamięci ładowania komponentów aplikacji.
+
+    Rozróżniane są komponenty ładowane przy starcie oraz komponenty odroczone (np. klient AI),
+    tworzone dopiero przy pierwszym użyciu. Dla komponentu odroczonego raport podaje, ile kosztowało
+    jego utworzenie i kiedy nastąpiło, a jeśli nie został jeszcze utworzony - że start go pominął.
+
+    Pamięć to rozmiar zbioru roboczego procesu (RSS). Komponenty ładowane równolegle w wątkach
+    dzielą ten sam proces, więc ich przyrosty pamięci są przybliżone.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, debug=False):
+        """
+        Inicjalizuje pusty raport; czas startu liczony jest od utworzenia obiektu.
+
+        Args:
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.started_at = time.perf_counter()
+        self.start_memory = self.memory()
+        self.phases = {}
+        self.deferred = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        Zwraca raport współdzielony w obrębie procesu, tworząc go przy pierwszym użyciu.
+
+        Returns:
+            StartupReport: Współdzielony raport.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @contextmanager
+    def measure(self, name: str, deferred=False):
+        """
+        Mierzy czas i przyrost pamięci bloku kodu ładującego komponent.
+
+        Args:
+            name (str): Nazwa komponentu.
+            deferred (bool): Czy komponent jest tworzony dopiero przy pierwszym użyciu. Domyślnie False.
+        """
+        memory = self.memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            after = self.memory()
+            entry = {
+                "seconds": end - start,
+                "memory": after - memory if memory is not None and after is not None else None,
+                "after": end - self.started_at,
+            }
+            with self._lock:
+                (self.deferred if deferred else self.phases)[name] = entry
+            self.logger.debug(f"Załadowano '{name}' w {entry['seconds'] * 1000:.0f} ms")
+
+    def expect(self, name: str):
+        """
+        Oznacza komponent jako odroczony, aby raport wykazał go również wtedy, gdy nie został utworzony.
+
+        Args:
+            name (str): Nazwa komponentu.
+        """
+        with self._lock:
+            self.deferred.setdefault(name, None)
+
+    @staticmethod
+    def memory():
+        """
+        Zwraca bieżący rozmiar zbioru roboczego procesu (RSS).
+
+        Returns:
+            int | None: Liczba bajtów lub None, jeśli system nie udostępnia tej informacji.
+        """
+        try:
+            if sys.platform.startswith("linux"):
+                with open("/proc/self/statm") as file:
+                    return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            if sys.platform == "win32":
+                import ctypes
+                from ctypes import wintypes
+
+                class Counters(ctypes.Structure):
+                    _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                        (field, ctypes.c_size_t) for field in (
+                            "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                            "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                            "PagefileUsage", "PeakPagefileUsage",
+                        )
+                    ]
+
+                counters = Counters()
+                counters.cb = ctypes.sizeof(Counters)
+                process = ctypes.windll.kernel32.GetCurrentProcess()
+                if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                    return counters.WorkingSetSize
+        except (OSError, ValueError, AttributeError):
+            pass
+        return None
+
+    def as_dict(self) -> dict:
+        """
+        Zwraca dane raportu.
+
+        Returns:
+            dict: Czas od startu, przyrost pamięci od startu oraz wpisy komponentów ("phases")
+                  i komponentów odroczonych ("deferred", None dla jeszcze nieutworzonych).
+        """
+        memory = self.memory()
+        with self._lock:
+            return {
+                "elapsed": time.perf_counter() - self.started_at,
+                "memory": memory - self.start_memory if memory is not None and self.start_memory is not None
+                else None,
+                "phases": dict(self.phases),
+                "deferred": dict(self.deferred),
+            }
+
+    def summary(self) -> str:
+        """
+        Zwraca czytelne podsumowanie raportu.
+
+        Returns:
+            str: Wiersze z czasem i pamięcią każdego komponentu.
+        """
+        report = self.as_dict()
+        lines = [f"Start: {report['elapsed'] * 1000:.0f} ms, pamięć {self._megabytes(report['memory'])}"]
+        for name, entry in report["phases"].items():
+            lines.append(f"  {name}: {entry['seconds'] * 1000:.0f} ms, {self._megabytes(entry['memory'])}")
+        for name, entry in report["deferred"].items():
+            if entry is None:
+                lines.append(f"  {name}: odroczony, nie utworzono (pominięty przy starcie)")
+            else:
+                lines.append(f"  {name}: odroczony, utworzony po {entry['after']:.1f} s - "
+                             f"{entry['seconds'] * 1000:.0f} ms, {self._megabytes(entry['memory'])}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _megabytes(value) -> str:
+        """
+        Funkcja pomocnicza: formatuje liczbę bajtów jako megabajty.
+        """
+        return "? MB" if value is None else f"{value / 2 ** 20:+.1f} MB"
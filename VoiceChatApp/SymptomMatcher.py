@@ -0,0 +1,349 @@
+import re
+from collections import deque
+from .SpeechLibrary import SpeechLibrary
+from .TextNormalizer import TextNormalizer
+
+
+class AhoCorasick:
+    """
+    Klasa AhoCorasick implementuje automat wyszukujący wiele fraz jednocześnie.
+
+    Automat jest budowany raz, a wyszukiwanie wszystkich wystąpień wszystkich fraz
+    (również nakładających się) wymaga jednego przejścia po tekście, niezależnie od liczby fraz.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje pusty automat.
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self._built = False
+
+    def add(self, phrase: str, payload):
+        """
+        Dodaje frazę do automatu.
+
+        Args:
+            phrase (str): Szukana fraza.
+            payload (object): Wartość zwracana przy znalezieniu frazy.
+        """
+        node = 0
+        for char in phrase:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append(payload)
+        self._built = False
+
+    def build(self):
+        """
+        Wyznacza przejścia awaryjne (BFS) i scala wyjścia stanów z wyjściami ich sufiksów.
+        """
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self._built = True
+
+    def search(self, text: str):
+        """
+        Wyszukuje wszystkie wystąpienia fraz w tekście.
+
+        Args:
+            text (str): Przeszukiwany tekst.
+
+        Yields:
+            tuple: (int, object) - indeks końca wystąpienia i wartość przypisana frazie.
+        """
+        if not self._built:
+            self.build()
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for payload in output[node]:
+                yield index, payload
+
+    def to_state(self, encode) -> dict:
+        """
+        Zwraca zbudowany automat w postaci zgodnej z JSON (listy i słowniki).
+
+        Args:
+            encode (callable): Zamienia wartość przypisaną frazie na postać zgodną z JSON.
+
+        Returns:
+            dict: Przejścia, przejścia awaryjne i wyjścia stanów.
+        """
+        if not self._built:
+            self.build()
+        return {
+            "goto": self.goto,
+            "fail": self.fail,
+            "output": [[encode(payload) for payload in payloads] for payloads in self.output],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, decode):
+        """
+        Odtwarza zbudowany automat z postaci zwróconej przez to_state, bez ponownej budowy.
+
+        Args:
+            state (dict): Stan automatu.
+            decode (callable): Odwrotność funkcji `encode` przekazanej do to_state.
+
+        Returns:
+            AhoCorasick: Automat gotowy do wyszukiwania.
+
+        Raises:
+            ValueError: Jeśli stan jest niespójny.
+        """
+        automaton = cls()
+        automaton.goto = state["goto"]
+        automaton.fail = state["fail"]
+        automaton.output = [[decode(payload) for payload in payloads] for payloads in state["output"]]
+        if not len(automaton.goto) == len(automaton.fail) == len(automaton.output):
+            raise ValueError("Niespójny stan automatu Aho-Corasick")
+        automaton._built = True
+        return automaton
+
+
+class SymptomMatcher:
+    """
+    Klasa SymptomMatcher wyszukuje objawy i frazy o braku innych objawów w wypowiedzi użytkownika.
+
+    Nazwy objawów, ich synonimy oraz frazy z SpeechLibrary.no_other_symptoms_phrases są
+    kompilowane raz do jednego automatu Aho-Corasick, dzięki czemu analiza wypowiedzi
+    wymaga jednego przejścia po tekście, a jej koszt nie rośnie wraz z liczbą synonimów.
+
+    Frazy i wypowiedzi są porównywane po normalizacji (TextNormalizer) i wyłącznie
+    w granicach całych słów, więc formy fleksyjne jednej frazy nie wymagają osobnych wpisów.
+
+    Objaw poprzedzony przeczeniem ("nie", "bez", "ani") w tym samym fragmencie wypowiedzi (bez przecinka
+    pomiędzy), w odległości najwyżej NEGATION_WINDOW słów, jest uznawany za zaprzeczony ("nie mam gorączki"),
+    a nie obecny. Przeczenie obejmuje też kolejne pozycje wyliczenia ("nie mam gorączki, kaszlu ani bólu
+    głowy") aż do spójnika przeciwstawnego, końca zdania lub pozycji z własnym orzeczeniem ("boli mnie głowa").
+    Przeczenie będące częścią dopasowanej frazy ("nie mogę spać") niczego nie neguje.
+    """
+
+    # Etykieta frazy oznaczającej brak innych objawów
+    NO_OTHER_SYMPTOMS = None
+
+    # Słowa przeczenia (po normalizacji)
+    NEGATIONS = ("nie", "bez", "ani")
+
+    # Maksymalna liczba słów między przeczeniem a objawem ("nie mam wysokiej gorączki")
+    NEGATION_WINDOW = 3
+
+    # Słowa łączące pozycje wyliczenia - przeczenie przechodzi na kolejną pozycję
+    LIST_JOINERS = ("i", "ani", "oraz", "lub", "czy", "albo")
+
+    # Słowa orzeczenia - pozycja, która je zawiera ("mam kaszel", "boli mnie głowa"), nie kontynuuje wyliczenia
+    PREDICATE_WORDS = ("mam", "mnie", "mi", "się", "jestem", "czuję")
+
+    # Spójniki przeciwstawne - podobnie jak koniec zdania zamykają zasięg przeczenia
+    CONTRASTS = ("a", "ale", "lecz", "natomiast")
+
+    # Koniec zdania, granica pozycji wyliczenia (przeczenie sąsiadujące z objawem działa tylko w obrębie
+    # jednej pozycji) i słowo - słowa są dzielone tak samo jak w TextNormalizer.tokens
+    _SEGMENT = re.compile(r"(?P<clause>[.;!?]+)|(?P<item>[,:])|\w+")
+
+    _default = None
+
+    def __init__(self, required_symptoms, synonyms, no_other_symptoms_phrases):
+        """
+        Kompiluje automat z nazw objawów, synonimów i fraz o braku innych objawów.
+
+        Args:
+            required_symptoms (list): Objawy, o które pyta system.
+            synonyms (dict): Słownik objaw -> lista synonimów.
+            no_other_symptoms_phrases (list): Frazy oznaczające brak innych objawów.
+        """
+        self.required_symptoms = list(required_symptoms)
+        self._joiners = set(TextNormalizer.tokens(" ".join(self.LIST_JOINERS)))
+        self._predicates = set(TextNormalizer.tokens(" ".join(self.PREDICATE_WORDS)))
+        self._contrasts = set(TextNormalizer.tokens(" ".join(self.CONTRASTS)))
+        self.automaton = AhoCorasick()
+        phrases = {}
+        for symptom in self.required_symptoms:
+            phrases.setdefault(self._key(symptom), set()).add(symptom)
+            for key, syn_list in synonyms.items():
+                if key.lower() == symptom.lower():
+                    for phrase in syn_list:
+                        phrases.setdefault(self._key(phrase), set()).add(symptom)
+        for phrase in no_other_symptoms_phrases:
+            phrases.setdefault(self._key(phrase), set()).add(self.NO_OTHER_SYMPTOMS)
+
+        # Jedna fraza może wskazywać na kilka objawów (np. "czuję się słabo")
+        for phrase, labels in phrases.items():
+            self.automaton.add(phrase, (frozenset(labels), len(phrase), phrase.count(" ") - 1))
+        self.automaton.build()
+        self.phrase_count = len(phrases)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """
+        Funkcja pomocnicza: zwraca znormalizowany tekst otoczony spacjami, aby dopasowania
+        obejmowały wyłącznie całe słowa.
+
+        Args:
+            text (str): Fraza lub wypowiedź.
+
+        Returns:
+            str: Postać używana przez automat.
+        """
+        return f" {TextNormalizer.normalize(text)} "
+
+    def to_state(self) -> dict:
+        """
+        Zwraca skompilowany matcher w postaci zgodnej z JSON (do zapisu w pamięci podręcznej bazy wiedzy).
+
+        Returns:
+            dict: Objawy i stan automatu.
+        """
+        return {
+            "required_symptoms": self.required_symptoms,
+            "phrase_count": self.phrase_count,
+            "automaton": self.automaton.to_state(
+                lambda payload: [sorted(payload[0], key=str), payload[1], payload[2]]
+            ),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        """
+        Odtwarza matcher z postaci zwróconej przez to_state, bez ponownej kompilacji automatu.
+
+        Args:
+            state (dict): Stan matchera.
+
+        Returns:
+            SymptomMatcher: Odtworzony matcher.
+        """
+        matcher = cls([], {}, [])
+        matcher.required_symptoms = list(state["required_symptoms"])
+        matcher.phrase_count = state["phrase_count"]
+        matcher.automaton = AhoCorasick.from_state(
+            state["automaton"], lambda payload: (frozenset(payload[0]), payload[1], payload[2])
+        )
+        return matcher
+
+    @classmethod
+    def from_library(cls):
+        """
+        Zwraca matcher zbudowany z danych SpeechLibrary, kompilując go tylko przy pierwszym wywołaniu.
+
+        Returns:
+            SymptomMatcher: Współdzielony matcher.
+        """
+        if cls._default is None:
+            cls._default = cls(
+                SpeechLibrary.required_symptoms,
+                SpeechLibrary.synonyms,
+                SpeechLibrary.no_other_symptoms_phrases
+            )
+        return cls._default
+
+    def match(self, text: str) -> tuple:
+        """
+        Wyszukuje objawy w wypowiedzi użytkownika.
+
+        Args:
+            text (str): Wypowiedź użytkownika.
+
+        Returns:
+            tuple: (set, bool)
+                - set: Nazwy wykrytych objawów (bez zaprzeczonych).
+                - bool: True, jeśli wypowiedź zawiera frazę o braku innych objawów.
+        """
+        found, _, no_other = self.scan(text)
+        return found, no_other
+
+    def scan(self, text: str, spans=()) -> tuple:
+        """
+        Wyszukuje objawy w wypowiedzi użytkownika, rozróżniając objawy zaprzeczone.
+
+        Args:
+            text (str): Wypowiedź użytkownika.
+            spans (iterable): Dodatkowe dopasowania (pierwsze słowo, słowo za ostatnim, objaw) znalezione
+                w inny sposób, np. przez FuzzyPhraseIndex.match, oceniane tymi samymi regułami przeczenia.
+                Słowa są numerowane jak w TextNormalizer.tokens(text). Domyślnie brak.
+
+        Returns:
+            tuple: (set, set, bool)
+                - set: Nazwy wykrytych objawów.
+                - set: Nazwy objawów zaprzeczonych (np. "nie mam gorączki"), nieobecne w pierwszym zbiorze.
+                - bool: True, jeśli wypowiedź zawiera frazę o braku innych objawów.
+        """
+        # Słowa wypowiedzi wraz z numerem zdania i pozycji wyliczenia, do których należą
+        words, clauses, items = [], [], []
+        clause = item = 0
+        for segment in self._SEGMENT.finditer(text.lower()):
+            if segment.group("clause"):
+                clause, item = clause + 1, item + 1
+            elif segment.group("item"):
+                item += 1
+            else:
+                word = TextNormalizer.lemma(segment.group())
+                if word in self._contrasts:
+                    clause, item = clause + 1, item + 1
+                words.append(word)
+                clauses.append(clause)
+                items.append(item)
+
+        key = f" {' '.join(words)} "
+        matches = []
+        for end, (labels, length, count) in self.automaton.search(key):
+            # Indeks pierwszego słowa frazy - liczba spacji przed nią (klucz zaczyna się spacją)
+            first = key.count(" ", 0, end - length + 2) - 1
+            if clauses[first] == clauses[first + count - 1]:
+                matches.append((first, first + count, labels))
+        matches.extend((first, last, frozenset([label])) for first, last, label in spans if first < last)
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        covered = {index for first, last, _ in matches for index in range(first, last)}
+        negations = [index for index, word in enumerate(words) if word in self.NEGATIONS and index not in covered]
+
+        found = set()
+        negated = set()
+        # Koniec poprzedniej pozycji wyliczenia i to, czy była zaprzeczona
+        previous_end, previous_negated = 0, False
+        for first, last, labels in matches:
+            is_negated = any(first - self.NEGATION_WINDOW <= index < first and items[index] == items[first]
+                             for index in negations)
+            if first < previous_end:
+                # Fraza zawarta w poprzedniej ("ból głowy" w "pulsujący ból głowy") dzieli jej przeczenie
+                is_negated = is_negated or previous_negated
+            elif (previous_negated and clauses[previous_end - 1] == clauses[first]
+                    and all(word in self._joiners for word in words[previous_end:first])
+                    and not self._predicates.intersection(words[first:last])):
+                is_negated = True
+            if is_negated:
+                negated |= labels
+            else:
+                found |= labels
+            if last >= previous_end:
+                previous_end, previous_negated = last, is_negated
+
+        no_other = self.NO_OTHER_SYMPTOMS in found or self.NO_OTHER_SYMPTOMS in negated
+        found.discard(self.NO_OTHER_SYMPTOMS)
+        negated.discard(self.NO_OTHER_SYMPTOMS)
+        return found, negated - found, no_other
@@ -0,0 +1,116 @@
+import re
+from functools import lru_cache
+
+
+class TextNormalizer:
+    """
+    Klasa TextNormalizer sprowadza polskie wypowiedzi do postaci znormalizowanej,
+    w której różne formy fleksyjne i zapisy bez polskich znaków są sobie równe.
+
+    Normalizacja obejmuje:
+
+    - Zamianę na małe litery i usunięcie interpunkcji.
+
+    - Usunięcie polskich znaków diakrytycznych (np. "gorączkę" -> "goraczke").
+
+    - Lekki stemming: odcięcie najdłuższej pasującej końcówki fleksyjnej, o ile pozostały
+      temat ma co najmniej `MIN_STEM` znaków (np. "goraczke" -> "goraczk").
+
+    Wynik normalizacji pojedynczego słowa jest zapamiętywany (lru_cache), a słownictwo
+    wypowiedzi jest niewielkie, więc koszt normalizacji kolejnej wypowiedzi sprowadza się
+    głównie do podziału na słowa. Znormalizowana jest zarówno baza wiedzy (raz przy jej budowie),
+    jak i każda wypowiedź użytkownika.
+    """
+
+    _FOLD = str.maketrans("ąćęłńóśźż", "acelnoszz")
+    _TOKEN = re.compile(r"\w+")
+
+    # Końcówki po usunięciu znaków diakrytycznych, sprawdzane od najdłuższej
+    SUFFIXES = sorted({
+        "owie", "owi", "ami", "ach", "ego", "emu", "ymi", "imi", "ych", "ich", "iej", "uje", "uja",
+        "owa", "owe", "owy", "ow", "om", "em", "ie", "ia", "ej", "a", "e", "i", "o", "u", "y",
+    }, key=len, reverse=True)
+
+    MIN_STEM = 3
+
+    @classmethod
+    def fold(cls, text: str) -> str:
+        """
+        Zamienia tekst na małe litery i usuwa polskie znaki diakrytyczne.
+
+        Args:
+            text (str): Tekst źródłowy.
+
+        Returns:
+            str: Tekst bez polskich znaków.
+        """
+        return text.lower().translate(cls._FOLD)
+
+    @staticmethod
+    @lru_cache(maxsize=16384)
+    def lemma(token: str) -> str:
+        """
+        Zwraca uproszczony temat słowa (bez znaków diakrytycznych i końcówki fleksyjnej).
+
+        Args:
+            token (str): Pojedyncze słowo.
+
+        Returns:
+            str: Znormalizowana postać słowa.
+        """
+        token = TextNormalizer.fold(token)
+        for suffix in TextNormalizer.SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= TextNormalizer.MIN_STEM:
+                return token[:-len(suffix)]
+        return token
+
+    @classmethod
+    def tokens(cls, text: str) -> list:
+        """
+        Dzieli tekst na słowa i sprowadza każde z nich do znormalizowanej postaci.
+
+        Args:
+            text (str): Tekst źródłowy.
+
+        Returns:
+            list: Znormalizowane słowa.
+        """
+        lemma = cls.lemma
+        return [lemma(token) for token in cls._TOKEN.findall(text.lower())]
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def normalize(cls, text: str) -> str:
+        """
+        Zwraca znormalizowaną wypowiedź jako słowa rozdzielone pojedynczą spacją.
+
+        Wynik jest zapamiętywany, dzięki czemu kilka mechanizmów dopasowujących analizujących
+        tę samą wypowiedź w jednej turze normalizuje ją tylko raz.
+
+        Args:
+            text (str): Tekst źródłowy.
+
+        Returns:
+            str: Znormalizowany tekst.
+        """
+        return " ".join(cls.tokens(text))
+
+    @classmethod
+    def unique(cls, phrases) -> list:
+        """
+        Usuwa frazy, które po normalizacji są równe wcześniejszym frazom listy.
+
+        Args:
+            phrases (iterable): Frazy źródłowe.
+
+        Returns:
+            list: Frazy bez duplikatów fleksyjnych, w pierwotnej kolejności.
+        """
+        seen = set()
+        result = []
+        for phrase in phrases:
+            key = cls.normalize(phrase)
+            if key not in seen:
+                seen.add(key)
+                result.append(phrase)
+        return result
@@ -0,0 +1,249 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from .CacheDirectory import CacheDirectory
+
+
+class TtsCache:
+    """
+    Klasa TtsCache przechowuje zsyntezowaną mowę (MP3) dla już wypowiedzianych tekstów.
+
+    Kluczem jest skrót SHA-256 tekstu, języka i głosu, więc ta sama wypowiedź (powitanie,
+    pytanie o objaw, opis choroby) jest odtwarzana bez zapytania sieciowego do gTTS.
+    Pamięć podręczna ma dwa poziomy:
+
+    - Pamięć operacyjna (LRU) - ograniczona liczbą wpisów `memory_size`.
+
+    - Katalog na dysku (plik `<klucz>.mp3` na wpis) - zachowuje nagrania między uruchomieniami
+      i może zostać wypełniony z wyprzedzeniem skryptem build_tts_cache.py.
+
+    Po przekroczeniu `max_disk_bytes` z dysku usuwane są najdawniej używane nagrania.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, memory_size=256, max_disk_bytes=200 * 2 ** 20, debug=False):
+        """
+        Inicjalizuje pamięć podręczną mowy.
+
+        Args:
+            path (str | None): Katalog nagrań lub None, aby przechowywać je tylko w pamięci.
+                Katalog jest pomijany, jeśli nie należy wyłącznie do bieżącego użytkownika.
+            memory_size (int): Liczba nagrań przechowywanych w pamięci operacyjnej. Domyślnie 256.
+            max_disk_bytes (int): Maksymalny łączny rozmiar nagrań na dysku w bajtach. Domyślnie 200 MB.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.path = path
+        self.memory_size = memory_size
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            try:
+                CacheDirectory.ensure(path)
+            except OSError as e:
+                self.logger.warning(f"Pamięć podręczna mowy działa tylko w pamięci operacyjnej: {e}")
+                self.path = None
+
+    @classmethod
+    def shared(cls):
+        """
+        Zwraca pamięć podręczną współdzieloną w obrębie procesu, w katalogu domyślnym (default_path).
+
+        Returns:
+            TtsCache: Współdzielona pamięć podręczna mowy.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(cls.default_path())
+            return cls._shared
+
+    @staticmethod
+    def default_path() -> str:
+        """
+        Zwraca domyślny katalog nagrań (obok skompilowanej bazy wiedzy, w katalogu pamięci podręcznej użytkownika).
+
+        Returns:
+            str: Ścieżka katalogu.
+        """
+        return os.path.join(CacheDirectory.default(), "tts")
+
+    @staticmethod
+    def key(text: str, lang: str, voice: str) -> str:
+        """
+        Tworzy klucz nagrania.
+
+        Args:
+            text (str): Wypowiadany tekst.
+            lang (str): Kod języka syntezy.
+            voice (str): Wariant głosu (domena gTTS, np. "com").
+
+        Returns:
+            str: Skrót SHA-256 (szesnastkowo).
+        """
+        return hashlib.sha256(f"{text}|{lang}|{voice}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str, lang: str, voice: str):
+        """
+        Zwraca zapamiętane nagranie.
+
+        Args:
+            text (str): Wypowiadany tekst.
+            lang (str): Kod języka syntezy.
+            voice (str): Wariant głosu.
+
+        Returns:
+            bytes | None: Nagranie MP3 lub None, jeśli go brak.
+        """
+        key = self.key(text, lang, voice)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+            if self.path:
+                file_path = self._file(key)
+                try:
+                    with open(file_path, "rb") as file:
+                        # Podłożone nagranie zostałoby odtworzone pacjentowi zamiast wypowiedzi
+                        if not CacheDirectory.is_trusted(file_path):
+                            raise PermissionError(f"Nagranie {file_path} nie należy wyłącznie "
+                                                  f"do bieżącego użytkownika")
+                        audio = file.read()
+                    # Czas modyfikacji pliku wyznacza kolejność usuwania najdawniej używanych
+                    os.utime(file_path)
+                except FileNotFoundError:
+                    audio = None
+                except OSError as e:
+                    # Pamięć podręczna nie może przerwać wypowiedzi - brak wpisu oznacza syntezę
+                    self.logger.warning(f"Błąd odczytu pamięci podręcznej mowy: {e}")
+                    audio = None
+                if audio:
+                    self._remember(key, audio)
+                    self.disk_hits += 1
+                    return audio
+
+            self.misses += 1
+            return None
+
+    def contains(self, text: str, lang: str, voice: str) -> bool:
+        """
+        Sprawdza, czy nagranie jest zapamiętane, bez aktualizowania statystyk trafień i kolejności LRU.
+
+        Args:
+            text (str): Wypowiadany tekst.
+            lang (str): Kod języka syntezy.
+            voice (str): Wariant głosu.
+
+        Returns:
+            bool: True, jeśli nagranie jest w pamięci operacyjnej lub na dysku.
+        """
+        key = self.key(text, lang, voice)
+        with self._lock:
+            return key in self._memory or bool(self.path) and os.path.exists(self._file(key))
+
+    def put(self, text: str, lang: str, voice: str, audio: bytes):
+        """
+        Zapamiętuje nagranie.
+
+        Args:
+            text (str): Wypowiadany tekst.
+            lang (str): Kod języka syntezy.
+            voice (str): Wariant głosu.
+            audio (bytes): Nagranie MP3.
+        """
+        key = self.key(text, lang, voice)
+        with self._lock:
+            self._remember(key, audio)
+            if not self.path:
+                return
+            try:
+                # Zapis atomowy - inny proces nie odczyta niepełnego nagrania
+                with tempfile.NamedTemporaryFile("wb", dir=self.path, suffix=".tmp", delete=False) as file:
+                    file.write(audio)
+                os.replace(file.name, self._file(key))
+                self._writes += 1
+                # Sprzątanie co pewną liczbę zapisów, aby nie obciążać każdego z nich
+                if self._writes % 100 == 0:
+                    self._evict()
+            except OSError as e:
+                self.logger.warning(f"Błąd zapisu pamięci podręcznej mowy: {e}")
+
+    def _file(self, key: str) -> str:
+        """
+        Funkcja pomocnicza: zwraca ścieżkę pliku nagrania.
+        """
+        return os.path.join(self.path, f"{key}.mp3")
+
+    def _remember(self, key: str, audio: bytes):
+        """
+        Funkcja pomocnicza: zapisuje nagranie w pamięci operacyjnej, usuwając najdawniej używane.
+        """
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """
+        Funkcja pomocnicza: usuwa z dysku najdawniej używane nagrania ponad limit `max_disk_bytes`.
+        """
+        entries = []
+        with os.scandir(self.path) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        Usuwa z dysku najdawniej używane nagrania ponad limit `max_disk_bytes`.
+        """
+        with self._lock:
+            if self.path:
+                try:
+                    self._evict()
+                except OSError as e:
+                    self.logger.warning(f"Błąd sprzątania pamięci podręcznej mowy: {e}")
+
+    def stats(self) -> dict:
+        """
+        Zwraca statystyki trafień.
+
+        Returns:
+            dict: Liczba trafień w pamięci, na dysku, chybień, odsetek trafień, liczba nagrań w pamięci
+                  i ich łączny rozmiar w bajtach.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": sum(len(audio) for audio in self._memory.values()),
+            }
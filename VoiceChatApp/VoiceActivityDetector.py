@@ -0,0 +1,153 @@
+from collections import deque
+import logging
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """
+    Klasa VoiceActivityDetector odfiltrowuje fragmenty ciszy przed przekazaniem audio do rozpoznawania mowy.
+
+    Decyzja mowa/cisza jest podejmowana dla ramek o stałej długości na podstawie energii sygnału
+    oraz liczby przejść przez zero, liczonych wektorowo (NumPy) dla całej porcji naraz.
+
+    Funkcjonalności:
+
+    - Adaptacyjny poziom szumu tła: niski percentyl energii ramek z ostatnich sekund (również ramek
+      mowy, bo w głośnym pomieszczeniu żadna ramka nie musi zostać uznana za ciszę). Poziom jest
+      zachowywany między wypowiedziami.
+
+    - Bufor pre-roll, dzięki któremu początek słowa nie zostaje ucięty.
+
+    - Podtrzymanie (hangover) po zakończeniu mowy, aby rozpoznawanie otrzymało krótką ciszę końcową.
+
+    - Statystyka odsetka pominiętego audio.
+    """
+
+    # Percentyl energii ramek przyjmowany jako poziom szumu tła
+    NOISE_PERCENTILE = 10
+    # Dolne ograniczenie poziomu szumu - cyfrowa cisza nie może obniżyć progu mowy do zera
+    MIN_NOISE_DB = -50.0
+
+    def __init__(self, rate=16000, frame_ms=20, threshold_db=10.0, zcr_threshold=0.25,
+                 pre_roll_ms=300, hangover_ms=400, noise_window_ms=3000, debug=False):
+        """
+        Inicjalizuje detektor aktywności głosowej.
+
+        Args:
+            rate (int): Częstotliwość próbkowania w Hz. Domyślnie 16000.
+            frame_ms (int): Długość ramki analizy w milisekundach. Domyślnie 20.
+            threshold_db (float): Nadwyżka energii ponad poziom szumu (dB) uznawana za mowę. Domyślnie 10.
+            zcr_threshold (float): Odsetek przejść przez zero, powyżej którego słabsza ramka
+                (np. głoska szumowa) również jest traktowana jako mowa. Domyślnie 0.25.
+            pre_roll_ms (int): Długość ciszy poprzedzającej mowę, która jest zachowywana. Domyślnie 300.
+            hangover_ms (int): Czas przekazywania ciszy po zakończeniu mowy. Domyślnie 400.
+            noise_window_ms (int): Okres, z którego szacowany jest poziom szumu tła. Domyślnie 3000.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.frame_len = rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.pre_roll_frames = pre_roll_ms // frame_ms
+        self.hangover_frames = hangover_ms // frame_ms
+
+        # Energia ostatnich ramek - w przerwach między słowami najcichsze z nich to szum tła
+        self._energies = deque(maxlen=max(1, noise_window_ms // frame_ms))
+        self.noise_db = self.MIN_NOISE_DB
+        self.total_frames = 0
+        self.skipped_frames = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Przywraca stan początkowy detektora przed nową wypowiedzią.
+        Poziom szumu tła i statystyki pominiętego audio są zachowywane.
+        """
+        self._remainder = b""
+        self._pre_roll = deque(maxlen=self.pre_roll_frames)
+        self._hangover = 0
+        self.in_speech = False
+        self.silence_frames = 0
+
+    @property
+    def skipped_ratio(self) -> float:
+        """
+        Zwraca odsetek ramek audio, które nie zostały przekazane do rozpoznawania mowy.
+
+        Returns:
+            float: Wartość z przedziału 0-1.
+        """
+        if self.total_frames == 0:
+            return 0.0
+        return self.skipped_frames / self.total_frames
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Klasyfikuje ramki jako mowę lub ciszę.
+
+        Args:
+            frames (np.ndarray): Macierz próbek int16 o wymiarach (liczba ramek, długość ramki).
+
+        Returns:
+            np.ndarray: Wektor bool - True dla ramek zawierających mowę.
+        """
+        samples = frames.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(samples * samples, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_len - 1)
+
+        # Poziom szumu jest szacowany ze wszystkich ramek, łącznie z bieżącą porcją - pierwsze
+        # 250 ms audio wyznacza go od razu, a nie dopiero po wykryciu ciszy
+        self._energies.extend(energy_db.tolist())
+        self.noise_db = max(self.MIN_NOISE_DB, float(np.percentile(self._energies, self.NOISE_PERCENTILE)))
+
+        margin = energy_db - self.noise_db
+        return (margin > self.threshold_db) | ((margin > self.threshold_db / 2) & (zcr > self.zcr_threshold))
+
+    def process(self, data: bytes) -> bytes:
+        """
+        Przetwarza porcję audio i zwraca tylko fragmenty, które należy przekazać do rozpoznawania mowy.
+
+        Args:
+            data (bytes): Porcja audio w formacie 16-bit PCM mono.
+
+        Returns:
+            bytes: Audio zawierające mowę wraz z pre-roll i podtrzymaniem (może być puste).
+        """
+        data = self._remainder + data
+        frame_bytes = self.frame_len * 2
+        count = len(data) // frame_bytes
+        self._remainder = data[count * frame_bytes:]
+        if count == 0:
+            return b""
+
+        frames = np.frombuffer(data, dtype=np.int16, count=count * self.frame_len).reshape(count, self.frame_len)
+        speech = self.classify(frames)
+
+        output = []
+        for index, is_speech in enumerate(speech):
+            frame = data[index * frame_bytes:(index + 1) * frame_bytes]
+            if is_speech:
+                if not self.in_speech:
+                    output.extend(self._pre_roll)
+                    self._pre_roll.clear()
+                self.in_speech = True
+                self._hangover = self.hangover_frames
+                self.silence_frames = 0
+                output.append(frame)
+            elif self._hangover > 0:
+                self._hangover -= 1
+                self.silence_frames += 1
+                output.append(frame)
+            else:
+                self.in_speech = False
+                self.silence_frames += 1
+                if len(self._pre_roll) == self._pre_roll.maxlen:
+                    self.skipped_frames += 1
+                self._pre_roll.append(frame)
+
+        self.total_frames += count
+        return b"".join(output)
@@ -1,12 +1,16 @@
 from .MedicalChat import MedicalChat
-from vosk import Model, KaldiRecognizer
-import pyaudio
-import json
 import threading
 import logging
+import time
 from .ChatGUI import ChatGUI
 from .SoundEngine import SoundEngine
 from .SpeechLibrary import SpeechLibrary
+from .VoiceActivityDetector import VoiceActivityDetector
+from .DialogGrammar import DialogGrammar
+from .KnowledgeBase import KnowledgeBase
+from .SpeechListener import SpeechListener
+from .IntentClassifier import IntentClassifier
+from .StartupReport import StartupReport
 import tkinter as tk
 
 
@@ -18,38 +22,187 @@ class VoiceChatApp:
     oraz integracją z modułem medycznym.
     """
 
-    def __init__(self, debug=False):
+    # Minimalna cisza po wypowiedzi (ms) kończąca turę w trybie bez użycia rąk, osobno dla stanów rozmowy
+    DEFAULT_ENDPOINT_SILENCE = {
+        "monolog": 1200,
+        "yes_no": 600,
+        "post_diagnosis": 800,
+    }
+
+    def __init__(self, debug=False, chunk_size=4000, use_vad=True, hands_free=False, endpoint_silence=None,
+                 source=None, backend=None, prewarm_ai=False):
         """
         Inicjalizuje aplikację VoiceChatApp, konfigurując komponenty GUI, rozpoznawania mowy
         oraz przetwarzania tekstu.
 
         Args:
             debug (bool): Flaga określająca, czy włączyć tryb debugowania logów.
+            chunk_size (int): Liczba ramek audio przekazywanych jednorazowo do rozpoznawania mowy.
+                Mniejsza wartość zmniejsza opóźnienie kosztem większego użycia CPU. Domyślnie 4000.
+            use_vad (bool): Czy pomijać fragmenty ciszy przed rozpoznawaniem mowy. Domyślnie True.
+            hands_free (bool): Czy automatycznie wykrywać koniec wypowiedzi i przetwarzać ją bez
+                przycisku 'Potwierdź'. Domyślnie False.
+            endpoint_silence (dict | None): Progi ciszy końcowej w milisekundach dla stanów rozmowy,
+                nadpisujące DEFAULT_ENDPOINT_SILENCE.
+            source (AudioSource | None): Źródło audio. Domyślnie mikrofon (AudioCapture).
+            backend (SpeechBackend | None): Dostawca rozpoznawaczy mowy. Domyślnie pula VOSK (RecognizerPool).
+            prewarm_ai (bool): Czy po załadowaniu modułu medycznego tworzyć klienta AI w tle. Domyślnie False
+                (klient jest tworzony przy pierwszym zapytaniu do modelu AI).
         """
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
 
+        self.debug = debug
+        self.startup_report = StartupReport.shared()
+        self.prewarm_ai = prewarm_ai
+        self.chunk_size = chunk_size
         self.gui = ChatGUI(parent=self, debug=debug)
-        self.lector = SoundEngine(debug=debug)
-        self.medic = MedicalChat(debug=debug)
+        self.lector = None
+        self.medic = None
         self.is_speaking = False
         self.threads = []
 
-        self.model = Model("VoiceChatApp/model")
-        self.p = pyaudio.PyAudio()
-        self.stream = self.p.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=16000,
-            input=True,
-            frames_per_buffer=8000
-        )
-        self.stream.start_stream()
-        self.recognizer = KaldiRecognizer(self.model, 16000)
+        self.backend = backend
+        self.source = source
+        self.vad = VoiceActivityDetector(rate=16000, debug=debug) if use_vad else None
+        self.grammar = None
+        # Wersja bazy wiedzy, z której słownictwa zbudowano gramatyki
+        self.grammar_version = None
+        self.listener = None
+
+        self.hands_free = hands_free
+        self.endpoint_silence = dict(self.DEFAULT_ENDPOINT_SILENCE, **(endpoint_silence or {}))
+        self.speech_end_time = None
+        self.turn_latencies = []
+        # Czas rozpoczęcia przetwarzania wypowiedzi i czasy do pierwszego dźwięku odpowiedzi
+        self.reply_started_at = None
+        self.first_audio_latencies = []
+        self.reply_thread = None
+
+        # Komponenty ładowane w tle - GUI jest dostępne od razu
+        self.components = {
+            "model": "model mowy",
+            "lector": "syntezator mowy",
+            "medic": "moduł medyczny",
+        }
+        self.ready = {name: threading.Event() for name in self.components}
+        self.load_errors = {}
+        self.greeting = None
+        self.load_components()
+
+    def load_components(self):
+        """
+        Uruchamia równoległe ładowanie ciężkich komponentów aplikacji w wątkach tła.
+
+        Ładowane są: model VOSK wraz z mikrofonem i rozpoznawaczami, silnik dźwięku
+        oraz moduł medyczny z klientem AI. Każdy komponent po załadowaniu jest rozgrzewany,
+        aby pierwsza rzeczywista tura rozmowy nie była opóźniona.
+        """
+        self.logger.debug("Wywołanie load_components")
+        loaders = {
+            "model": self._load_model,
+            "lector": self._load_lector,
+            "medic": self._load_medic,
+        }
+        for name, loader in loaders.items():
+            thread = threading.Thread(target=self._run_loader, args=(name, loader), daemon=True)
+            thread.start()
+
+    def _run_loader(self, name, loader):
+        """
+        Funkcja pomocnicza: wykonuje ładowanie komponentu i zapisuje jego stan gotowości.
+
+        Args:
+            name (str): Nazwa komponentu.
+            loader (callable): Funkcja ładująca komponent.
+        """
+        try:
+            with self.startup_report.measure(self.components[name]):
+                loader()
+            self.logger.debug(f"Załadowano komponent: {name}")
+        except Exception as e:
+            self.logger.error(f"Błąd podczas ładowania komponentu {name}: {e}")
+            self.load_errors[name] = e
+        finally:
+            self.ready[name].set()
+
+    def _load_model(self):
+        """
+        Funkcja pomocnicza: ładuje współdzielony model VOSK, uruchamia przechwytywanie mikrofonu
+        i rozgrzewa rozpoznawacze wszystkich stanów rozmowy.
+
+        Przekazane w konstruktorze źródło audio lub backend zastępują mikrofon i model VOSK.
+        """
+        # Importy lokalne - PyAudio i VOSK są potrzebne tylko dla domyślnego mikrofonu i modelu
+        if self.backend is None:
+            from .RecognizerPool import RecognizerPool
+            self.backend = RecognizerPool("VoiceChatApp/model", rate=16000, debug=self.debug)
+        # Gramatyki są budowane ze słownictwa bazy wiedzy, więc musi ona być już wczytana
+        self.grammar_version = KnowledgeBase.shared().version
+        self.grammar = DialogGrammar(debug=self.debug)
+        self.backend.warmup(self.grammar.grammars.values())
+        if self.source is None:
+            from .AudioCapture import AudioCapture
+            self.source = AudioCapture(rate=16000, chunk_size=self.chunk_size, debug=self.debug)
+        self.source.start()
+        self.listener = SpeechListener(self.source, self.backend, self.vad, debug=self.debug)
+
+    def _load_lector(self):
+        """
+        Funkcja pomocnicza: inicjalizuje silnik dźwięku i syntezuje próbną wypowiedź.
+        """
+        lector = SoundEngine(debug=self.debug)
+        lector.warmup()
+        self.lector = lector
+
+    def _load_medic(self):
+        """
+        Funkcja pomocnicza: tworzy moduł medyczny. Klient AI jest tworzony w tle tylko przy `prewarm_ai`,
+        w przeciwnym razie przy pierwszym zapytaniu do modelu AI.
+        """
+        self.medic = MedicalChat(debug=self.debug)
+        if self.prewarm_ai:
+            self.medic.ai_model.prewarm()
+
+    def is_ready(self) -> bool:
+        """
+        Sprawdza, czy wszystkie komponenty zostały poprawnie załadowane.
+
+        Returns:
+            bool: True, jeśli aplikacja jest gotowa do rozmowy.
+        """
+        return all(event.is_set() for event in self.ready.values()) and not self.load_errors
+
+    def poll_startup(self):
+        """
+        Cyklicznie (w wątku GUI) raportuje postęp ładowania komponentów w etykiecie stanu systemu.
+
+        Po załadowaniu silnika dźwięku odczytuje powitanie, a po załadowaniu wszystkich
+        komponentów informuje użytkownika, że może zacząć mówić.
+        """
+        if self.greeting and self.ready["lector"].is_set() and self.lector:
+            self.lector.say(self.greeting)
+            self.greeting = None
+
+        if self.load_errors:
+            failed = ", ".join(self.components[name] for name in self.load_errors)
+            self.gui.update_status_label(f"błąd ładowania: {failed}")
+            return
+
+        pending = [label for name, label in self.components.items() if not self.ready[name].is_set()]
+        if pending:
+            self.gui.update_status_label(f"ładowanie: {', '.join(pending)}")
+            self.gui.root.after(100, self.poll_startup)
+        else:
+            self.logger.info("Wszystkie komponenty zostały załadowane")
+            self.logger.info(self.startup_report.summary())
+            self.check_audio_status_thread()
 
     def start(self):
         """
         Sekwencja startowa, która uruchamia aplikację i interfejs graficzny.
+
+        Powitanie jest wyświetlane od razu, a odczytywane po załadowaniu silnika dźwięku.
         """
         self.logger.debug("Wywołanie start")
 
@@ -57,8 +210,9 @@ class VoiceChatApp:
         self.gui.chat_display.config(state="normal")
         self.gui.chat_display.insert(tk.END, f"MedykBot: {message}\n")
         self.gui.chat_display.config(state="disabled")
-        self.lector.say(message)
+        self.greeting = message
 
+        self.gui.root.after(0, self.poll_startup)
         self.gui.start()
 
     def ev_speaking_button(self):
@@ -69,6 +223,9 @@ class VoiceChatApp:
         W przeciwnym razie zatrzymuje nagrywanie i aktualizuje elementy GUI.
         """
         self.logger.debug("Wywołanie speaking_button")
+        if not self.is_ready():
+            self.logger.debug("Komponenty nie są jeszcze gotowe")
+            return
         if not self.is_speaking:
             self.start_speaking_button()
             self.gui.update_status_label("nasłuchiwanie")
@@ -83,8 +240,8 @@ class VoiceChatApp:
         Tworzy nowy wątek odpowiedzialny za odczyt dźwięku z mikrofonu i jego przetwarzanie.
         """
         self.logger.debug("Wywołanie start_speaking_button")
-        self.gui.user_input_voice.delete("1.0", tk.END)
-        self.gui.user_input_voice_partial.config(text="")
+        self.gui.set_voice_text("")
+        self.gui.set_partial_text("")
         if not self.is_speaking:
             self.is_speaking = True
             self.gui.update_speaking_button(self.is_speaking)
@@ -109,47 +266,50 @@ class VoiceChatApp:
         # recognized_text = self.gui.user_input_voice.get("1.0", tk.END).strip()
         # self.gui.user_input_voice.delete("1.0", tk.END)
         # self.gui.user_input_voice.insert(tk.END, recognized_text)
-        self.gui.user_input_voice_partial.config(text="")
+        self.gui.set_partial_text("")
 
     def hear(self):
         """
         Wątek odpowiedzialny za nasłuchiwanie i przetwarzanie mowy na tekst.
 
-        Dane są odczytywane z mikrofonu i przetwarzane przez model VOSK.
+        Dane są pobierane ze źródła audio i przetwarzane przez rozpoznawacz z gramatyką
+        dobraną do bieżącego stanu rozmowy (SpeechListener). Wyniki trafiają do GUI
+        przez magistralę aktualizacji.
         """
         self.logger.debug("Wywołanie hear")
-        recognized_text = ""
-        partial_result = ""
-        try:
-            data = self.stream.read(4000, exception_on_overflow=False)
-            self.recognizer.AcceptWaveform(data)
-        except Exception as e:
-            self.logger.error(f"Błąd podczas odczytu strumienia: {e}")
-
-        while self.is_speaking:
-            try:
-                data = self.stream.read(4000, exception_on_overflow=False)
-                if self.recognizer.AcceptWaveform(data):
-                    result = self.recognizer.Result()
-                    text = json.loads(result).get("text", "")
-                    recognized_text += text + " "
-                    # Aktualizacja pola tekstowego z rozpoznanym tekstem
-                    self.gui.user_input_voice.delete("1.0", tk.END)
-                    self.gui.user_input_voice.insert(tk.END, recognized_text.strip())
-                else:
-                    partial_result = self.recognizer.PartialResult()
-                    partial_text = json.loads(partial_result).get("partial", "")
-                    self.gui.user_input_voice_partial.config(text=partial_text)
-            except Exception as e:
-                self.logger.error(f"Błąd podczas odczytu strumienia: {e}")
-                break
-
-        if recognized_text.strip() == "" and False:
-            recognized_text = json.loads(partial_result).get("partial", "")
-            self.gui.user_input_voice.delete("1.0", tk.END)
-            self.gui.user_input_voice.insert(tk.END, recognized_text.strip())
+        self.refresh_grammar()
+        state = self.medic.dialog_state()
+        text, ended = self.listener.listen(
+            self.grammar.grammar(state),
+            lambda: self.is_speaking,
+            on_partial=self.gui.post_partial_text,
+            on_text=self.gui.post_voice_text,
+            auto_endpoint=self.hands_free,
+            endpoint_silence_ms=self.endpoint_silence.get(state, 1000)
+        )
+        if ended:
+            # Tryb bez użycia rąk - wypowiedź jest przetwarzana bez przycisku 'Potwierdź'
+            self.speech_end_time = self.listener.speech_end_time
+            self.is_speaking = False
+            self.gui.post(self.ev_confirm_button)
+
+        self.logger.debug(f"Odświeżenia GUI: {self.gui.redraw_rate():.1f}/s, "
+                          f"pominięte niezmienione: {self.gui.skipped_count}")
         self.logger.debug("hear zakończył działanie")
 
+    def refresh_grammar(self):
+        """
+        Przed nową rozmową przeładowuje bazę wiedzy (MedicalChat.refresh_knowledge_base) i odbudowuje
+        gramatyki, jeśli zmieniła się wersja bazy - nowe objawy i frazy są rozpoznawane bez restartu.
+        """
+        if self.medic.dialog_state() == "monolog":
+            self.medic.refresh_knowledge_base()
+        version = self.medic.knowledge_base_version
+        if version != self.grammar_version:
+            self.grammar = DialogGrammar(debug=self.debug)
+            self.grammar_version = version
+            self.logger.info("Odbudowano gramatyki rozpoznawania mowy dla nowej wersji bazy wiedzy")
+
     def ev_confirm_button(self):
         """
         Obsługuje zdarzenie kliknięcia przycisku 'Potwierdź'.
@@ -157,17 +317,27 @@ class VoiceChatApp:
         Zatrzymuje nasłuchiwanie, przetwarza wprowadzony tekst użytkownika
         oraz generuje odpowiedź, która jest wyświetlana w GUI.
         """
+        if not self.is_ready():
+            self.logger.debug("Komponenty nie są jeszcze gotowe")
+            return
+        if self.reply_thread is not None and self.reply_thread.is_alive():
+            self.logger.debug("Poprzednia odpowiedź jest jeszcze przygotowywana")
+            return
         self.stop_speaking_button()
-        self.gui.user_input_voice_partial.config(text="Aby rozpocząć mówienie wciśnij ikonę mikrofonu")
+        self.gui.set_partial_text("Aby rozpocząć mówienie wciśnij ikonę mikrofonu")
         self.gui.update_status_label("mówię do ciebie")
         self.process_text()
-        self.gui.user_input_voice.delete("1.0", tk.END)
+        self.gui.set_voice_text("")
         self.check_audio_status_thread()
 
     def process_text(self):
         """
         Przetwarza tekst wprowadzony przez użytkownika, generuje odpowiedź
         oraz wyświetla ją w GUI.
+
+        Odpowiedź jest przygotowywana w osobnym wątku, a każde gotowe zdanie od razu trafia
+        do syntezatora mowy i okna czatu, więc odtwarzanie zaczyna się przed otrzymaniem
+        całej odpowiedzi modelu AI.
         """
         self.logger.debug("Wywołanie process_text")
         user_text = self.gui.user_input_voice.get("1.0", tk.END).strip()
@@ -175,6 +345,7 @@ class VoiceChatApp:
         if not user_text:
             self.logger.debug("Brak tekstu do przetworzenia.")
             return
+        self.reply_started_at = time.perf_counter()
 
         # Wyświetlenie tekstu użytkownika w czacie
         self.gui.chat_display.config(state="normal")
@@ -182,7 +353,9 @@ class VoiceChatApp:
         self.gui.chat_display.config(state="disabled")
         self.logger.debug(f"Wyświetlono tekst użytkownika: 'Ty: {user_text}'")
 
-        if SpeechLibrary.is_reset_command(user_text.lower()):
+        # Wypowiedź jest klasyfikowana raz, a wynik trafia również do analizy objawów
+        intent = self.medic.intents.classify(user_text)
+        if intent[IntentClassifier.RESET]:
             self.logger.info("Otrzymano komendę resetowania rozmowy.")
             self.medic.reset_conversation()
             response = SpeechLibrary.reset_response()
@@ -192,23 +365,90 @@ class VoiceChatApp:
             self.gui.chat_display.insert(tk.END, f"MedykBot: {response}\n")
             self.gui.chat_display.config(state="disabled")
             self.logger.debug(f"Wyświetlono odpowiedź bota: 'MedykBot: {response}'")
-            self.lector.say(response)
-            self.gui.user_input_voice.delete("1.0", tk.END)
+            self.lector.say(response, on_start=self._on_audio_start)
+            self.gui.set_voice_text("")
             return
 
-        result, message = self.medic.analyze_symptoms(user_text)
-        self.logger.debug(f"Przetworzono tekst użytkownika przez MedicalChat: {message}")
+        # Strumień jest otwierany w wątku GUI, aby sprawdzanie stanu odtwarzania widziało go od razu
+        self.lector.start_stream(on_start=self._on_audio_start)
+        self.reply_thread = threading.Thread(target=self._reply, args=(user_text, intent), daemon=True)
+        self.reply_thread.start()
 
+        self.gui.set_voice_text("")
+        self.logger.debug("Pole tekstowe zostało wyczyszczone.")
+
+    def _reply(self, user_text, intent):
+        """
+        Funkcja pomocnicza (wątek odpowiedzi): analizuje wypowiedź i przekazuje kolejne zdania
+        odpowiedzi do syntezatora mowy oraz okna czatu.
+
+        Args:
+            user_text (str): Tekst wypowiedzi użytkownika.
+            intent (dict): Wynik IntentClassifier.classify dla tej wypowiedzi.
+        """
+        prefix = "MedykBot: "
+
+        def on_sentence(sentence):
+            nonlocal prefix
+            self.lector.say_sentence(sentence)
+            self.gui.post(self.append_bot_text, f"{prefix}{sentence}")
+            prefix = " "
+
+        try:
+            result, message = self.medic.analyze_symptoms(user_text, intent, on_sentence=on_sentence)
+            self.logger.debug(f"Przetworzono tekst użytkownika przez MedicalChat: {message}")
+        except Exception as e:
+            self.logger.error(f"Błąd podczas przygotowywania odpowiedzi: {e}")
+        finally:
+            self.lector.end_stream()
+            self.gui.post(self.append_bot_text, "\n")
+
+    def append_bot_text(self, text: str):
+        """
+        Dopisuje fragment odpowiedzi bota na końcu okna czatu (wywoływana w wątku GUI).
+
+        Args:
+            text (str): Fragment tekstu do dopisania.
+        """
         self.gui.chat_display.config(state="normal")
-        self.gui.chat_display.insert(tk.END, f"MedykBot: {message}\n")
+        self.gui.chat_display.insert(tk.END, text)
         self.gui.chat_display.config(state="disabled")
         self.gui.chat_display.see(tk.END)
-        self.logger.debug(f"Wyświetlono odpowiedź bota: 'MedykBot: {message}'")
 
-        self.lector.say(message)
+    def _on_audio_start(self, started_at: float):
+        """
+        Funkcja pomocnicza: przekazuje do wątku GUI moment rozpoczęcia odtwarzania odpowiedzi.
 
-        self.gui.user_input_voice.delete("1.0", tk.END)
-        self.logger.debug("Pole tekstowe zostało wyczyszczone.")
+        Args:
+            started_at (float): Czas rozpoczęcia odtwarzania (time.perf_counter).
+        """
+        self.gui.post(self.log_turn_latency, started_at)
+
+    def log_turn_latency(self, started_at=None):
+        """
+        Zapisuje czas od rozpoczęcia przetwarzania wypowiedzi do pierwszego dźwięku odpowiedzi
+        oraz czas od zakończenia mowy użytkownika do odpowiedzi bota (mierzony tylko dla tur
+        zakończonych automatycznie).
+
+        Args:
+            started_at (float | None): Czas rozpoczęcia odtwarzania (time.perf_counter).
+                Domyślnie bieżący czas.
+        """
+        if started_at is None:
+            started_at = time.perf_counter()
+        if self.reply_started_at is not None:
+            first_audio = started_at - self.reply_started_at
+            self.reply_started_at = None
+            self.first_audio_latencies.append(first_audio)
+            self.logger.info(f"Czas do pierwszego dźwięku odpowiedzi: {first_audio * 1000:.0f} ms")
+            self.logger.debug(f"Pamięć podręczna mowy: {self.lector.tts_cache.stats()}")
+
+        if self.speech_end_time is None:
+            return
+        latency = started_at - self.speech_end_time
+        self.speech_end_time = None
+        self.turn_latencies.append(latency)
+        self.logger.info(f"Czas od końca wypowiedzi do odpowiedzi: {latency * 1000:.0f} ms")
 
     def on_closing(self):
         """
@@ -219,15 +459,13 @@ class VoiceChatApp:
         self.logger.debug("Wywołanie on_closing")
         self.is_speaking = False
 
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-        if self.p:
-            self.p.terminate()
-
         for thread in self.threads:
             thread.join()
 
+        if self.source:
+            self.source.close()
+            self.source = None
+
     def __del__(self):
         """
         Destruktor klasy.
@@ -243,5 +481,9 @@ class VoiceChatApp:
         """
         if self.lector.current_thread is not None and self.lector.current_thread.is_alive():
             self.gui.root.after(100, self.check_audio_status_thread)
+        elif self.hands_free and not self.is_speaking:
+            # W trybie bez użycia rąk nasłuchiwanie wznawia się po zakończeniu odpowiedzi bota
+            self.start_speaking_button()
+            self.gui.update_status_label("nasłuchiwanie")
         else:
             self.gui.update_status_label("możesz teraz mówić")
@@ -0,0 +1,100 @@
+import logging
+import time
+import wave
+from .SpeechBackend import AudioSource
+
+
+class WaveFileSource(AudioSource):
+    """
+    Klasa WaveFileSource dostarcza audio z plików WAV zamiast z mikrofonu.
+
+    Umożliwia uruchamianie potoku rozpoznawania mowy na maszynach bez mikrofonu,
+    w tempie czasu rzeczywistego lub najszybciej, jak to możliwe (pomiary przepustowości).
+    """
+
+    def __init__(self, paths, chunk_size=4000, realtime=False, loop=False, trailing_silence=1.0, debug=False):
+        """
+        Inicjalizuje źródło audio z plików WAV.
+
+        Args:
+            paths (list): Ścieżki do plików WAV (16 kHz, mono, 16 bit) odtwarzanych kolejno.
+            chunk_size (int): Liczba ramek w zwracanej porcji. Domyślnie 4000.
+            realtime (bool): Czy dostarczać audio w tempie nagrania. Domyślnie False.
+            loop (bool): Czy po ostatnim pliku wracać do pierwszego. Domyślnie False.
+            trailing_silence (float): Cisza (s) dołączana po każdym pliku, aby zadziałało
+                wykrywanie końca wypowiedzi. Domyślnie 1.0.
+            debug (bool): Flaga włączająca tryb debugowania logów. Domyślnie False.
+        """
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+        self.paths = list(paths)
+        self.chunk_size = chunk_size
+        self.realtime = realtime
+        self.loop = loop
+        self.trailing_silence = trailing_silence
+        self._clips = [self._load(path) for path in self.paths]
+        self._index = 0
+        self._offset = 0
+        self._next_time = None
+
+    def _load(self, path: str) -> bytes:
+        """
+        Funkcja pomocnicza: wczytuje plik WAV i dołącza ciszę końcową.
+
+        Args:
+            path (str): Ścieżka do pliku WAV.
+
+        Returns:
+            bytes: Próbki audio.
+
+        Raises:
+            ValueError: Jeśli format pliku nie odpowiada formatowi mikrofonu aplikacji.
+        """
+        with wave.open(path, "rb") as wav:
+            if wav.getframerate() != self.rate or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                raise ValueError(f"Nieobsługiwany format pliku {path}: wymagane 16 kHz, mono, 16 bit")
+            data = wav.readframes(wav.getnframes())
+        return data + bytes(int(self.rate * self.trailing_silence) * 2)
+
+    def read(self, timeout=0.5) -> bytes:
+        """
+        Pobiera kolejną porcję audio z bieżącego pliku.
+
+        Porcja nigdy nie obejmuje dwóch plików - koniec pliku odpowiada końcowi wypowiedzi.
+
+        Args:
+            timeout (float): Nieużywany, zachowany dla zgodności z AudioSource.
+
+        Returns:
+            bytes: Porcja audio lub pusty ciąg po wyczerpaniu wszystkich plików.
+        """
+        if self._index >= len(self._clips):
+            if not self.loop or not self._clips:
+                return b""
+            self._index = 0
+
+        clip = self._clips[self._index]
+        size = self.chunk_size * 2
+        data = clip[self._offset:self._offset + size]
+        self._offset += size
+        if self._offset >= len(clip):
+            self._index += 1
+            self._offset = 0
+
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_time is None or self._next_time < now:
+                self._next_time = now
+            self._next_time += len(data) / (self.rate * 2)
+            time.sleep(max(0.0, self._next_time - now))
+        return data
+
+    def finished(self) -> bool:
+        """
+        Sprawdza, czy wszystkie pliki zostały odczytane.
+
+        Returns:
+            bool: True, jeśli źródło nie dostarczy więcej audio.
+        """
+        return not self.loop and self._index >= len(self._clips)
@@ -1 +1,8 @@
-from .VoiceChatApp import VoiceChatApp
\ No newline at end of file
+def __getattr__(name):
+    # Import leniwy - import pakietu (np. VoiceChatApp.MedicalChat w trybie bez GUI)
+    # nie wymaga tkinter, pygame, PyAudio ani VOSK
+    if name == "VoiceChatApp":
+        from .VoiceChatApp import VoiceChatApp
+        globals()[name] = VoiceChatApp
+        return VoiceChatApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,166 @@
+"""
+Lokalny serwer HTTP udający API chat completions OpenAI - do pomiarów opóźnień bez dostępu do sieci.
+
+Czas odpowiedzi ma rozkład logarytmicznie normalny o medianie `--median`, a z prawdopodobieństwem
+`--tail-rate` odpowiedź jest dodatkowo opóźniona o `--tail`. Z prawdopodobieństwem `--error-rate`
+serwer odpowiada statusem 503. Zapytania z `"stream": true` otrzymują odpowiedź jako strumień
+zdarzeń (SSE), słowo po słowie co `--per-token` sekund. Zużycie tokenów (pole "usage", również
+w strumieniu z `stream_options.include_usage`) jest szacowane jako liczba znaków / 4.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.ai_stub_server --port 8765
+
+Aplikację można skierować do serwera zmienną środowiskową:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSE = (
+    "Objawy mogą wskazywać na infekcję wirusową. "
+    "Zalecam odpoczynek, nawadnianie i kontakt z lekarzem, jeśli objawy nie ustąpią."
+)
+
+
+class StubConfig:
+    def __init__(self, median=0.08, sigma=0.3, tail=1.0, tail_rate=0.05, error_rate=0.0, per_token=0.0,
+                 seed=None):
+        self.median = median
+        self.sigma = sigma
+        self.tail = tail
+        self.tail_rate = tail_rate
+        self.error_rate = error_rate
+        self.per_token = per_token
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def sample(self):
+        with self.lock:
+            self.requests += 1
+            delay = self.median * math.exp(self.rng.gauss(0, self.sigma))
+            if self.rng.random() < self.tail_rate:
+                delay += self.tail
+            return delay, self.rng.random() < self.error_rate
+
+
+def usage(request):
+    prompt = sum(4 + math.ceil(len(message.get("content", "")) / 4) for message in request.get("messages", []))
+    completion = math.ceil(len(RESPONSE) / 4)
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Nagłówki i treść są wysyłane osobno - bez tego algorytm Nagle'a opóźnia odpowiedź o ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except (BrokenPipeError, ConnectionResetError):
+            # Klient anulował zapytanie (np. zapasowe, gdy wygrało pierwsze)
+            self.close_connection = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        delay, error = config.sample()
+        time.sleep(delay)
+        if error:
+            self.send_json(503, {"error": {"message": "Serwer przeciążony", "type": "server_error"}})
+        elif request.get("stream"):
+            self.send_stream(request, config.per_token)
+        else:
+            self.send_json(200, {
+                "id": "stub", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": RESPONSE}}],
+                "usage": usage(request),
+            })
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, request, per_token):
+        model = request.get("model", "stub")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for index, word in enumerate(RESPONSE.split(" ")):
+            chunk = {
+                "id": "stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": None,
+                             "delta": {"content": word if index == 0 else f" {word}"}}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(per_token)
+        if (request.get("stream_options") or {}).get("include_usage"):
+            chunk = {"id": "stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [], "usage": usage(request)}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+class StubServer:
+    """Serwer testowy uruchamiany w wątku tła (np. w benchmarkach)."""
+
+    def __init__(self, config=None, port=0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = config or StubConfig()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--median", type=float, default=0.08, help="Mediana czasu odpowiedzi (s)")
+    parser.add_argument("--tail", type=float, default=1.0, help="Dodatkowe opóźnienie odpowiedzi z ogona (s)")
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="Odsetek odpowiedzi z ogona")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Odsetek odpowiedzi 503")
+    parser.add_argument("--per-token", type=float, default=0.03, help="Odstęp słów w strumieniu (s)")
+    args = parser.parse_args()
+
+    config = StubConfig(args.median, tail=args.tail, tail_rate=args.tail_rate, error_rate=args.error_rate,
+                        per_token=args.per_token)
+    with StubServer(config, args.port) as server:
+        print(f"OPENAI_BASE_URL={server.base_url}")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
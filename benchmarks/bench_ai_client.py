@@ -0,0 +1,69 @@
+"""
+Opóźnienia ogona zapytań do modelu AI (AsyncAiClient) mierzone na lokalnym serwerze testowym
+(benchmarks/ai_stub_server.py), bez dostępu do sieci.
+
+Porównywane warianty klienta: bez ponowień i zapytań zapasowych, z ponowieniami oraz
+z ponowieniami i zapytaniami zapasowymi wysyłanymi po percentylu `--hedge-percentile`.
+Zapytania są wysyłane po kolei, jak w rozmowie z jednym pacjentem. Raportowany jest odsetek
+udanych odpowiedzi, percentyle czasu odpowiedzi widzianego przez aplikację i liczba zapytań do serwera.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_ai_client --requests 300
+"""
+import argparse
+import time
+
+from VoiceChatApp.AsyncAiClient import AsyncAiClient
+from benchmarks.ai_stub_server import StubConfig, StubServer
+
+MESSAGES = [{"role": "user", "content": "Objawy: gorączka, kaszel"}]
+
+
+def run(client, requests):
+    timings = []
+    failures = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            client.ask(MESSAGES)
+        except Exception:
+            failures += 1
+        timings.append(time.perf_counter() - start)
+    return timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--median", type=float, default=0.05, help="Mediana czasu odpowiedzi serwera (s)")
+    parser.add_argument("--tail", type=float, default=1.0, help="Dodatkowe opóźnienie odpowiedzi z ogona (s)")
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="Odsetek odpowiedzi z ogona")
+    parser.add_argument("--error-rate", type=float, default=0.03, help="Odsetek odpowiedzi 503")
+    parser.add_argument("--deadline", type=float, default=5.0, help="Limit czasu zapytania (s)")
+    parser.add_argument("--hedge-percentile", type=float, default=90)
+    args = parser.parse_args()
+
+    variants = {
+        "bez ponowień": dict(max_retries=0, hedge_percentile=None),
+        "ponowienia": dict(max_retries=2, hedge_percentile=None),
+        "+ zapasowe": dict(max_retries=2, hedge_percentile=args.hedge_percentile),
+    }
+    print(f"{'wariant':>14} {'udane':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'maks.':>8} {'zapytania':>10} "
+          f"{'zapasowe':>9}")
+    for name, options in variants.items():
+        config = StubConfig(args.median, tail=args.tail, tail_rate=args.tail_rate, error_rate=args.error_rate,
+                            seed=0)
+        with StubServer(config) as server:
+            client = AsyncAiClient(base_url=server.base_url, api_key="benchmark", deadline=args.deadline,
+                                   **options)
+            timings, failures = run(client, args.requests)
+            stats = client.stats()
+            client.close()
+        ok = 1 - failures / args.requests
+        p50, p95, p99 = (AsyncAiClient.percentile(timings, q) * 1000 for q in (50, 95, 99))
+        print(f"{name:>14} {ok:>7.1%} {p50:>5.0f} ms {p95:>5.0f} ms {p99:>5.0f} ms {max(timings) * 1000:>5.0f} ms "
+              f"{config.requests:>10} {stats['hedges']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Czas tury z diagnozą modelu AI podczas awarii API: bez wyłącznika obwodu (tura czeka do limitu
+czasu klienta) oraz z wyłącznikiem (CircuitBreaker i przybliżone dopasowanie z tabeli chorób).
+
+Model zastępuje lokalny serwer testowy (benchmarks/ai_stub_server.py). Symulacja ma trzy fazy:
+poprawne działanie, awarię (odpowiedzi wolniejsze niż `--outage-latency`) i powrót do poprawnego
+działania. Pacjent odpowiada po `--think` sekundach. Raportowane są percentyle czasu tury w każdej
+fazie i liczba odpowiedzi zastępczych.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_circuit_breaker --turns 10 20 10
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from VoiceChatApp.AiModel import AiModel
+from VoiceChatApp.AsyncAiClient import AsyncAiClient
+from VoiceChatApp.CircuitBreaker import CircuitBreaker
+from VoiceChatApp.DiagnosisCache import DiagnosisCache
+from benchmarks.ai_stub_server import StubConfig, StubServer
+
+PHASES = ("działanie", "awaria", "powrót")
+
+
+def run(chat, config, args, rng):
+    results = {}
+    for phase, turns in zip(PHASES, args.turns):
+        config.median = args.outage_latency if phase == "awaria" else args.model_latency
+        timings = []
+        fallbacks = 0
+        for _ in range(turns):
+            # Każda tura to nowa rozmowa - budżet tokenów rozmowy nie może zastępować wyłącznika
+            chat.prompt_builder.reset_session()
+            chat.user_symptoms = {symptom: rng.random() < 0.3 for symptom in chat.required_symptoms}
+            start = time.perf_counter()
+            answer = chat.ask_ai(f"bench:{rng.random()}")
+            timings.append(time.perf_counter() - start)
+            fallbacks += answer.startswith("Nie mogę teraz")
+            time.sleep(args.think)
+        results[phase] = (timings, fallbacks)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs=3, default=[10, 20, 10], help="Liczba tur w każdej fazie")
+    parser.add_argument("--model-latency", type=float, default=0.1, help="Czas odpowiedzi modelu (s)")
+    parser.add_argument("--outage-latency", type=float, default=5.0, help="Czas odpowiedzi podczas awarii (s)")
+    parser.add_argument("--deadline", type=float, default=2.0, help="Limit czasu klienta AI (s)")
+    parser.add_argument("--budget", type=float, default=0.5, help="Budżet czasu wyłącznika (s)")
+    parser.add_argument("--reset-timeout", type=float, default=1.0, help="Czas do wywołania próbnego (s)")
+    parser.add_argument("--think", type=float, default=0.2, help="Czas między turami (s)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from VoiceChatApp.MedicalChat import MedicalChat
+
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    cache_dir = tempfile.TemporaryDirectory()
+    chat = MedicalChat(cache_dir=cache_dir.name)
+    variants = {
+        # Bez wyłącznika obwód nigdy się nie otwiera, a tura czeka do limitu czasu klienta
+        "bez wyłącznika": CircuitBreaker(failure_threshold=float("inf"), latency_budget=args.deadline),
+        "z wyłącznikiem": CircuitBreaker(latency_budget=args.budget, reset_timeout=args.reset_timeout),
+    }
+    print(f"{'wariant':>15} {'faza':>10} {'p50':>8} {'p99':>8} {'zastępcze':>10}")
+    for name, breaker in variants.items():
+        config = StubConfig(args.model_latency, sigma=0.1, tail_rate=0.0, seed=0)
+        with StubServer(config) as server:
+            client = AsyncAiClient(base_url=server.base_url, api_key="benchmark", deadline=args.deadline,
+                                   hedge_percentile=None)
+            chat.ai_model = AiModel(client)
+            chat.diagnosis_cache = DiagnosisCache()
+            chat.circuit_breaker = breaker
+            results = run(chat, config, args, random.Random(0))
+            client.close()
+        for phase, (timings, fallbacks) in results.items():
+            p50, p99 = (AsyncAiClient.percentile(timings, q) * 1000 for q in (50, 99))
+            print(f"{name:>15} {phase:>10} {p50:>5.0f} ms {p99:>5.0f} ms {fallbacks:>10}")
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
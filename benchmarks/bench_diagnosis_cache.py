@@ -0,0 +1,82 @@
+"""
+Pomiar pamięci podręcznej diagnoz (DiagnosisCache) przed zapytaniami do modelu AI.
+
+Symulowani pacjenci mają objawy losowane z rozkładu o długim ogonie (część zestawów objawów
+powtarza się bardzo często), a odpowiedź modelu zastępuje opóźnienie `--model-latency`.
+Raportowany jest odsetek trafień oraz czas odpowiedzi z pamięci operacyjnej, z dysku
+(po ponownym uruchomieniu, gdy pamięć operacyjna jest pusta) i z modelu.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_diagnosis_cache --patients 5000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from VoiceChatApp.DiagnosisCache import DiagnosisCache
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+
+
+def random_patient(rng, symptoms, skew):
+    # Objawy o niższym indeksie występują częściej, co daje powtarzalne zestawy
+    return {symptom: rng.random() < skew ** (index + 1) for index, symptom in enumerate(symptoms)}
+
+
+def run(cache, patients, symptoms, model_latency):
+    timings = {"memory": [], "disk": [], "model": []}
+    for patient in patients:
+        key = DiagnosisCache.key(1, symptoms, patient)
+        hits, disk_hits = cache.hits, cache.disk_hits
+        start = time.perf_counter()
+        response = cache.get(key)
+        if response is None:
+            time.sleep(model_latency)
+            cache.put(key, f"Diagnoza dla {key}")
+            source = "model"
+        else:
+            source = "memory" if cache.hits > hits else "disk"
+            assert cache.disk_hits > disk_hits or source == "memory"
+        timings[source].append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, cache, timings):
+    stats = cache.stats()
+    parts = [f"{name:>14}: trafienia {stats['hit_ratio']:.1%}"]
+    for source, values in timings.items():
+        if values:
+            parts.append(f"{source} {len(values)} x {statistics.mean(values) * 1e6:,.0f} µs")
+    print(", ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=5000)
+    parser.add_argument("--skew", type=float, default=0.8, help="Im bliżej 1, tym więcej różnych zestawów objawów")
+    parser.add_argument("--model-latency", type=float, default=0.001,
+                        help="Symulowany czas odpowiedzi modelu w sekundach")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    symptoms = SpeechLibrary.required_symptoms
+    patients = [random_patient(rng, symptoms, args.skew) for _ in range(args.patients)]
+    distinct = len({DiagnosisCache.key(1, symptoms, patient) for patient in patients})
+    print(f"Pacjenci: {len(patients)}, różne zestawy objawów: {distinct}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "diagnoses.sqlite")
+        cache = DiagnosisCache(path)
+        report("pierwszy start", cache, run(cache, patients, symptoms, args.model_latency))
+        cache.close()
+
+        # Nowy proces: pusta pamięć operacyjna, odpowiedzi z bazy na dysku
+        cache = DiagnosisCache(path)
+        report("restart", cache, run(cache, patients, symptoms, args.model_latency))
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Pomiar przepustowości i opóźnień potoku rozmowy bez mikrofonu i GUI.
+
+Rozmowy są prowadzone przez SpeechListener i MedicalChat (bez klasy VoiceChatApp, GUI i syntezy
+mowy) z deterministycznym rozpoznawaczem skryptowym (ScriptedBackend) i źródłem audio z pliku WAV.
+Nie są potrzebne PyAudio, VOSK ani tkinter. Odpowiedzi "pacjenta"
+wynikają z wiersza tabeli chorób, więc każda konsultacja kończy się diagnozą z tabeli.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_dialog_pipeline --consultations 50 --decode-delay 0.01
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import wave
+
+# Konsultacje kończą się dopasowaniem z tabeli, klient AI nie wysyła żadnych zapytań
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from VoiceChatApp.MedicalChat import MedicalChat
+from VoiceChatApp.ScriptedRecognizer import ScriptedBackend
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.SpeechListener import SpeechListener
+from VoiceChatApp.WaveFileSource import WaveFileSource
+
+
+def write_silence(path, seconds):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(int(16000 * seconds) * 2))
+
+
+def run_consultation(disease, listener, backend, medic):
+    medic.reset_conversation()
+    backend.script.append("dzień dobry")
+    latencies = []
+    turns = 0
+    while True:
+        text, ended = listener.listen(None, lambda: True, auto_endpoint=True)
+        start = listener.speech_end_time or time.perf_counter()
+        i_know, message = medic.analyze_symptoms(text)
+        latencies.append(time.perf_counter() - start)
+        turns += 1
+        if i_know or turns > 2 * len(SpeechLibrary.required_symptoms):
+            return turns, latencies
+        answer = disease.get(medic.prev_question, False)
+        backend.script.append("tak" if answer else "nie")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--consultations", type=int, default=20)
+    parser.add_argument("--wav", default=None, help="Plik WAV 16 kHz mono jako źródło audio (domyślnie cisza)")
+    parser.add_argument("--utterance-seconds", type=float, default=1.5)
+    parser.add_argument("--decode-delay", type=float, default=0.0, help="Sztuczny koszt dekodowania porcji (s)")
+    parser.add_argument("--chunk-size", type=int, default=4000)
+    parser.add_argument("--realtime", action="store_true", help="Dostarczaj audio w tempie nagrania")
+    args = parser.parse_args()
+
+    wav_path = args.wav
+    if wav_path is None:
+        wav_path = os.path.join(tempfile.gettempdir(), "voicemedicbot_silence.wav")
+        write_silence(wav_path, args.utterance_seconds)
+
+    source = WaveFileSource([wav_path], chunk_size=args.chunk_size, realtime=args.realtime, loop=True)
+    backend = ScriptedBackend([], utterance_seconds=args.utterance_seconds, decode_delay=args.decode_delay)
+    listener = SpeechListener(source, backend)
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    cache_dir = tempfile.TemporaryDirectory()
+    medic = MedicalChat(cache_dir=cache_dir.name)
+
+    table = SpeechLibrary.symptoms_table
+    all_latencies = []
+    all_turns = []
+    start = time.perf_counter()
+    for index in range(args.consultations):
+        turns, latencies = run_consultation(table[index % len(table)], listener, backend, medic)
+        all_turns.append(turns)
+        all_latencies.extend(latencies)
+    elapsed = time.perf_counter() - start
+    cache_dir.cleanup()
+
+    all_latencies.sort()
+    p95 = all_latencies[int(0.95 * (len(all_latencies) - 1))]
+    print(f"Konsultacje: {args.consultations}, tury: {sum(all_turns)}, czas: {elapsed:.2f} s")
+    print(f"Konsultacje/s: {args.consultations / elapsed:.2f}, tury/s: {sum(all_turns) / elapsed:.1f}")
+    print(f"Średnio tur na konsultację: {statistics.mean(all_turns):.1f}")
+    print(f"Opóźnienie koniec mowy -> odpowiedź: p50 {statistics.median(all_latencies) * 1000:.2f} ms, "
+          f"p95 {p95 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
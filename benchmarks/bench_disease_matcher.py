@@ -0,0 +1,91 @@
+"""
+Porównanie dopasowania objawów pacjenta do tabeli chorób: dotychczasowa pętla po liście
+słowników (tylko dopasowanie dokładne) kontra DiseaseMatcher (macierz i ranking odległości).
+
+Tabela SpeechLibrary jest powiększana losowymi chorobami i objawami, aż do
+10 000 chorób x 500 objawów.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_disease_matcher --sizes 15x13 1000x100 10000x500
+"""
+import argparse
+import random
+import time
+
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.DiseaseMatcher import DiseaseMatcher
+
+
+def grow_table(diseases, symptoms, rng):
+    names = list(SpeechLibrary.required_symptoms)
+    names += [f"Objaw {index}" for index in range(max(0, symptoms - len(names)))]
+    names = names[:symptoms]
+    table = [dict(disease) for disease in SpeechLibrary.symptoms_table][:diseases]
+    while len(table) < diseases:
+        disease = {name: rng.random() < 0.2 for name in names}
+        disease.update({"Choroba": f"Choroba {len(table)}", "Specjalista": "Internista", "Zalecenia": "-"})
+        table.append(disease)
+    return table, names
+
+
+def random_patients(table, names, count, rng):
+    patients = []
+    for _ in range(count):
+        # Pacjent podobny do losowej choroby: kilka objawów zmienionych, część odpowiedzi nieznana
+        pattern = rng.choice(table)
+        patient = {name: bool(pattern.get(name, False)) for name in names}
+        for name in rng.sample(names, min(3, len(names))):
+            patient[name] = not patient[name]
+        if rng.random() < 0.2:
+            patient = {name: bool(pattern.get(name, False)) for name in names}
+        if rng.random() < 0.3:
+            patient[rng.choice(names)] = None
+        patients.append(patient)
+    return patients
+
+
+def legacy_exact(table, names, user_symptoms):
+    for disease in table:
+        if all(disease.get(symptom, False) == user_symptoms.get(symptom, False) for symptom in names):
+            return disease
+    return None
+
+
+def measure(func, patients):
+    start = time.perf_counter()
+    for patient in patients:
+        func(patient)
+    return (time.perf_counter() - start) / len(patients)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["15x13", "1000x100", "10000x500"],
+                        help="Rozmiary tabeli w postaci CHOROBYxOBJAWY")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'tabela':>12} {'budowa [ms]':>12} {'pętla [ms]':>11} {'exact [ms]':>11} {'ranking [ms]':>13} "
+          f"{'top-5 [ms]':>11}")
+    for size in args.sizes:
+        diseases, symptoms = (int(part) for part in size.split("x"))
+        table, names = grow_table(diseases, symptoms, rng)
+        patients = random_patients(table, names, args.queries, rng)
+
+        start = time.perf_counter()
+        matcher = DiseaseMatcher(table, names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for patient in patients:
+            assert matcher.exact(patient) is legacy_exact(table, names, patient)
+
+        legacy_ms = measure(lambda patient: legacy_exact(table, names, patient), patients) * 1000
+        exact_ms = measure(matcher.exact, patients) * 1000
+        rank_ms = measure(matcher.rank, patients) * 1000
+        top_ms = measure(lambda patient: matcher.rank(patient, limit=5), patients) * 1000
+        print(f"{size:>12} {build_ms:>12.0f} {legacy_ms:>11.3f} {exact_ms:>11.3f} {rank_ms:>13.3f} {top_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Skuteczność i szybkość przybliżonego wyszukiwania objawów (FuzzyPhraseIndex).
+
+Dla każdej wypowiedzi korpusu porównywane są objawy wykryte dokładnie (SymptomMatcher)
+oraz dokładnie i w przybliżeniu - tak jak w MedicalChat.analyze_monolog, przybliżone dopasowania
+przechodzą przez reguły przeczenia SymptomMatcher.scan. Każdy poprawnie odzyskany objaw to jedno
+pytanie uzupełniające (ask_first) mniej w rozmowie, a każdy objaw spoza oczekiwanych (również
+zaprzeczony w wypowiedzi) to fałszywe dopasowanie.
+
+Korpus to plik JSON Lines z polami "text" (transkrypcja) i "symptoms" (lista oczekiwanych objawów).
+Bez korpusu używany jest korpus syntetyczny: synonimy z SpeechLibrary zniekształcone
+typowymi błędami rozpoznawania mowy (zamiana, usunięcie lub wstawienie znaku, utrata znaków diakrytycznych),
+a co druga wypowiedź zawiera dodatkowo zaprzeczony, zniekształcony objaw ("nie kaszlę").
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_fuzzy_lookup [--corpus korpus.jsonl] [--grow 20000]
+"""
+import argparse
+import json
+import random
+import time
+
+from VoiceChatApp.FuzzyPhraseIndex import FuzzyPhraseIndex
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.SymptomMatcher import SymptomMatcher
+
+DIACRITICS = str.maketrans("ąćęłńóśźż", "acelnoszz")
+
+
+def corrupt(phrase, rng):
+    chars = list(phrase)
+    position = rng.randrange(len(chars))
+    operation = rng.choice(["substitute", "delete", "insert", "diacritics"])
+    if operation == "substitute":
+        chars[position] = rng.choice("aeiouyszcn")
+    elif operation == "delete":
+        del chars[position]
+    elif operation == "insert":
+        chars.insert(position, rng.choice("aeiouyszcn"))
+    else:
+        return phrase.translate(DIACRITICS)
+    return "".join(chars)
+
+
+def synthetic_corpus(rng, size):
+    corpus = []
+    symptoms = SpeechLibrary.required_symptoms
+    for _ in range(size):
+        chosen = rng.sample(symptoms, rng.randint(1, 4))
+        # Ostatni z wylosowanych objawów jest zaprzeczany w co drugiej wypowiedzi
+        denied = chosen.pop() if len(chosen) > 1 and rng.random() < 0.5 else None
+        parts = [corrupt(rng.choice(SpeechLibrary.synonyms[symptom]), rng) for symptom in chosen]
+        text = "od kilku dni " + " i ".join(parts)
+        if denied:
+            # Synonimy z własnym przeczeniem ("nie mogę spać") nie dają się zaprzeczyć słowem "nie"
+            phrases = [phrase for phrase in SpeechLibrary.synonyms[denied] if "nie" not in phrase.split()]
+            text += ", nie " + corrupt(rng.choice(phrases), rng)
+        corpus.append({"text": text, "symptoms": chosen})
+    return corpus
+
+
+def grown_index(size, rng):
+    base = FuzzyPhraseIndex.from_library()
+    phrases = dict(zip(base.phrases, base.labels))
+    letters = "abcdefghijklmnoprstuwyząćęłńóśźż"
+    for index in range(size):
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        phrases[" ".join(words)] = f"syntetyczny {index}"
+    return FuzzyPhraseIndex(phrases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=None, help="Korpus JSON Lines z polami text i symptoms")
+    parser.add_argument("--size", type=int, default=500, help="Rozmiar korpusu syntetycznego")
+    parser.add_argument("--grow", type=int, default=0, help="Liczba losowych fraz dodanych do indeksu")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as file:
+            corpus = [json.loads(line) for line in file if line.strip()]
+    else:
+        corpus = synthetic_corpus(rng, args.size)
+
+    matcher = SymptomMatcher.from_library()
+    index = grown_index(args.grow, rng) if args.grow else FuzzyPhraseIndex.from_library()
+
+    expected_total = exact_hits = saved = false_positives = negated_rejected = 0
+    elapsed = 0.0
+    for item in corpus:
+        expected = set(item["symptoms"])
+        found, negated, _ = matcher.scan(item["text"])
+        start = time.perf_counter()
+        fuzzy = index.match(item["text"], exclude=found | negated)
+        elapsed += time.perf_counter() - start
+
+        spans = [(first, last, label) for label, (_, _, (first, last)) in fuzzy.items()]
+        fuzzy_found, fuzzy_negated, _ = matcher.scan(item["text"], spans)
+        recovered = {label for label in fuzzy_found - found if label in SpeechLibrary.required_symptoms}
+        negated_rejected += len(fuzzy_negated - negated)
+        expected_total += len(expected)
+        exact_hits += len(expected & found)
+        saved += len(expected & recovered)
+        false_positives += len(recovered - expected)
+
+    print(f"Wypowiedzi: {len(corpus)}, frazy w indeksie: {len(index.phrases)}")
+    print(f"Objawy oczekiwane: {expected_total}, wykryte dokładnie: {exact_hits}, "
+          f"odzyskane w przybliżeniu: {saved}, fałszywe: {false_positives}, "
+          f"odrzucone jako zaprzeczone: {negated_rejected}")
+    print(f"Zaoszczędzone pytania uzupełniające: {saved} ({saved / len(corpus):.2f} na rozmowę)")
+    print(f"Średni czas wyszukiwania przybliżonego: {elapsed / len(corpus) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Porównanie rozpoznawania odpowiedzi użytkownika: dotychczasowe wyszukiwanie podciągów
+(does_agree, is_reset_command, is_end_of_conversation) kontra IntentClassifier.
+
+Dla zestawu opisanych wypowiedzi liczone są błędne rozstrzygnięcia odpowiedzi tak/nie
+(prowadzące do złej gałęzi rozmowy) oraz czas analizy jednej wypowiedzi.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_intent_classifier
+"""
+import argparse
+import time
+
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.IntentClassifier import IntentClassifier
+
+# (wypowiedź, oczekiwana odpowiedź)
+LABELLED = [
+    ("tak", True),
+    ("nie", False),
+    ("t", True),
+    ("n", False),
+    ("nie zgadzam się", False),
+    ("zdecydowanie nie", False),
+    ("absolutnie nie", False),
+    ("na pewno nie", False),
+    ("pewnie nie", False),
+    ("nie potwierdzam", False),
+    ("nie występują", False),
+    ("nie jestem pewien", None),
+    ("nie wiem", None),
+    ("trudno powiedzieć", None),
+    ("oczywiście że tak", True),
+    ("oczywiście że nie", False),
+    ("raczej chyba nie", False),
+    ("tak chyba jednak nie", False),
+    ("tak mam ale nie codziennie", True),
+    ("tak, ale nie codziennie", True),
+    ("mam to od tygodnia", None),
+    ("boli mnie tylko głowa", None),
+    ("ostatnio nos mi się zatyka", None),
+    ("to prawda", True),
+    ("to nieprawda", False),
+    ("raczej tak", True),
+    ("nie ma czegoś takiego", False),
+    ("brak", False),
+    ("zdecydowanie tak", True),
+    ("w nocy trochę", None),
+]
+
+
+def legacy_turn(message):
+    answer = None
+    for key, value in SpeechLibrary.response_yes_no_pattern.items():
+        if key in message.lower():
+            answer = value
+            break
+    reset = any(phrase in message.lower() for phrase in SpeechLibrary.reset_speech_phrases)
+    end = any(phrase in message.lower() for phrase in SpeechLibrary.end_speech_phrases)
+    return answer, reset, end
+
+
+def classifier_turn(classifier, message):
+    intent = classifier.classify(message)
+    return intent["answer"], intent["reset"], intent["end"]
+
+
+def measure(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text, _ in LABELLED:
+            func(text)
+    return (time.perf_counter() - start) / (repeats * len(LABELLED))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    classifier = IntentClassifier.from_library()
+    methods = {
+        "podciągi": legacy_turn,
+        "IntentClassifier": lambda text: classifier_turn(classifier, text),
+    }
+    print(f"{'metoda':>18} {'błędne odpowiedzi':>18} {'czas [µs]':>10}")
+    for name, func in methods.items():
+        errors = [text for text, expected in LABELLED if func(text)[0] != expected]
+        elapsed_us = measure(func, args.repeats) * 1e6
+        print(f"{name:>18} {len(errors):>11}/{len(LABELLED):<6} {elapsed_us:>10.1f}")
+        for text in errors:
+            print(f"{'':>20}- {text!r}")
+
+
+if __name__ == "__main__":
+    main()
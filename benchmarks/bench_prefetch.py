@@ -0,0 +1,89 @@
+"""
+Czas ostatniej tury rozmowy (odpowiedź na ostatnie pytanie -> diagnoza modelu AI) bez i z wysyłaniem
+zapytań do modelu z wyprzedzeniem (MedicalChat.PREFETCH_LIMIT).
+
+Pacjenci mają losowe zestawy objawów i wymieniają je w monologu, a wymienione objawy wykluczają
+wszystkie choroby z tabeli wzorców, więc diagnozę przygotowuje model AI po pytaniach o pozostałe objawy. Model zastępuje lokalny serwer testowy (benchmarks/ai_stub_server.py)
+z medianą czasu odpowiedzi `--model-latency`, a pacjent odpowiada na każde pytanie po `--think` sekundach.
+Raportowany jest czas ostatniej tury oraz liczba zapytań wysłanych do modelu (koszt spekulacji).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_prefetch --patients 6
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from VoiceChatApp.AiModel import AiModel
+from VoiceChatApp.AsyncAiClient import AsyncAiClient
+from VoiceChatApp.DiagnosisCache import DiagnosisCache
+from benchmarks.ai_stub_server import StubConfig, StubServer
+
+
+class InstantModel:
+    def ask(self, messages, deadline=None, on_usage=None):
+        return "Odpowiedź modelu."
+
+
+def random_patients(chat, count, rng):
+    # Tylko pacjenci, których monolog wyklucza wszystkie choroby z tabeli (diagnoza modelu AI)
+    chat.ai_model = InstantModel()
+    chat.diagnosis_cache = DiagnosisCache()
+    chat.PREFETCH_LIMIT = 0
+    patients = []
+    while len(patients) < count:
+        patient = {symptom: rng.random() < 0.3 for symptom in chat.disease_matcher.symptoms}
+        converse(chat, patient, 0)
+        if len(chat.candidates) == 0:
+            patients.append(patient)
+    return patients
+
+
+def converse(chat, patient, think):
+    chat.reset_conversation()
+    present = [symptom.lower() for symptom, has_symptom in patient.items() if has_symptom]
+    finished, _ = chat.analyze_symptoms(f"Mam {', '.join(present)}" if present else "dzień dobry")
+    elapsed = 0.0
+    while not finished:
+        time.sleep(think)
+        start = time.perf_counter()
+        finished, _ = chat.analyze_symptoms("tak" if patient[chat.prev_question] else "nie")
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=6)
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Mediana czasu odpowiedzi modelu (s)")
+    parser.add_argument("--think", type=float, default=0.6, help="Czas odpowiedzi pacjenta na pytanie (s)")
+    parser.add_argument("--limits", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from VoiceChatApp.MedicalChat import MedicalChat
+
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    cache_dir = tempfile.TemporaryDirectory()
+    chat = MedicalChat(cache_dir=cache_dir.name)
+    patients = random_patients(chat, args.patients, random.Random(0))
+    print(f"{'limit':>6} {'ostatnia tura':>14} {'maks.':>8} {'zapytania / rozmowa':>20}")
+    for limit in args.limits:
+        config = StubConfig(args.model_latency, sigma=0.2, tail_rate=0.0, seed=0)
+        with StubServer(config) as server:
+            client = AsyncAiClient(base_url=server.base_url, api_key="benchmark", hedge_percentile=None)
+            chat.ai_model = AiModel(client)
+            chat.diagnosis_cache = DiagnosisCache()
+            chat.PREFETCH_LIMIT = limit
+            timings = [converse(chat, patient, args.think) for patient in patients]
+            client.close()
+        print(f"{limit:>6} {statistics.mean(timings) * 1000:>11.0f} ms {max(timings) * 1000:>5.0f} ms "
+              f"{config.requests / len(patients):>20.1f}")
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
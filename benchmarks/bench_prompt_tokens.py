@@ -0,0 +1,73 @@
+"""
+Rozmiar zapytania diagnostycznego do modelu AI: dotychczasowe zapytanie (słownik wszystkich objawów
+w postaci tekstowej, z wartościami True/False/None) oraz zwięzłe zapytanie z PromptBuilder
+(objawy obecne i istotne objawy nieobecne w postaci kanonicznej).
+
+Zestawy objawów są losowane tak jak odpowiedzi pacjenta w rozmowie: każdy objaw jest obecny,
+nieobecny lub nieznany. Tokeny zapytania są liczone przez lokalny serwer testowy
+(benchmarks/ai_stub_server.py, ok. 4 znaki na token) i zapisywane przez PromptBuilder.record.
+Raportowana jest średnia liczba znaków i tokenów zapytania oraz liczba rozmów mieszczących się
+w dziennym budżecie tokenów `--daily-budget`.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_prompt_tokens --prompts 200
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from VoiceChatApp.AiModel import AiModel
+from VoiceChatApp.AsyncAiClient import AsyncAiClient
+from VoiceChatApp.PromptBuilder import PromptBuilder
+from benchmarks.ai_stub_server import StubConfig, StubServer
+
+
+def legacy_prompt(user_symptoms):
+    # Zapytanie sprzed PromptBuilder (PROMPT_VERSION = 1), opakowane w wiadomości AiModel
+    prompt = (f"Jaka to może być choroba i jakie zalecenia mi dasz. "
+              f"Odpowiedz bardzo krótko w dwóch zdaniach. Objawy: {user_symptoms}")
+    return AiModel._messages(prompt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=200, help="Liczba losowych zestawów objawów")
+    parser.add_argument("--daily-budget", type=int, default=100000, help="Dzienny budżet tokenów")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from VoiceChatApp.MedicalChat import MedicalChat
+
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    cache_dir = tempfile.TemporaryDirectory()
+    chat = MedicalChat(cache_dir=cache_dir.name)
+    rng = random.Random(0)
+    vectors = [{symptom: rng.choice((True, False, False, None)) for symptom in chat.required_symptoms}
+               for _ in range(args.prompts)]
+    variants = {
+        "dotychczasowe": legacy_prompt,
+        "PromptBuilder": chat.diagnosis_prompt,
+    }
+
+    print(f"{'zapytanie':>14} {'znaki':>7} {'tokeny':>7} {'rozmowy/dzień':>14}")
+    with StubServer(StubConfig(0.0, sigma=0.0, tail_rate=0.0, seed=0)) as server:
+        client = AsyncAiClient(base_url=server.base_url, api_key="benchmark", hedge_percentile=None)
+        model = AiModel(client)
+        for name, prompt in variants.items():
+            builder = PromptBuilder(max_session_tokens=None, max_daily_tokens=None)
+            characters = 0
+            for user_symptoms in vectors:
+                messages = prompt(user_symptoms)
+                characters += sum(len(message["content"]) for message in messages)
+                model.ask(messages, on_usage=builder.record)
+            stats = builder.stats()
+            per_call = (stats["prompt_tokens"] + stats["completion_tokens"]) / stats["calls"]
+            print(f"{name:>14} {characters / len(vectors):>7.0f} {stats['prompt_tokens'] / stats['calls']:>7.0f} "
+                  f"{args.daily_budget // per_call:>14.0f}")
+        client.close()
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
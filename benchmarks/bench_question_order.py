@@ -0,0 +1,121 @@
+"""
+Symulacja konsultacji: liczba pytań potrzebnych do rozstrzygnięcia diagnozy przy stałej
+kolejności `required_symptoms` oraz przy wyborze pytań według przyrostu informacji (QuestionSelector).
+
+Każda choroba z tabeli SpeechLibrary jest po kolei "pacjentem", który zgodnie z prawdą
+odpowiada na pytania. Diagnoza jest rozstrzygnięta, gdy żadne z pozostałych pytań nie dotyczy
+objawu ze wzorca kandydatów (jeden kandydat lub choroby o identycznych wzorcach, z potwierdzonymi
+wszystkimi objawami wzorca).
+Monolog początkowy wymienia zadaną liczbę objawów pacjenta.
+
+Druga tabela przeprowadza pełne rozmowy MedicalChat (z zakończeniem po rozstrzygnięciu
+zbioru kandydatów) dla pacjentów, których objawy różnią się od wzorca o zadaną liczbę
+objawów, i porównuje liczbę pytań oraz odwołań do modelu AI z wariantem pytającym o wszystkie objawy.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_question_order --mentioned 0 1 2
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+
+from VoiceChatApp.DiagnosisCache import DiagnosisCache
+from VoiceChatApp.QuestionSelector import QuestionSelector
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def ask(self, prompt, deadline=None, on_usage=None):
+        self.calls += 1
+        return "Odpowiedź modelu."
+
+
+def simulate(selector, disease, mentioned, informed):
+    symptoms = selector.matcher.symptoms
+    present = [symptom for symptom in symptoms if disease.get(symptom, False)]
+    user_symptoms = {symptom: symptom in present[:mentioned] for symptom in symptoms}
+    check_syndroms = dict.fromkeys(symptoms, False)
+    for symptom in present[:mentioned]:
+        check_syndroms[symptom] = True
+
+    questions = 0
+    while not selector.is_resolved(selector.candidates(user_symptoms, check_syndroms), check_syndroms):
+        if informed:
+            symptom = selector.next_symptom(user_symptoms, check_syndroms)
+        else:
+            symptom = next(s for s, checked in check_syndroms.items() if checked is not True)
+        user_symptoms[symptom] = bool(disease.get(symptom, False))
+        check_syndroms[symptom] = True
+        questions += 1
+    return questions
+
+
+def converse(chat, patient):
+    chat.reset_conversation()
+    finished, _ = chat.analyze_symptoms("dzień dobry")
+    questions = 0
+    while not finished:
+        finished, _ = chat.analyze_symptoms("tak" if patient[chat.prev_question] else "nie")
+        questions += 1
+    return questions
+
+
+def chat_simulation(selector, flips, rng):
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from VoiceChatApp.MedicalChat import MedicalChat
+
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    cache_dir = tempfile.TemporaryDirectory()
+    chat = MedicalChat(cache_dir=cache_dir.name)
+    chat.ai_model = CountingModel()
+    # Każde odwołanie do modelu jest liczone osobno: bez pamięci podręcznej diagnoz i zapytań z wyprzedzeniem
+    chat.diagnosis_cache = DiagnosisCache(memory_size=0)
+    chat.PREFETCH_LIMIT = 0
+    symptoms = selector.matcher.symptoms
+    questions = []
+    full_ai_calls = 0
+    for disease in selector.matcher.table:
+        patient = {symptom: bool(disease.get(symptom, False)) for symptom in symptoms}
+        for symptom in rng.sample(symptoms, flips):
+            patient[symptom] = not patient[symptom]
+        questions.append(converse(chat, patient))
+        # Pytając o wszystkie objawy, AI odpowiada, gdy żaden wzorzec nie jest identyczny
+        full_ai_calls += selector.matcher.exact(patient) is None
+    cache_dir.cleanup()
+    return len(symptoms), statistics.mean(questions), full_ai_calls, chat.ai_model.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentioned", type=int, nargs="+", default=[0, 1, 2],
+                        help="Liczba objawów wymienionych w monologu")
+    parser.add_argument("--flips", type=int, nargs="+", default=[0, 1, 2],
+                        help="Liczba objawów pacjenta odbiegających od wzorca choroby")
+    args = parser.parse_args()
+
+    selector = QuestionSelector()
+    table = selector.matcher.table
+    print(f"Chorób: {len(table)}, objawów: {len(selector.matcher.symptoms)}")
+    print(f"{'monolog':>8} {'stała kolejność':>22} {'przyrost informacji':>22}")
+    for mentioned in args.mentioned:
+        results = []
+        for informed in (False, True):
+            counts = [simulate(selector, disease, mentioned, informed) for disease in table]
+            results.append(f"{statistics.mean(counts):5.2f} (maks. {max(counts):2d})")
+        print(f"{mentioned:>8} {results[0]:>22} {results[1]:>22}")
+
+    rng = random.Random(0)
+    print()
+    print(f"{'odchylenia':>10} {'pytania (wszystkie)':>20} {'pytania (teraz)':>16} {'AI (wszystkie)':>15} "
+          f"{'AI (teraz)':>11}")
+    for flips in args.flips:
+        full, questions, full_ai_calls, ai_calls = chat_simulation(selector, flips, rng)
+        print(f"{flips:>10} {full:>20} {questions:>16.2f} {full_ai_calls:>15} {ai_calls:>11}")
+
+
+if __name__ == "__main__":
+    main()
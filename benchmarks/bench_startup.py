@@ -0,0 +1,61 @@
+"""
+Koszt utworzenia modułu medycznego (MedicalChat) przy starcie aplikacji: z klientem AI tworzonym
+od razu (dotychczasowe zachowanie, wraz z importem openai, httpx i dotenv) oraz odroczonym
+do pierwszego zapytania do modelu AI.
+
+Każdy pomiar wykonywany jest w nowym procesie, aby uwzględnić koszt importów. Raportowany jest
+czas i przyrost pamięci (RSS) od zaimportowania pakietu do utworzenia MedicalChat.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import json, sys, time
+from VoiceChatApp.StartupReport import StartupReport
+memory = StartupReport.memory()
+start = time.perf_counter()
+from VoiceChatApp.MedicalChat import MedicalChat
+chat = MedicalChat(cache_dir={cache_dir!r})
+if {eager}:
+    chat.ai_model.client
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "memory": StartupReport.memory() - memory,
+    "openai": "openai" in sys.modules,
+}}))
+"""
+
+
+def measure(eager):
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"))
+    # Diagnozy i zużycie tokenów w katalogu tymczasowym, a nie w pamięci podręcznej użytkownika
+    with tempfile.TemporaryDirectory() as cache_dir:
+        output = subprocess.run([sys.executable, "-c", CHILD.format(eager=eager, cache_dir=cache_dir)],
+                                capture_output=True, text=True, env=env, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'klient AI':>12} {'czas':>9} {'pamięć':>10} {'openai':>7}")
+    for name, eager in (("od razu", True), ("odroczony", False)):
+        results = [measure(eager) for _ in range(args.runs)]
+        seconds = statistics.median(result["seconds"] for result in results)
+        memory = statistics.median(result["memory"] for result in results)
+        print(f"{name:>12} {seconds * 1000:>6.0f} ms {memory / 2 ** 20:>7.1f} MB "
+              f"{'tak' if results[0]['openai'] else 'nie':>7}")
+
+
+if __name__ == "__main__":
+    main()
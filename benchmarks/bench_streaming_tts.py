@@ -0,0 +1,104 @@
+"""
+Czas do pierwszego dźwięku odpowiedzi modelu AI: odpowiedź blokująca (AiModel.ask, a następnie
+synteza całego tekstu) kontra strumieniowa (AiModel.sentences i SoundEngine.say_sentence).
+
+Model AI zastępuje strumień tokenów z opóźnieniem pierwszego tokenu `--first-token` i kolejnych
+`--per-token`. Synteza mowy trwa `--tts-base` plus `--tts-per-char` na znak, a odtwarzanie
+`--play-per-char` na znak (bez rzeczywistego dźwięku). Raportowany jest czas do pierwszego
+dźwięku oraz do zakończenia wypowiedzi.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_streaming_tts --runs 3
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from VoiceChatApp.AiModel import AiModel  # noqa: E402
+from VoiceChatApp.SoundEngine import SoundEngine  # noqa: E402
+
+RESPONSE = (
+    "Objawy mogą wskazywać na grypę lub inną infekcję wirusową górnych dróg oddechowych. "
+    "Zalecam odpoczynek, picie dużej ilości płynów i leki przeciwgorączkowe w razie potrzeby. "
+    "Jeśli gorączka utrzyma się dłużej niż trzy dni, skontaktuj się z lekarzem."
+)
+
+
+class SimulatedSoundEngine(SoundEngine):
+    def __init__(self, args):
+        super().__init__()
+        self.args = args
+        self.playing_until = 0.0
+
+    def _synthesize(self, text):
+        time.sleep(self.args.tts_base + self.args.tts_per_char * len(text))
+        return text
+
+    def _start_playback(self, audio, on_start=None):
+        self.playing_until = time.perf_counter() + self.args.play_per_char * len(audio)
+        if on_start:
+            on_start(time.perf_counter())
+
+    def _is_playing(self):
+        return time.perf_counter() < self.playing_until
+
+
+def tokens(args):
+    time.sleep(args.first_token)
+    for index, word in enumerate(RESPONSE.split(" ")):
+        time.sleep(args.per_token)
+        yield word if index == 0 else f" {word}"
+
+
+def finish(lector):
+    lector.current_thread.join()
+    while lector._is_playing():
+        time.sleep(0.005)
+    return time.perf_counter()
+
+
+def blocking(lector, args):
+    started = []
+    begin = time.perf_counter()
+    text = "".join(tokens(args))
+    lector.say(text, on_start=started.append)
+    end = finish(lector)
+    return started[0] - begin, end - begin
+
+
+def streaming(lector, args):
+    started = []
+    begin = time.perf_counter()
+    lector.start_stream(on_start=started.append)
+    for sentence in AiModel.sentences(tokens(args)):
+        lector.say_sentence(sentence)
+    lector.end_stream()
+    end = finish(lector)
+    return started[0] - begin, end - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--first-token", type=float, default=0.4, help="Opóźnienie pierwszego tokenu (s)")
+    parser.add_argument("--per-token", type=float, default=0.03, help="Czas generowania tokenu (s)")
+    parser.add_argument("--tts-base", type=float, default=0.25, help="Stały czas syntezy wypowiedzi (s)")
+    parser.add_argument("--tts-per-char", type=float, default=0.003, help="Czas syntezy na znak (s)")
+    parser.add_argument("--play-per-char", type=float, default=0.06, help="Czas odtwarzania na znak (s)")
+    args = parser.parse_args()
+
+    lector = SimulatedSoundEngine(args)
+    print(f"Odpowiedź: {len(RESPONSE)} znaków, {len(RESPONSE.split())} tokenów")
+    print(f"{'tryb':>12} {'pierwszy dźwięk':>16} {'koniec wypowiedzi':>18}")
+    for name, mode in (("blokujący", blocking), ("strumieniowy", streaming)):
+        results = [mode(lector, args) for _ in range(args.runs)]
+        first = statistics.mean(result[0] for result in results)
+        total = statistics.mean(result[1] for result in results)
+        print(f"{name:>12} {first * 1000:>13.0f} ms {total * 1000:>15.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Porównanie wyszukiwania objawów w monologu: dotychczasowa pętla po synonimach
+kontra skompilowany automat Aho-Corasick (SymptomMatcher).
+
+Lista synonimów SpeechLibrary jest sztucznie powiększana losowymi frazami,
+aby pokazać, że czas analizy jednej wypowiedzi automatem nie rośnie wraz z jej rozmiarem.
+Przed pomiarem sprawdzane jest rozpoznawanie objawów zaprzeczonych ("nie mam gorączki").
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_symptom_matcher --sizes 100 1000 10000 50000
+"""
+import argparse
+import random
+import time
+
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.SymptomMatcher import SymptomMatcher
+
+UTTERANCES = [
+    "dzień dobry od wczoraj boli mnie głowa i mam gorączkę a w nocy trzęsie mnie z zimna",
+    "mam suchy kaszel brakuje mi tchu i jestem wyczerpany to wszystko",
+    "boli mnie brzuch od rana mdli mnie i wymiotuję",
+    "nie mogę spać schudłem ostatnio i stawy mnie bolą",
+]
+
+# (wypowiedź, objawy obecne, objawy zaprzeczone)
+NEGATED = [
+    ("nie mam gorączki", set(), {"Gorączka"}),
+    ("bez gorączki, ale kaszel mam", {"Kaszel"}, {"Gorączka"}),
+    ("nie mam gorączki ani kaszlu", set(), {"Gorączka", "Kaszel"}),
+    ("nie mam wysokiej gorączki", set(), {"Gorączka"}),
+    ("nie mogę spać i mam gorączkę", {"Problemy ze snem", "Gorączka"}, set()),
+    ("boli mnie głowa, nie mam gorączki", {"Ból głowy"}, {"Gorączka"}),
+    ("nie mam gorączki, kaszlu ani bólu głowy", set(), {"Gorączka", "Kaszel", "Ból głowy"}),
+    ("nie mam gorączki, dreszczy, kaszlu i bólu głowy", set(), {"Gorączka", "Dreszcze", "Kaszel", "Ból głowy"}),
+    ("nie mam gorączki, boli mnie głowa", {"Ból głowy"}, {"Gorączka"}),
+    ("nie, mam kaszel", {"Kaszel"}, set()),
+]
+
+
+def legacy_match(user_input, required_symptoms, synonyms, no_other_symptoms_phrases):
+    found = set()
+    no_other = False
+    for symptom in required_symptoms:
+        if symptom.lower() in user_input.lower():
+            found.add(symptom)
+        else:
+            for syn_key, syn_list in synonyms.items():
+                if syn_key.lower() == symptom.lower():
+                    for s in syn_list:
+                        if s.lower() in user_input.lower():
+                            found.add(symptom)
+                            break
+                    break
+        for phrase in no_other_symptoms_phrases:
+            if phrase in user_input.lower():
+                no_other = True
+                break
+    return found, no_other
+
+
+def grow_synonyms(size, rng):
+    synonyms = {key: list(values) for key, values in SpeechLibrary.synonyms.items()}
+    symptoms = list(synonyms)
+    letters = "abcdefghijklmnoprstuwyząćęłńóśźż"
+    for index in range(size):
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        synonyms[symptoms[index % len(symptoms)]].append(" ".join(words))
+    return synonyms
+
+
+def measure(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for utterance in UTTERANCES:
+            func(utterance)
+    return (time.perf_counter() - start) / (repeats * len(UTTERANCES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000, 50000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--legacy-limit", type=int, default=10000, help="Największy rozmiar mierzony starą metodą")
+    args = parser.parse_args()
+
+    library_matcher = SymptomMatcher.from_library()
+    for utterance, present, negated in NEGATED:
+        found, denied, _ = library_matcher.scan(utterance)
+        assert (found, denied) == (present, negated), f"{utterance!r}: {found}, {denied}"
+    print(f"Przeczenia: {len(NEGATED)}/{len(NEGATED)} wypowiedzi rozpoznanych poprawnie")
+
+    rng = random.Random(0)
+    required = SpeechLibrary.required_symptoms
+    no_other = SpeechLibrary.no_other_symptoms_phrases
+    print(f"{'synonimy':>10} {'budowa [ms]':>12} {'automat [µs]':>13} {'pętla [µs]':>11}")
+    for size in args.sizes:
+        synonyms = grow_synonyms(size, rng)
+        start = time.perf_counter()
+        matcher = SymptomMatcher(required, synonyms, no_other)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        automaton_us = measure(matcher.match, args.repeats) * 1e6
+        legacy = "-"
+        if size <= args.legacy_limit:
+            for utterance in UTTERANCES:
+                assert matcher.match(utterance) == legacy_match(utterance, required, synonyms, no_other)
+            legacy_us = measure(lambda text: legacy_match(text, required, synonyms, no_other), args.repeats) * 1e6
+            legacy = f"{legacy_us:.0f}"
+        print(f"{matcher.phrase_count:>10} {build_ms:>12.0f} {automaton_us:>13.1f} {legacy:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Czas przygotowania mowy dla wypowiedzi bota w kolejnych rozmowach: bez pamięci podręcznej
+(każda wypowiedź syntezowana przez gTTS), z pamięcią podręczną wypełnianą w trakcie działania
+oraz z nagraniami zsyntezowanymi z wyprzedzeniem (build_tts_cache.py) i wczytywanymi z dysku.
+
+Synteza zastępuje zapytanie sieciowe trwające `--tts-base` plus `--tts-per-char` na znak.
+Rozmowa składa się z powitania, podsumowania objawów (zawsze inne), pytań o objawy, opisu choroby
+zdanie po zdaniu, pytania o zadowolenie i pożegnania. Raportowane są percentyle czasu przygotowania
+wypowiedzi, odsetek trafień i liczba zapytań do gTTS.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_tts_cache --conversations 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from build_tts_cache import phrases  # noqa: E402
+from VoiceChatApp.AiModel import AiModel  # noqa: E402
+from VoiceChatApp.AsyncAiClient import AsyncAiClient  # noqa: E402
+from VoiceChatApp.SoundEngine import SoundEngine  # noqa: E402
+from VoiceChatApp.SpeechLibrary import SpeechLibrary  # noqa: E402
+from VoiceChatApp.TtsCache import TtsCache  # noqa: E402
+
+
+class SimulatedSoundEngine(SoundEngine):
+    args = None
+    requests = 0
+
+    @classmethod
+    def generate(cls, text, lang='pl', tld='com'):
+        cls.requests += 1
+        time.sleep(cls.args.tts_base + cls.args.tts_per_char * len(text))
+        return text.encode("utf-8") * 40
+
+
+def conversation(rng):
+    symptoms = rng.sample(SpeechLibrary.required_symptoms, 3)
+    utterances = [SpeechLibrary.start_response(), SpeechLibrary.first_response(dict.fromkeys(symptoms, True), "")]
+    utterances += [SpeechLibrary.ask_first(symptom) for symptom in rng.sample(SpeechLibrary.required_symptoms, 4)]
+    utterances += AiModel.sentences([SpeechLibrary.find_disease(rng.choice(SpeechLibrary.symptoms_table))])
+    utterances += [SpeechLibrary.satisfaction_question(), SpeechLibrary.end_response()]
+    return [utterance.strip() for utterance in utterances]
+
+
+def run(lector, conversations):
+    SimulatedSoundEngine.requests = 0
+    timings = []
+    for utterances in conversations:
+        for text in utterances:
+            start = time.perf_counter()
+            lector._synthesize(text)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=50, help="Liczba rozmów")
+    parser.add_argument("--tts-base", type=float, default=0.25, help="Stały czas zapytania do gTTS (s)")
+    parser.add_argument("--tts-per-char", type=float, default=0.002, help="Czas syntezy na znak (s)")
+    args = parser.parse_args()
+    SimulatedSoundEngine.args = args
+
+    rng = random.Random(0)
+    conversations = [conversation(rng) for _ in range(args.conversations)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        prebuilt = os.path.join(directory, "prebuilt")
+        cache = TtsCache(prebuilt, memory_size=0)
+        for text in phrases():
+            cache.put(text, "pl", "com", text.encode("utf-8") * 40)
+
+        variants = {
+            "bez pamięci": TtsCache(memory_size=0),
+            "w trakcie": TtsCache(os.path.join(directory, "runtime")),
+            "z wyprzedzeniem": TtsCache(prebuilt),
+        }
+        print(f"{'pamięć':>16} {'średnio':>9} {'p50':>8} {'p95':>8} {'trafienia':>10} {'gTTS':>6}")
+        for name, tts_cache in variants.items():
+            lector = SimulatedSoundEngine(tts_cache=tts_cache)
+            timings = run(lector, conversations)
+            p50, p95 = (AsyncAiClient.percentile(timings, q) * 1000 for q in (50, 95))
+            mean = sum(timings) / len(timings) * 1000
+            print(f"{name:>16} {mean:>6.0f} ms {p50:>5.1f} ms {p95:>5.0f} ms "
+                  f"{tts_cache.stats()['hit_ratio']:>9.0%} {SimulatedSoundEngine.requests:>6}")
+
+
+if __name__ == "__main__":
+    main()
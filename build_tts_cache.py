@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from VoiceChatApp.AiModel import AiModel
+from VoiceChatApp.SoundEngine import SoundEngine
+from VoiceChatApp.SpeechLibrary import SpeechLibrary
+from VoiceChatApp.TtsCache import TtsCache
+
+
+def phrases() -> list:
+    # Opisy chorób są wypowiadane zdanie po zdaniu (tryb strumieniowy), a krótkie odpowiedzi w całości
+    result = []
+    for phrase in SpeechLibrary.static_phrases():
+        result.append(phrase)
+        result.extend(AiModel.sentences([phrase]))
+    return list(dict.fromkeys(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Synteza mowy z wyprzedzeniem dla stałych wypowiedzi SpeechLibrary (pamięć podręczna TtsCache)."
+    )
+    parser.add_argument("--cache-dir", default=None, help="Katalog nagrań (domyślnie TtsCache.default_path)")
+    parser.add_argument("--lang", default="pl", help="Kod języka syntezy")
+    parser.add_argument("--tld", default="com", help="Domena serwera gTTS (wariant głosu)")
+    parser.add_argument("--workers", type=int, default=4, help="Liczba równoległych zapytań do gTTS")
+    parser.add_argument("--force", action="store_true", help="Syntezuj ponownie również zapamiętane wypowiedzi")
+    args = parser.parse_args()
+
+    cache = TtsCache(args.cache_dir or TtsCache.default_path(), memory_size=0)
+    texts = phrases()
+    missing = [text for text in texts if args.force or not cache.contains(text, args.lang, args.tld)]
+
+    start = time.perf_counter()
+    errors = 0
+    size = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(SoundEngine.generate, text, args.lang, args.tld): text for text in missing}
+        for future in as_completed(futures):
+            text = futures[future]
+            try:
+                audio = future.result()
+            except Exception as e:
+                errors += 1
+                print(f"Błąd syntezy '{text}': {e}", file=sys.stderr)
+                continue
+            cache.put(text, args.lang, args.tld, audio)
+            size += len(audio)
+
+    print(
+        f"Wypowiedzi: {len(texts)}, zapamiętane wcześniej: {len(texts) - len(missing)}, "
+        f"zsyntezowane: {len(missing) - errors} ({size / 2 ** 20:.1f} MB), błędy: {errors}, "
+        f"czas: {time.perf_counter() - start:.1f} s, katalog: {cache.path}",
+        file=sys.stderr
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import argparse
+import json
+import sys
+from VoiceChatApp.BatchTranscriber import BatchTranscriber
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transkrypcja archiwalnych nagrań WAV (16 kHz, mono) bez GUI.")
+    parser.add_argument("directory", help="Katalog z plikami WAV")
+    parser.add_argument("--model", default="VoiceChatApp/model", help="Ścieżka do modelu VOSK")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów roboczych")
+    parser.add_argument("--analyze", action="store_true", help="Analizuj transkrypcje przez MedicalChat")
+    parser.add_argument("--output", default=None, help="Plik wynikowy JSON Lines (domyślnie stdout)")
+    parser.add_argument("--debug", action="store_true", help="Włącz logi debugowania")
+    args = parser.parse_args()
+
+    transcriber = BatchTranscriber(args.model, workers=args.workers, analyze=args.analyze, debug=args.debug)
+    paths = transcriber.find_files(args.directory)
+    if not paths:
+        print(f"Brak plików WAV w katalogu {args.directory}", file=sys.stderr)
+        return 1
+
+    results, summary = transcriber.run(paths)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in results:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            output.close()
+
+    print(
+        f"Plików: {summary['files']} (błędy: {summary['errors']}), "
+        f"audio: {summary['audio_seconds']:.1f} s, czas: {summary['wall_seconds']:.1f} s, "
+        f"RTF: {summary['rtf']:.3f}, RTF puli: {summary['wall_rtf']:.3f}, "
+        f"plików/s: {summary['files_per_second']:.2f}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())